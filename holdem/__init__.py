@@ -1 +1,41 @@
-"""Holdem package for poker hand evaluation and simulation."""
+"""
+Holdem package for poker hand evaluation and simulation.
+
+Importing the package is cheap: the main classes below are importable from
+it, but the modules defining them, and pydantic and loguru with them, are
+only loaded on first use. ``holdem.core`` holds the int-card evaluator and
+deck, which need neither.
+"""
+
+import importlib
+from typing import Any, List
+
+# Attribute of the package -> module defining it
+_LAZY = {
+    "Action": "models",
+    "ActionType": "models",
+    "Card": "models",
+    "Deck": "models",
+    "Evaluator": "evaluator",
+    "HoldemEngine": "engine",
+    "Player": "models",
+    "RandomAgent": "agents",
+    "Street": "models",
+    "Table": "models",
+    "Tournament": "tournament",
+}
+
+__all__ = sorted(_LAZY)
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,327 @@
+"""
+Card abstraction by equity-distribution bucketing.
+
+Every hand on a street is described by a histogram of its equity on the
+river: for each runout of the board, the share of holdings it beats on the
+final board, binned into ``num_bins`` equal intervals. Hands with similar
+histograms play alike, so they are clustered with k-means into a small
+number of buckets that a solver can use in place of the cards.
+
+Histograms are computed per canonical board for all 1326 hands at once, a
+batch of runouts at a time. They are streamed into a memory-mapped file when
+a path is given, and k-means reads them back in chunks, so memory stays
+bounded by the chunk sizes rather than the number of hands. The result is a
+``BucketTable``: one bucket per (canonical board, combo), saved as a ``.npy``
+file that loads memory-mapped.
+"""
+
+import itertools
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .equity import _count_below, _runouts
+from .isomorphism import canonical_board
+from .lookup import NUM_CARDS, batch_keys, score_keys
+from .ranges import COMBO_INDEX, COMBO_MASKS, COMBOS, NUM_COMBOS, cards_mask
+
+Board = Tuple[int, ...]
+
+
+def canonical_boards(size: int) -> List[Board]:
+    """
+    List the canonical boards of a street, in a fixed order.
+
+    Args:
+        size: Number of board cards, 0, 3, 4 or 5
+
+    Returns:
+        List[Board]: One board per suit isomorphism class
+    """
+    if size == 0:
+        return [()]
+    boards = {
+        canonical_board(flop)[0] for flop in itertools.combinations(range(NUM_CARDS), 3)
+    }
+    for _ in range(size - 3):
+        boards = {
+            canonical_board(board + (card,))[0]
+            for board in boards
+            for card in range(NUM_CARDS)
+            if card not in board
+        }
+    return sorted(boards)
+
+
+def equity_histograms(
+    board: Sequence[int],
+    num_bins: int = 10,
+    num_runouts: Optional[int] = None,
+    batch_size: int = 128,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Compute the river equity histogram of every hand on a board.
+
+    On each complete board a hand's equity is the share of the other
+    holdings it beats, ties counting half. Holdings that share a card with
+    the hand are counted all the same, which barely moves the share and lets
+    one sort serve every hand.
+
+    Args:
+        board: Zero, three or four int cards
+        num_bins: Number of equal-width equity bins
+        num_runouts: Sample this many runouts instead of enumerating all of
+            them, as is needed preflop
+        batch_size: Number of runouts scored at once
+        rng: Generator used to sample runouts
+
+    Returns:
+        np.ndarray: Array of shape ``(1326, num_bins)`` with the share of
+        runouts falling in each bin, all zeros for hands the board blocks
+
+    Raises:
+        ValueError: If the board is not a preflop, flop or turn board
+    """
+    if len(board) not in (0, 3, 4):
+        raise ValueError("Equity histograms need a board of 0, 3 or 4 cards")
+    if num_runouts is None:
+        runouts = _runouts(board)
+    else:
+        rng = rng or np.random.default_rng()
+        dead = cards_mask(board)
+        deck = np.array([card for card in range(NUM_CARDS) if not dead >> card & 1])
+        keys = rng.random((num_runouts, len(deck)))
+        drawn = deck[np.argpartition(keys, 5 - len(board), axis=1)[:, : 5 - len(board)]]
+        prefix = np.broadcast_to(
+            np.asarray(board, dtype=np.int64), (num_runouts, len(board))
+        )
+        runouts = np.hstack([prefix, drawn])
+
+    combo_keys, combo_masks = batch_keys(COMBOS)
+    counts = np.zeros((NUM_COMBOS, num_bins), dtype=np.int64)
+    for start in range(0, len(runouts), batch_size):
+        boards = runouts[start : start + batch_size]
+        board_keys, board_masks = batch_keys(boards)
+        scores = score_keys(
+            board_keys[:, None] + combo_keys[None, :],
+            board_masks[:, None, :] | combo_masks[None, :, :],
+        )
+        alive = (
+            COMBO_MASKS[None, :] & (np.int64(1) << boards).sum(axis=1)[:, None]
+        ) == 0
+        weights = alive.astype(np.float64)
+        rows = np.arange(len(boards))[:, None]
+        below, at_or_below = _count_below(scores, weights, scores, rows)
+        # Leave the hand itself out of its ties and of the total
+        others = weights.sum(axis=1, keepdims=True) - 1
+        equity = (below + (at_or_below - below - 1) / 2) / others
+        bins = np.minimum((equity * num_bins).astype(np.int64), num_bins - 1)
+        flat = (np.arange(NUM_COMBOS)[None, :] * num_bins + bins)[alive]
+        counts += np.bincount(flat, minlength=NUM_COMBOS * num_bins).reshape(
+            NUM_COMBOS, num_bins
+        )
+
+    totals = counts.sum(axis=1, keepdims=True)
+    return (counts / np.maximum(totals, 1)).astype(np.float32)
+
+
+def _features(histograms: np.ndarray) -> np.ndarray:
+    """
+    Cumulative histograms: Euclidean distance between them tracks the earth
+    mover's distance between equity distributions.
+    """
+    return np.cumsum(histograms, axis=1)
+
+
+def kmeans(
+    data: np.ndarray,
+    num_clusters: int,
+    iterations: int = 20,
+    chunk_size: int = 65536,
+    sample_size: int = 20000,
+    rng: Optional[np.random.Generator] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cluster equity histograms with k-means, reading them in chunks.
+
+    Centroids are seeded with k-means++ on a sample and refined with Lloyd
+    iterations that assign and accumulate one chunk at a time, so ``data``
+    can be a memory-mapped array larger than memory. Rows that are all zero
+    (blocked hands) are ignored and labelled 0.
+
+    Args:
+        data: Histograms of shape ``(n, num_bins)``
+        num_clusters: Number of clusters
+        iterations: Maximum number of Lloyd iterations
+        chunk_size: Number of rows read at once
+        sample_size: Number of rows used to seed the centroids
+        rng: Generator used for seeding
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Centroids of shape
+        ``(num_clusters, num_bins)`` in feature space and the label of
+        every row
+    """
+    rng = rng or np.random.default_rng()
+    valid = np.concatenate(
+        [
+            data[start : start + chunk_size].sum(axis=1) > 0
+            for start in range(0, len(data), chunk_size)
+        ]
+    )
+    candidates = np.flatnonzero(valid)
+    if len(candidates) < num_clusters:
+        raise ValueError("Fewer hands than clusters")
+
+    sample = np.sort(rng.choice(candidates, min(sample_size, len(candidates)), False))
+    points = _features(np.asarray(data[sample], dtype=np.float64))
+    centroids = [points[rng.integers(len(points))]]
+    distances = ((points - centroids[0]) ** 2).sum(axis=1)
+    for _ in range(num_clusters - 1):
+        total = distances.sum()
+        if total > 0:
+            choice = rng.choice(len(points), p=distances / total)
+        else:
+            choice = rng.integers(len(points))
+        centroids.append(points[choice])
+        distances = np.minimum(distances, ((points - points[choice]) ** 2).sum(axis=1))
+    centers = np.array(centroids)
+
+    labels = np.zeros(len(data), dtype=np.int64)
+    for _ in range(iterations):
+        sums = np.zeros_like(centers)
+        sizes = np.zeros(num_clusters, dtype=np.int64)
+        changed = 0
+        for start in range(0, len(data), chunk_size):
+            chunk_valid = valid[start : start + chunk_size]
+            features = _features(
+                np.asarray(data[start : start + chunk_size], dtype=np.float64)
+            )[chunk_valid]
+            distances = (
+                (features**2).sum(axis=1)[:, None]
+                - 2 * features @ centers.T
+                + (centers**2).sum(axis=1)[None, :]
+            )
+            nearest = distances.argmin(axis=1)
+            indexes = start + np.flatnonzero(chunk_valid)
+            changed += int((labels[indexes] != nearest).sum())
+            labels[indexes] = nearest
+            np.add.at(sums, nearest, features)
+            sizes += np.bincount(nearest, minlength=num_clusters)
+
+        empty = sizes == 0
+        centers[~empty] = sums[~empty] / sizes[~empty, None]
+        # Reseed empty clusters on random sampled hands
+        centers[empty] = points[rng.integers(len(points), size=int(empty.sum()))]
+        if not changed and not empty.any():
+            break
+    return centers, labels
+
+
+class BucketTable:
+    """
+    Bucket of every (board, hand) on one street.
+
+    Args:
+        buckets: Array of shape ``(num_boards, 1326)``, one row per canonical
+            board in the order of ``canonical_boards``
+        board_size: Number of board cards of the street
+    """
+
+    def __init__(self, buckets: np.ndarray, board_size: int):
+        self.buckets = buckets
+        self.board_size = board_size
+        self._board_index: Dict[Board, int] = {
+            board: index for index, board in enumerate(canonical_boards(board_size))
+        }
+        if len(self._board_index) != len(buckets):
+            raise ValueError("Bucket table doesn't match the street's boards")
+
+    @property
+    def num_buckets(self) -> int:
+        return int(self.buckets.max()) + 1
+
+    def bucket(self, hole_cards: Sequence[int], board: Sequence[int]) -> int:
+        """Return the bucket of a hand on a board of this street."""
+        if len(board) != self.board_size:
+            raise ValueError(f"Expected a board of {self.board_size} cards")
+        canonical, mapping = canonical_board(board)
+        first, second = (card & ~3 | mapping[card & 3] for card in hole_cards)
+        row = self._board_index[canonical]
+        return int(self.buckets[row, COMBO_INDEX[first, second]])
+
+    def save(self, path: str):
+        """Write the table as a ``.npy`` file, replacing any existing one."""
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            np.save(file, self.buckets)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str, board_size: int) -> "BucketTable":
+        """Open a saved table, memory-mapped read-only."""
+        return cls(np.load(path, mmap_mode="r"), board_size)
+
+
+def build_buckets(
+    board_size: int,
+    num_buckets: int,
+    num_bins: int = 10,
+    num_runouts: Optional[int] = None,
+    path: Optional[str] = None,
+    iterations: int = 20,
+    chunk_size: int = 65536,
+    rng: Optional[np.random.Generator] = None,
+) -> BucketTable:
+    """
+    Bucket every hand of a street by its equity histogram.
+
+    Args:
+        board_size: Number of board cards, 0 for preflop, 3 or 4
+        num_buckets: Number of buckets
+        num_bins: Number of equity histogram bins
+        num_runouts: Runouts sampled per board, None to enumerate them all
+        path: Where to save the table; histograms are then streamed to a
+            memory-mapped file next to it and deleted once clustered
+        iterations: Maximum number of k-means iterations
+        chunk_size: Number of histograms clustered at once
+        rng: Generator for runout sampling and k-means seeding
+
+    Returns:
+        BucketTable: The bucket of every hand on every canonical board
+    """
+    rng = rng or np.random.default_rng()
+    boards = canonical_boards(board_size)
+    shape = (len(boards) * NUM_COMBOS, num_bins)
+    histogram_path = None
+    if path is None:
+        histograms = np.zeros(shape, dtype=np.float32)
+    else:
+        histogram_path = f"{path}.histograms.npy"
+        histograms = np.lib.format.open_memmap(
+            histogram_path, mode="w+", dtype=np.float32, shape=shape
+        )
+
+    try:
+        for index, board in enumerate(boards):
+            histograms[index * NUM_COMBOS : (index + 1) * NUM_COMBOS] = (
+                equity_histograms(board, num_bins, num_runouts, rng=rng)
+            )
+        _, labels = kmeans(
+            histograms, num_buckets, iterations, chunk_size=chunk_size, rng=rng
+        )
+    finally:
+        if histogram_path is not None:
+            del histograms
+            os.remove(histogram_path)
+
+    dtype = np.uint8 if num_buckets <= 256 else np.uint16
+    table = BucketTable(
+        labels.astype(dtype).reshape(len(boards), NUM_COMBOS), board_size
+    )
+    if path is not None:
+        table.save(path)
+        return BucketTable.load(path, board_size)
+    return table
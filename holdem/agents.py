@@ -1,11 +1,26 @@
+import random
+
 from .models import Action, ActionType, Player, Table
 
 
 class RandomAgent(Player):
     def make_decision(self, table: Table) -> Action:
+        legal = table.legal_actions
+        rng = table.rng or random
+        choice = rng.random()
+        if legal.can_call and choice < 0.2:
+            action_type, amount = ActionType.FOLD, 0
+        elif choice < 0.8 or not legal.can_raise:
+            if legal.can_call:
+                action_type, amount = ActionType.CALL, legal.call_amount
+            else:
+                action_type, amount = ActionType.CHECK, 0
+        else:
+            action_type = ActionType.RAISE if table.current_bet else ActionType.BET
+            amount = rng.randint(legal.min_raise, legal.max_raise)
         return Action(
-            type=ActionType.BET,
-            amount=10,
+            type=action_type,
+            amount=amount,
             street=table.current_street,
             player=self,
         )
@@ -0,0 +1,166 @@
+"""
+A bounded LRU cache for equity results.
+
+Entries are keyed on the suit-isomorphism class of the situation, the
+number of opponents and the simulation settings, so every suit permutation
+of a spot shares one entry while estimates of different precision don't.
+The cache is thread-safe, can be served to other processes through
+``EquityCacheManager`` and can persist its entries to disk between runs.
+"""
+
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from multiprocessing.managers import BaseManager
+from typing import Any, Hashable, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .equity import Sampling, hand_equity
+from .isomorphism import canonical_index
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+
+class EquityCache:
+    """
+    Thread-safe LRU cache of equity values.
+
+    Args:
+        maxsize: Number of entries kept before the least recently used one
+            is evicted
+        path: File to load entries from on creation and to save them to
+    """
+
+    def __init__(self, maxsize: int = 1_000_000, path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.path = path
+        self._entries: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def get(self, key: Hashable) -> Optional[float]:
+        """Return the cached value of ``key`` or None, counting a hit or miss."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: float):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                self._hits, self._misses, self._evictions, len(self._entries)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def save(self, path: Optional[str] = None):
+        """
+        Write the entries to disk, least recently used first.
+
+        The file is replaced atomically so that readers never see a partial
+        cache.
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("No path to save the cache to")
+        with self._lock:
+            items = list(self._entries.items())
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            pickle.dump(items, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+
+    def load(self, path: Optional[str] = None):
+        """Add the entries saved in a file, keeping the most recent ones."""
+        path = path or self.path
+        if path is None:
+            raise ValueError("No path to load the cache from")
+        with open(path, "rb") as file:
+            items = pickle.load(file)
+        for key, value in items:
+            self.put(key, value)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class EquityCacheManager(BaseManager):
+    """
+    Serves one ``EquityCache`` to several processes.
+
+    Example:
+        manager = EquityCacheManager()
+        manager.start()
+        cache = manager.EquityCache(maxsize=100_000)
+        # pass ``cache`` to worker processes and use it with cached_equity
+    """
+
+
+EquityCacheManager.register("EquityCache", EquityCache)
+
+
+def situation_key(
+    hole_cards: Sequence[int], board: Sequence[int], num_opponents: int
+) -> Tuple[int, int, int]:
+    """Return the cache key of a situation: its class, street and opponents."""
+    return canonical_index(hole_cards, board), len(board), num_opponents
+
+
+def cached_equity(
+    cache: Any,
+    hole_cards: Sequence[int],
+    board: Sequence[int],
+    num_opponents: int = 1,
+    trials: int = 10000,
+    rng: Optional[np.random.Generator] = None,
+    sampling: Sampling = Sampling.QUASI,
+) -> float:
+    """
+    Return the equity of a hand, computing it with ``hand_equity`` only when
+    its situation is not cached yet for the same ``trials`` and ``sampling``.
+
+    Args:
+        cache: An ``EquityCache`` or a proxy to one from ``EquityCacheManager``
+        hole_cards: Hero's two int cards
+        board: Zero to five int cards on the board
+        num_opponents: Number of opponents holding random hands
+        trials: Number of simulated deals on a miss
+        rng: Random generator used on a miss; not part of the key
+        sampling: How deals are drawn on a miss, see ``Sampling``
+
+    Returns:
+        float: Hero's expected share of the pot
+    """
+    sampling = Sampling(sampling)
+    key = situation_key(hole_cards, board, num_opponents) + (trials, sampling.value)
+    value = cache.get(key)
+    if value is None:
+        value = hand_equity(hole_cards, board, num_opponents, trials, rng, sampling)
+        cache.put(key, value)
+    return value
@@ -0,0 +1,344 @@
+"""
+Counterfactual regret minimization for two-player subgames over hand classes.
+
+A subgame is a small betting tree of ``Decision`` and ``Terminal`` nodes.
+Each player holds one of a number of hand classes (the 169 preflop classes,
+card abstraction buckets or single combos) and the cards only matter
+through two matrices: how often each pair of classes is dealt and the first
+player's share of the pot when they go to showdown.
+
+Regrets and strategies are arrays of shape ``(num_classes, num_actions)``
+per decision node, and every iteration walks the tree once per player
+updating all classes at once with CFR+ (regrets floored at zero, averages
+weighted by iteration), so solves take thousands of iterations of a few
+matrix-vector products each.
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .equity import class_equity
+from .isomorphism import preflop_index
+from .lookup import evaluate_batch
+from .ranges import COMBO_MASKS, COMBOS, NUM_COMBOS, cards_mask
+
+Path = Tuple[str, ...]
+
+
+class Terminal(NamedTuple):
+    """
+    End of a subgame.
+
+    Args:
+        amounts: Chips each player has put in the pot
+        folder: The player who folded, or None for a showdown
+    """
+
+    amounts: Tuple[float, float]
+    folder: Optional[int] = None
+
+    def payoff(self, equity: np.ndarray) -> Any:
+        """First player's winnings, a matrix over classes for a showdown."""
+        first, second = self.amounts
+        if self.folder == 0:
+            return -first
+        if self.folder == 1:
+            return second
+        return equity * (first + second) - first
+
+
+class Decision(NamedTuple):
+    player: int
+    actions: Tuple[str, ...]
+    children: Tuple[Any, ...]
+
+
+def push_fold_tree(
+    stack: float, small_blind: float = 0.5, big_blind: float = 1.0
+) -> Decision:
+    """
+    Build heads-up push/fold: the small blind moves all in or folds, and the
+    big blind calls or folds.
+
+    Args:
+        stack: Effective stack, blinds included
+    """
+    return Decision(
+        0,
+        ("fold", "push"),
+        (
+            Terminal((small_blind, big_blind), folder=0),
+            Decision(
+                1,
+                ("fold", "call"),
+                (Terminal((stack, big_blind), folder=1), Terminal((stack, stack))),
+            ),
+        ),
+    )
+
+
+class CFRSolver:
+    """
+    Vectorized CFR+ over a subgame.
+
+    Args:
+        tree: Root of the subgame, the first player is player 0
+        matchups: Weight of each (player 0 class, player 1 class) deal
+        equity: Player 0's share of the pot at showdown for each deal
+    """
+
+    def __init__(self, tree: Decision, matchups: np.ndarray, equity: np.ndarray):
+        self.tree = tree
+        self.matchups = np.asarray(matchups, dtype=np.float64)
+        self.equity = np.asarray(equity, dtype=np.float64)
+        self.num_classes = self.matchups.shape
+        self.iterations = 0
+        self.regrets: Dict[Path, np.ndarray] = {}
+        self.strategy_sums: Dict[Path, np.ndarray] = {}
+        self._payoffs: Dict[Path, Any] = {}
+        self._index(tree, ())
+
+    def _index(self, node: Any, path: Path):
+        if isinstance(node, Terminal):
+            # Weighting by the deals once here saves it on every iteration
+            self._payoffs[path] = self.matchups * node.payoff(self.equity)
+            return
+        shape = (self.num_classes[node.player], len(node.actions))
+        self.regrets[path] = np.zeros(shape)
+        self.strategy_sums[path] = np.zeros(shape)
+        for action, child in zip(node.actions, node.children):
+            self._index(child, path + (action,))
+
+    def _current_strategy(self, path: Path) -> np.ndarray:
+        """Regret matching: play in proportion to positive regret."""
+        regrets = self.regrets[path]
+        totals = regrets.sum(axis=1, keepdims=True)
+        uniform = np.full_like(regrets, 1 / regrets.shape[1])
+        return np.divide(regrets, totals, out=uniform, where=totals > 0)
+
+    def strategy(self, path: Sequence[str] = ()) -> np.ndarray:
+        """
+        Return the average strategy at a decision node.
+
+        Args:
+            path: Actions leading to the node from the root
+
+        Returns:
+            np.ndarray: Probability of each action for each class of the
+            acting player, shape ``(num_classes, num_actions)``
+        """
+        sums = self.strategy_sums[tuple(path)]
+        totals = sums.sum(axis=1, keepdims=True)
+        uniform = np.full_like(sums, 1 / sums.shape[1])
+        return np.divide(sums, totals, out=uniform, where=totals > 0)
+
+    def _walk(
+        self,
+        node: Any,
+        path: Path,
+        reaches: List[np.ndarray],
+        traverser: int,
+        best_response: bool = False,
+    ) -> np.ndarray:
+        """
+        Return the counterfactual values of ``traverser``'s classes.
+
+        With ``best_response`` the traverser plays the best reply to the
+        other player's average strategy; otherwise both play their current
+        strategies and the traverser's regrets and averages are updated.
+        """
+        if isinstance(node, Terminal):
+            payoffs = self._payoffs[path]
+            if traverser == 0:
+                return payoffs @ reaches[1]
+            return -(reaches[0] @ payoffs)
+
+        player = node.player
+        if player != traverser:
+            if best_response:
+                strategy = self.strategy(path)
+            else:
+                strategy = self._current_strategy(path)
+            values = 0
+            for action_index, action in enumerate(node.actions):
+                child_reaches = list(reaches)
+                child_reaches[player] = reaches[player] * strategy[:, action_index]
+                values = values + self._walk(
+                    node.children[action_index],
+                    path + (action,),
+                    child_reaches,
+                    traverser,
+                    best_response,
+                )
+            return values
+
+        action_values = np.stack(
+            [
+                self._walk(child, path + (action,), reaches, traverser, best_response)
+                for action, child in zip(node.actions, node.children)
+            ],
+            axis=1,
+        )
+        if best_response:
+            return action_values.max(axis=1)
+        strategy = self._current_strategy(path)
+        values = (strategy * action_values).sum(axis=1)
+        regrets = self.regrets[path] + action_values - values[:, None]
+        self.regrets[path] = np.maximum(regrets, 0)
+        self.strategy_sums[path] += (
+            self.iterations * reaches[player][:, None] * strategy
+        )
+        return values
+
+    def _start(self) -> List[np.ndarray]:
+        return [np.ones(self.num_classes[0]), np.ones(self.num_classes[1])]
+
+    def iterate(self, iterations: int = 1):
+        """Run CFR+ iterations, updating the players in turn."""
+        for _ in range(iterations):
+            self.iterations += 1
+            for player in (0, 1):
+                self._walk(self.tree, (), self._start(), player)
+
+    def value(self) -> float:
+        """Return player 0's expected winnings per deal under the averages."""
+        return self._evaluate(self.tree, (), self._start()) / self.matchups.sum()
+
+    def _evaluate(self, node: Any, path: Path, reaches: List[np.ndarray]) -> float:
+        if isinstance(node, Terminal):
+            return float(reaches[0] @ self._payoffs[path] @ reaches[1])
+        strategy = self.strategy(path)
+        total = 0.0
+        for action_index, action in enumerate(node.actions):
+            child_reaches = list(reaches)
+            child_reaches[node.player] = (
+                reaches[node.player] * strategy[:, action_index]
+            )
+            total += self._evaluate(
+                node.children[action_index], path + (action,), child_reaches
+            )
+        return total
+
+    def exploitability(self) -> float:
+        """
+        Return the average gain of a best response against the averages:
+        zero at a Nash equilibrium, in chips per deal.
+        """
+        total = self.matchups.sum()
+        gains = [
+            self._walk(self.tree, (), self._start(), player, best_response=True).sum()
+            / total
+            for player in (0, 1)
+        ]
+        return float(sum(gains) / 2)
+
+    def solve(
+        self,
+        iterations: int = 1000,
+        tolerance: Optional[float] = None,
+        check_every: int = 100,
+    ) -> float:
+        """
+        Iterate until the exploitability falls below ``tolerance`` or the
+        iterations run out.
+
+        Returns:
+            float: The final exploitability
+        """
+        while iterations > 0:
+            step = min(check_every, iterations)
+            self.iterate(step)
+            iterations -= step
+            if tolerance is not None and self.exploitability() < tolerance:
+                break
+        return self.exploitability()
+
+
+class PushFold(NamedTuple):
+    """
+    Heads-up push/fold equilibrium over the 169 preflop classes.
+
+    Args:
+        push: Chance the small blind moves all in with each class
+        call: Chance the big blind calls with each class
+        exploitability: Chips per hand a best response would gain
+    """
+
+    push: np.ndarray
+    call: np.ndarray
+    exploitability: float
+
+    def push_probability(self, hole_cards: Sequence[int]) -> float:
+        return float(self.push[preflop_index(hole_cards)])
+
+    def call_probability(self, hole_cards: Sequence[int]) -> float:
+        return float(self.call[preflop_index(hole_cards)])
+
+
+PREFLOP_CLASSES = np.array([preflop_index(combo) for combo in COMBOS.tolist()])
+
+
+def preflop_matchups(
+    num_boards: int = 500, rng: Optional[np.random.Generator] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Deal weights and all-in equity between the 169 preflop classes."""
+    return class_equity(PREFLOP_CLASSES, num_boards, rng=rng)
+
+
+def solve_push_fold(
+    stack: float,
+    iterations: int = 2000,
+    matchups: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> PushFold:
+    """
+    Solve heads-up push/fold at a stack depth.
+
+    Args:
+        stack: Effective stack in big blinds
+        iterations: Number of CFR+ iterations
+        matchups: Precomputed ``preflop_matchups``, which are computed (a few
+            seconds) when not given and can be reused across stack depths
+        rng: Random generator for the equity estimate
+
+    Returns:
+        PushFold: Both players' strategies and their exploitability
+    """
+    weights, equity = matchups or preflop_matchups(rng=rng)
+    solver = CFRSolver(push_fold_tree(stack), weights, equity)
+    exploitability = solver.solve(iterations)
+    return PushFold(
+        solver.strategy(())[:, 1], solver.strategy(("push",))[:, 1], exploitability
+    )
+
+
+def river_matchups(
+    board: Sequence[int],
+    ranges: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Deal weights and showdown equity between the 1326 combos on a river,
+    for solving river subgames combo by combo.
+
+    Args:
+        board: Five int cards
+        ranges: Weight of each combo for both players, uniform by default
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Deal weights, zero for combos that
+        overlap each other or the board, and the first player's share of
+        the pot, both of shape ``(1326, 1326)``
+    """
+    if len(board) != 5:
+        raise ValueError("A river subgame needs a five-card board")
+    alive = (COMBO_MASKS & cards_mask(board)) == 0
+    cards = np.concatenate(
+        [COMBOS, np.broadcast_to(np.asarray(board), (NUM_COMBOS, 5))], axis=1
+    )
+    scores = evaluate_batch(cards)
+    first, second = ranges or (np.ones(NUM_COMBOS), np.ones(NUM_COMBOS))
+    disjoint = (COMBO_MASKS[:, None] & COMBO_MASKS[None, :]) == 0
+    matchups = disjoint * np.outer(first * alive, second * alive)
+    equity = 0.5 + 0.5 * np.sign(scores[:, None] - scores[None, :])
+    return matchups, equity
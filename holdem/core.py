@@ -0,0 +1,92 @@
+"""
+The int-card core of the package, importable without pydantic or loguru.
+
+Simulation workers, command line tools and anything else that starts often
+can import this module alone: it pulls in NumPy and the evaluator tables,
+which load from their cache file, and nothing else. The game models and the
+engine stay unloaded until ``holdem.models`` or ``holdem.engine`` is
+imported.
+"""
+
+import random
+from typing import Any, List, Optional
+
+from .lookup import (
+    FLUSH,
+    FOUR_OF_A_KIND,
+    FULL_HOUSE,
+    HIGH_CARD,
+    NUM_CARDS,
+    PAIR,
+    ROYAL_FLUSH,
+    STRAIGHT,
+    STRAIGHT_FLUSH,
+    THREE_OF_A_KIND,
+    TWO_PAIR,
+    batch_keys,
+    card_rank,
+    card_str,
+    card_suit,
+    card_to_int,
+    evaluate,
+    evaluate_batch,
+    hand_ranks,
+    hand_type,
+    parse_cards,
+    score_keys,
+)
+
+__all__ = [
+    "FLUSH",
+    "FOUR_OF_A_KIND",
+    "FULL_HOUSE",
+    "HIGH_CARD",
+    "NUM_CARDS",
+    "PAIR",
+    "ROYAL_FLUSH",
+    "STRAIGHT",
+    "STRAIGHT_FLUSH",
+    "THREE_OF_A_KIND",
+    "TWO_PAIR",
+    "Deck",
+    "batch_keys",
+    "card_rank",
+    "card_str",
+    "card_suit",
+    "card_to_int",
+    "evaluate",
+    "evaluate_batch",
+    "hand_ranks",
+    "hand_type",
+    "parse_cards",
+    "score_keys",
+]
+
+
+class Deck:
+    """
+    A deck of int cards, in standard order until shuffled.
+
+    It deals like ``holdem.models.Deck``, from the end of ``cards``, and
+    ``rng`` is likewise anything with a ``shuffle`` method, the global
+    ``random`` module being used when it is not set.
+    """
+
+    def __init__(self, rng: Optional[Any] = None):
+        self.cards: List[int] = list(range(NUM_CARDS))
+        self.rng = rng
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def shuffle(self):
+        (self.rng or random).shuffle(self.cards)
+
+    def draw(self) -> int:
+        return self.cards.pop()
+
+    def deal(self, n: int) -> List[int]:
+        return [self.cards.pop() for _ in range(n)]
+
+    def reset(self):
+        self.cards = list(range(NUM_CARDS))
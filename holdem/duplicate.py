@@ -0,0 +1,125 @@
+"""
+Duplicate matches for comparing agents.
+
+Card luck swamps skill in short matches. In duplicate poker every deal is
+replayed once per rotation of the agents around the table: the cards stay
+with the seats and the agents move, so each agent holds every seat's cards
+once and the luck of the deal cancels out of their combined result. Each
+hand starts from fresh stacks, so deals are independent and the spread of
+per-deal results gives a confidence interval on each agent's win rate.
+"""
+
+from statistics import NormalDist, fmean, stdev
+from typing import List, NamedTuple, Tuple
+
+from pydantic import BaseModel
+
+from .engine import HoldemEngine
+from .models import Card, Deck, Player, Table
+from .rng import HandId, HandStream, deck_order, hand_rng
+
+
+class AgentResult(NamedTuple):
+    """
+    An agent's win rate over a match.
+
+    Args:
+        name: The agent's name
+        hands: Number of hands played
+        bb_per_100: Big blinds won per 100 hands
+        std_error: Standard error of ``bb_per_100``
+        confidence: Level of the confidence interval
+    """
+
+    name: str
+    hands: int
+    bb_per_100: float
+    std_error: float
+    confidence: float
+
+    @property
+    def interval(self) -> Tuple[float, float]:
+        half_width = NormalDist().inv_cdf((1 + self.confidence) / 2) * self.std_error
+        return self.bb_per_100 - half_width, self.bb_per_100 + half_width
+
+
+class DuplicateMatch(BaseModel):
+    """
+    A match between agents over seeded deals.
+
+    With ``duplicate`` every deal is played once per rotation of the seats;
+    without it every deal is played once with the agents in their own seats,
+    which is the plain match the duplicate one is compared against.
+    """
+
+    players: List[Player]
+    num_deals: int
+    seed: int = 0
+    starting_stack: int = 200
+    small_blind: int = 1
+    big_blind: int = 2
+    duplicate: bool = True
+    confidence: float = 0.95
+
+    def deal(self, deal: int) -> List[Card]:
+        """Return the deck order of a deal, the same for every rotation."""
+        return [
+            Card.from_int(int(card)) for card in deck_order(HandId(self.seed, 0, deal))
+        ]
+
+    def run(self) -> List[AgentResult]:
+        """
+        Play the match.
+
+        Returns:
+            List[AgentResult]: The win rate of each agent, in seat order
+        """
+        num_players = len(self.players)
+        rotations = num_players if self.duplicate else 1
+        # Big blinds won by each agent in each deal, over all its rotations
+        results = [[0.0] * self.num_deals for _ in range(num_players)]
+        table = Table(
+            players=list(self.players),
+            small_blind=self.small_blind,
+            big_blind=self.big_blind,
+        )
+        engine = HoldemEngine(table=table)
+
+        stream = HandStream(self.seed, 0)
+        for deal in range(self.num_deals):
+            cards = Deck().cards
+            stream.shuffle(cards)
+            for rotation in range(rotations):
+                seats = [(seat + rotation) % num_players for seat in range(num_players)]
+                table.players = [self.players[agent] for agent in seats]
+                for player in table.players:
+                    player.chips = self.starting_stack
+                # The button moves every deal. The deck is replaced rather
+                # than shuffled, and every rotation replays the deal's stream
+                # of random choices
+                table.reset(deal % num_players, shuffle=False)
+                table.deck.cards = list(cards)
+                table.rng = hand_rng(stream.hand_id)
+                engine.run_hand()
+                for agent in seats:
+                    won = self.players[agent].chips - self.starting_stack
+                    results[agent][deal] += won / self.big_blind
+
+        hands = self.num_deals * rotations
+        agent_results = []
+        for agent, per_deal in enumerate(results):
+            # Per hand within each deal, so that deals are the samples
+            samples = [100 * total / rotations for total in per_deal]
+            std_error = (
+                stdev(samples) / len(samples) ** 0.5 if len(samples) > 1 else 0.0
+            )
+            agent_results.append(
+                AgentResult(
+                    self.players[agent].name,
+                    hands,
+                    fmean(samples),
+                    std_error,
+                    self.confidence,
+                )
+            )
+        return agent_results
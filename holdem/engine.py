@@ -1,13 +1,28 @@
-from typing import List
+from typing import List, Optional, Sequence, Tuple
 
 from loguru import logger
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 
-from .models import Card, Table
+from . import showdown
+from .events import Event, EventBuffer, EventType
+from .models import Action, Card, Table
 
 
 class HoldemEngine(BaseModel):
+    """
+    Plays hands at a table.
+
+    When ``events`` is set, every hand is also recorded into it as typed
+    events; flush it after the last hand to deliver the events still pending.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     table: Table
+    events: Optional[EventBuffer] = None
+
+    # Number of hands played, which numbers the events
+    _hands: int = PrivateAttr(default=0)
 
     def run(self):
         logger.info("Starting new game")
@@ -15,42 +30,100 @@ class HoldemEngine(BaseModel):
         self.run_hand()
 
     def run_hand(self):
+        self._hands += 1
         logger.info("Starting new hand")
-        logger.info(f"Dealer: {self.table.players[self.table.dealer_index].name}")
+        logger.info("Dealer: {}", self.table.players[self.table.dealer_index].name)
+        self._emit(EventType.HAND_START, seat=self.table.dealer_index)
         logger.info("Dealing hands to players")
         self.table.deal_hands()
 
-        for player in self.table.players:
-            logger.debug(f"{player.name}: {self.print_cards(player.hand)}")
+        for seat, player in enumerate(self.table.players):
+            logger.opt(lazy=True).debug(
+                "{}: {}", lambda: player.name, lambda: self.print_cards(player.hand)
+            )
+            if player.hand:
+                self._emit(EventType.DEAL, seat=seat, cards=_ints(player.hand))
 
         logger.info("Posting blinds")
         self.post_blinds()
         self.take_actions()
 
-        logger.info("Dealing flop")
-        self.table.deal_flop()
-        logger.info(f"Board: {self.print_cards(self.table.community_cards)}")
-        self.take_actions()
-
-        logger.info("Dealing turn")
-        self.table.deal_turn()
-        logger.info(f"Board: {self.print_cards(self.table.community_cards)}")
-        self.take_actions()
+        for street, deal in (
+            ("flop", self.table.deal_flop),
+            ("turn", self.table.deal_turn),
+            ("river", self.table.deal_river),
+        ):
+            # Streets after everyone but one player has folded are dead
+            if self.table.is_hand_over:
+                break
+            logger.info("Dealing {}", street)
+            dealt = len(self.table.community_cards)
+            deal()
+            logger.opt(lazy=True).info(
+                "Board: {}", lambda: self.print_cards(self.table.community_cards)
+            )
+            self._emit(
+                EventType.STREET, cards=_ints(self.table.community_cards[dealt:])
+            )
+            self.take_actions()
 
-        logger.info("Dealing river")
-        self.table.deal_river()
-        logger.info(f"Board: {self.print_cards(self.table.community_cards)}")
-        self.take_actions()
+        self.settle()
 
     def post_blinds(self):
         actions = self.table.post_blinds()
         for action in actions:
-            logger.info(f"{action.player.name} {action.type.value} {action.amount}")
+            logger.info(
+                "{} {} {}", action.player.name, action.type.value, action.amount
+            )
+        self._emit_actions(EventType.BLIND, actions)
 
     def take_actions(self):
         actions = self.table.take_actions()
         for action in actions:
-            logger.info(f"{action.player.name} {action.type.value} {action.amount}")
+            logger.info(
+                "{} {} {}", action.player.name, action.type.value, action.amount
+            )
+        self._emit_actions(EventType.ACTION, actions)
+
+    def settle(self):
+        awards = showdown.settle(self.table)
+        for seat, amount in awards.items():
+            player = self.table.players[seat]
+            logger.opt(lazy=True).info(
+                "{} wins {}: {}",
+                lambda: player.name,
+                lambda: amount,
+                lambda: self.print_cards(player.hand),
+            )
+            self._emit(
+                EventType.SHOWDOWN, seat=seat, amount=amount, cards=_ints(player.hand)
+            )
+
+    def _emit(self, event_type: EventType, **fields):
+        if self.events is not None:
+            self.events.emit(
+                Event(event_type, self._hands, self.table.current_street, **fields)
+            )
+
+    def _emit_actions(self, event_type: EventType, actions: Sequence[Action]):
+        if self.events is None:
+            return
+        seats = {id(player): seat for seat, player in enumerate(self.table.players)}
+        for action in actions:
+            self.events.emit(
+                Event(
+                    event_type,
+                    self._hands,
+                    action.street,
+                    seats[id(action.player)],
+                    None if event_type == EventType.BLIND else action.type,
+                    int(action.amount),
+                )
+            )
 
     def print_cards(self, cards: List[Card]):
         return " ".join([str(card) for card in cards])
+
+
+def _ints(cards: Sequence[Card]) -> Tuple[int, ...]:
+    return tuple(card.to_int() for card in cards)
@@ -0,0 +1,687 @@
+"""Equity calculations on top of the batched lookup evaluator."""
+
+import itertools
+import time
+from enum import Enum
+from statistics import NormalDist
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .lookup import NUM_CARDS, evaluate_batch
+from .ranges import COMBO_INDEX, COMBO_MASKS, COMBOS, NUM_COMBOS, Range, cards_mask
+
+# Scores fit in 24 bits, so adding multiples of this offset to the scores of
+# each row keeps rows apart in one flat sorted array
+_ROW_OFFSET = np.int64(1) << 25
+
+# CARD_COMBOS[c] lists the 51 combos holding card c
+CARD_COMBOS = np.array(
+    [
+        [COMBO_INDEX[card, other] for other in range(NUM_CARDS) if other != card]
+        for card in range(NUM_CARDS)
+    ],
+    dtype=np.int64,
+)
+
+
+def _runouts(board: Sequence[int]) -> np.ndarray:
+    """Every complete five-card board that extends ``board``."""
+    dead = cards_mask(board)
+    deck = [card for card in range(NUM_CARDS) if not dead >> card & 1]
+    missing = 5 - len(board)
+    combinations = list(itertools.combinations(deck, missing))
+    runouts = np.array(combinations, dtype=np.int64).reshape(len(combinations), -1)
+    prefix = np.broadcast_to(
+        np.asarray(board, dtype=np.int64), (len(runouts), len(board))
+    )
+    return np.hstack([prefix, runouts])
+
+
+def _count_below(
+    scores: np.ndarray, weights: np.ndarray, queries: np.ndarray, rows: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    For every query, sum the weights of its row whose score is lower and
+    whose score is lower or equal, with one sort and two binary searches.
+
+    Args:
+        scores: Scores of shape ``(num_rows, n)``
+        weights: Weights matching ``scores``
+        queries: Query scores of any shape
+        rows: Row of each query, broadcastable to ``queries``
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Weight below and weight at or below
+    """
+    num_rows, n = scores.shape
+    order = np.argsort(scores, axis=1)
+    offsets = np.arange(num_rows, dtype=np.int64)[:, None] * _ROW_OFFSET
+    flat_scores = (np.take_along_axis(scores, order, axis=1) + offsets).ravel()
+    cumulative = np.concatenate(
+        [[0.0], np.cumsum(np.take_along_axis(weights, order, axis=1).ravel())]
+    )
+    keys = queries + rows * _ROW_OFFSET
+    row_start = cumulative[rows * n]
+    below = cumulative[np.searchsorted(flat_scores, keys, side="left")] - row_start
+    at_or_below = (
+        cumulative[np.searchsorted(flat_scores, keys, side="right")] - row_start
+    )
+    return below, at_or_below
+
+
+def _showdown_totals(
+    hero_weights: np.ndarray, villain_weights: np.ndarray, boards: np.ndarray
+) -> Tuple[float, float]:
+    """
+    Sum hero's weighted share of the pot and the weighted number of matchups
+    over a batch of complete boards.
+
+    Hands are scored once per board. Rather than comparing every pair of
+    combos, villain combos are sorted by score so the weight a hero combo
+    beats or ties is a binary search. Villain combos that share a card with
+    the hero combo are removed by subtracting the same counts taken over the
+    51 combos holding each of hero's cards.
+    """
+    num_boards = len(boards)
+    board_masks = (np.int64(1) << boards).sum(axis=1)
+    alive = (COMBO_MASKS[None, :] & board_masks[:, None]) == 0
+    hero = hero_weights * alive
+    villain = villain_weights * alive
+
+    cards = np.concatenate(
+        [
+            np.broadcast_to(boards[:, None, :], (num_boards, NUM_COMBOS, 5)),
+            np.broadcast_to(COMBOS[None, :, :], (num_boards, NUM_COMBOS, 2)),
+        ],
+        axis=2,
+    )
+    scores = evaluate_batch(cards).astype(np.int64)
+
+    rows = np.arange(num_boards, dtype=np.int64)[:, None]
+    below, at_or_below = _count_below(scores, villain, scores, rows)
+    total = villain.sum(axis=1, keepdims=True)
+
+    # The same counts restricted to villain combos holding one given card
+    card_scores = scores[:, CARD_COMBOS].reshape(num_boards * NUM_CARDS, -1)
+    card_weights = villain[:, CARD_COMBOS].reshape(num_boards * NUM_CARDS, -1)
+    card_totals = card_weights.sum(axis=1).reshape(num_boards, NUM_CARDS)
+    for card in (COMBOS[:, 0], COMBOS[:, 1]):
+        card_rows = rows * NUM_CARDS + card[None, :]
+        card_below, card_at_or_below = _count_below(
+            card_scores, card_weights, scores, card_rows
+        )
+        below -= card_below
+        at_or_below -= card_at_or_below
+        total = total - card_totals[:, card]
+
+    # The hero combo itself was subtracted for both of its cards
+    at_or_below += villain
+    total = total + villain
+    share = below + (at_or_below - below) / 2
+    return float((hero * share).sum()), float((hero * total).sum())
+
+
+def range_vs_range(
+    hero: Range, villain: Range, board: Sequence[int], batch_size: int = 128
+) -> float:
+    """
+    Compute the equity of one range against another on a board.
+
+    Every runout of the board is enumerated and each one is scored for all
+    1326 combos in a single batch, then weighted over every pair of combos
+    that don't share a card.
+
+    Args:
+        hero: The range to compute the equity of
+        villain: The opposing range
+        board: Three to five int cards on the board
+        batch_size: Number of runouts scored per batch
+
+    Returns:
+        float: Hero's share of the pot, counting ties as half
+
+    Raises:
+        ValueError: If the board doesn't hold three to five cards, or the
+            ranges have no matchups on it
+    """
+    if not 3 <= len(board) <= 5:
+        raise ValueError("Range equity needs a board of three to five cards")
+
+    boards = _runouts(board)
+    won = 0.0
+    matchups = 0.0
+    for start in range(0, len(boards), batch_size):
+        batch_won, batch_matchups = _showdown_totals(
+            hero.weights, villain.weights, boards[start : start + batch_size]
+        )
+        won += batch_won
+        matchups += batch_matchups
+    if matchups == 0:
+        raise ValueError("The ranges have no matchups on this board")
+    return won / matchups
+
+
+def _showdown_shares(
+    hero_scores: np.ndarray, opponent_scores: np.ndarray
+) -> np.ndarray:
+    """
+    Hero's share of the pot in each trial.
+
+    Args:
+        hero_scores: Hero's score in each trial, shape ``(trials,)``
+        opponent_scores: Opponent scores, shape ``(trials, num_opponents)``
+    """
+    best = opponent_scores.max(axis=1)
+    ties = (opponent_scores == hero_scores[:, None]).sum(axis=1)
+    return np.where(hero_scores > best, 1.0, 0.0) + np.where(
+        hero_scores == best, 1.0 / (ties + 1), 0.0
+    )
+
+
+def _sample_cards(
+    deck: np.ndarray, num_cards: int, trials: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Draw ``num_cards`` distinct cards from ``deck`` for each trial."""
+    keys = rng.random((trials, len(deck)))
+    picks = np.argpartition(keys, num_cards - 1, axis=1)[:, :num_cards]
+    return deck[picks]
+
+
+# Independent randomly shifted sequences per batch of quasi-random deals,
+# whose spread gives the standard error
+QUASI_REPLICATES = 16
+
+
+class Sampling(str, Enum):
+    """
+    How Monte Carlo deals are drawn.
+
+    * QUASI: a randomly shifted low-discrepancy (Kronecker) sequence mapped
+      to cards, spreading deals more evenly than independent draws
+    * RANDOM: independent uniform deals
+    * NEXT_CARD: stratified by the next board card (the turn on the flop),
+      every card taking an equal share of the deals
+    * OPPONENT: stratified by the first opponent's hand, every hand taking
+      an equal share of the deals
+
+    QUASI is the default. Heads-up after the flop it reaches a given
+    precision with 1.5 to 10 times fewer deals than RANDOM; preflop and
+    multiway the two are about even. The stratified modes are for spots
+    dominated by one source of variance: OPPONENT for a made hand, where it
+    is exact on the river, and NEXT_CARD for a draw on the turn, each saving
+    about 1.5 to 2.5 times.
+    """
+
+    RANDOM = "random"
+    NEXT_CARD = "next_card"
+    OPPONENT = "opponent"
+    QUASI = "quasi"
+
+
+class _Sampler:
+    """
+    Draws the unseen cards of deals: the missing board cards, then two cards
+    per opponent. Each deal also gets a group used by ``_Tally``: its stratum
+    when stratified, its shifted sequence for quasi-random draws.
+    """
+
+    def __init__(
+        self,
+        deck: np.ndarray,
+        num_cards: int,
+        sampling: Sampling,
+        rng: np.random.Generator,
+        fixed_at: int = 0,
+    ):
+        self.deck = deck
+        self.num_cards = num_cards
+        self.sampling = Sampling(sampling)
+        self.rng = rng
+        self.fixed_at = fixed_at
+        self.drawn = 0
+        if self.sampling == Sampling.NEXT_CARD:
+            strata = np.arange(len(deck))[:, None]
+        elif self.sampling == Sampling.OPPONENT:
+            strata = np.array(list(itertools.combinations(range(len(deck)), 2)))
+        else:
+            strata = np.zeros((1, 0), dtype=np.int64)
+        # Strata are visited in a random order, cycling, so that every
+        # stratum gets an equal share of the deals up to one
+        self.strata = strata[rng.permutation(len(strata))]
+
+        dimensions = num_cards
+        phi = 2.0
+        for _ in range(64):
+            phi = (1 + phi) ** (1 / (dimensions + 1))
+        self.alpha = (1 / phi) ** np.arange(1, dimensions + 1) % 1
+        self.shifts = rng.random((QUASI_REPLICATES, dimensions))
+
+    @property
+    def num_strata(self) -> int:
+        return len(self.strata)
+
+    def draw(self, trials: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Draw ``trials`` deals.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Cards of shape
+            ``(trials, num_cards)`` and the group of each deal
+        """
+        if self.sampling == Sampling.QUASI:
+            cards = self._quasi(trials)
+            groups = (self.drawn + np.arange(trials)) % QUASI_REPLICATES
+        else:
+            groups = (self.drawn + np.arange(trials)) % self.num_strata
+            cards = self._stratified(self.strata[groups])
+        self.drawn += trials
+        return cards, groups
+
+    def _stratified(self, fixed: np.ndarray) -> np.ndarray:
+        """Draw the cards not fixed by each deal's stratum at random."""
+        trials, num_fixed = fixed.shape
+        keys = self.rng.random((trials, len(self.deck)))
+        # Fixed cards get the largest keys and are never among those drawn
+        np.put_along_axis(keys, fixed, np.inf, axis=1)
+        num_random = self.num_cards - num_fixed
+        if num_random:
+            picks = np.argpartition(keys, num_random - 1, axis=1)[:, :num_random]
+        else:
+            picks = np.zeros((trials, 0), dtype=np.int64)
+        at = self.fixed_at
+        positions = np.concatenate([picks[:, :at], fixed, picks[:, at:]], axis=1)
+        return self.deck[positions]
+
+    def _quasi(self, trials: int) -> np.ndarray:
+        """
+        Map points of shifted Kronecker sequences to cards: each coordinate
+        picks one of the cards still in the deck. Deals take turns between
+        ``QUASI_REPLICATES`` independently shifted sequences, each continued
+        from batch to batch.
+        """
+        index = self.drawn + np.arange(trials)
+        steps = index // QUASI_REPLICATES + 1
+        shifts = self.shifts[index % QUASI_REPLICATES]
+        points = (shifts + steps[:, None] * self.alpha) % 1
+        taken = np.zeros((trials, 0), dtype=np.int64)
+        picks = []
+        for k in range(self.num_cards):
+            index = (points[:, k] * (len(self.deck) - k)).astype(np.int64)
+            # Skip over the cards already taken, in ascending order
+            for j in range(k):
+                index += taken[:, j] <= index
+            picks.append(index)
+            taken = np.sort(np.concatenate([taken, index[:, None]], axis=1), axis=1)
+        return self.deck[np.stack(picks, axis=1)]
+
+
+class _Tally:
+    """Running sums of the shares of the pot by group."""
+
+    def __init__(self, between_groups: bool, num_groups: int = 1):
+        self.between_groups = between_groups
+        self.num_groups = num_groups
+        self.sums = np.zeros(0)
+        self.squares = np.zeros(0)
+        self.counts = np.zeros(0)
+
+    def add(self, shares: np.ndarray, groups: np.ndarray):
+        size = max(int(groups.max()) + 1, len(self.counts))
+        sums = np.bincount(groups, shares, minlength=size)
+        squares = np.bincount(groups, shares**2, minlength=size)
+        counts = np.bincount(groups, minlength=size)
+        grow = size - len(self.counts)
+        self.sums = np.pad(self.sums, (0, grow)) + sums
+        self.squares = np.pad(self.squares, (0, grow)) + squares
+        self.counts = np.pad(self.counts, (0, grow)) + counts
+
+    @property
+    def trials(self) -> int:
+        return int(self.counts.sum())
+
+    def estimate(self) -> Tuple[float, float]:
+        """
+        Return the mean of the group means and its standard error.
+
+        Strata are equally likely, so their means are averaged with equal
+        weights and the error comes from the pooled variance within them.
+        Until every stratum has a deal that average would leave the unseen
+        ones out, so the plain mean of the deals is used instead: strata are
+        visited in a random order, which makes each deal a uniform one.
+        Quasi-random sequences are only independent of each other, so the
+        error comes from the spread of their means.
+        """
+        seen = self.counts > 0
+        counts = self.counts[seen]
+        means = self.sums[seen] / counts
+        num_groups = len(means)
+        if not self.between_groups and num_groups < self.num_groups:
+            trials = counts.sum()
+            mean = float(self.sums.sum() / trials)
+            if trials < 2:
+                return mean, float("inf")
+            variance = (self.squares.sum() - trials * mean**2) / (trials - 1)
+            return mean, float((max(variance, 0.0) / trials) ** 0.5)
+        mean = float(means.mean())
+        if self.between_groups:
+            if num_groups < 2:
+                return mean, float("inf")
+            return mean, float(means.std(ddof=1) / num_groups**0.5)
+        trials = counts.sum()
+        if trials <= num_groups:
+            return mean, float("inf")
+        within = (self.squares[seen] - counts * means**2).sum() / (trials - num_groups)
+        variance = max(within, 0.0) * (1 / counts).sum() / num_groups**2
+        return mean, float(variance**0.5)
+
+
+def _setup(
+    hole_cards: Sequence[int],
+    board: Sequence[int],
+    num_opponents: int,
+    sampling: Sampling,
+    rng: Optional[np.random.Generator],
+) -> Tuple[_Sampler, _Tally]:
+    """Validate a situation and prepare its sampler and tally."""
+    if len(hole_cards) != 2 or len(board) > 5 or num_opponents < 1:
+        raise ValueError("Expected two hole cards, at most five board cards")
+    known = list(hole_cards) + list(board)
+    if len(set(known)) != len(known):
+        raise ValueError("Hole cards and board share a card")
+    sampling = Sampling(sampling)
+    if sampling == Sampling.NEXT_CARD and len(board) == 5:
+        raise ValueError("No board card left to stratify by")
+    dead = cards_mask(known)
+    deck = np.array([card for card in range(NUM_CARDS) if not dead >> card & 1])
+    missing = 5 - len(board)
+    # The first opponent's cards follow the missing board cards
+    fixed_at = missing if sampling == Sampling.OPPONENT else 0
+    sampler = _Sampler(
+        deck,
+        missing + 2 * num_opponents,
+        sampling,
+        rng or np.random.default_rng(),
+        fixed_at,
+    )
+    if sampling == Sampling.QUASI:
+        return sampler, _Tally(True, QUASI_REPLICATES)
+    return sampler, _Tally(False, sampler.num_strata)
+
+
+def _simulate(
+    hole_cards: Sequence[int],
+    board: Sequence[int],
+    num_opponents: int,
+    sampler: _Sampler,
+    tally: _Tally,
+    trials: int,
+):
+    """Deal ``trials`` hands and add hero's shares of the pot to the tally."""
+    drawn, groups = sampler.draw(trials)
+    missing = 5 - len(board)
+    full_board = np.concatenate(
+        [
+            np.broadcast_to(np.asarray(board, dtype=np.int64), (trials, len(board))),
+            drawn[:, :missing],
+        ],
+        axis=1,
+    )
+    hero = np.concatenate(
+        [np.broadcast_to(np.asarray(hole_cards), (trials, 2)), full_board], axis=1
+    )
+    opponents = np.concatenate(
+        [
+            drawn[:, missing:].reshape(trials, num_opponents, 2),
+            np.broadcast_to(full_board[:, None, :], (trials, num_opponents, 5)),
+        ],
+        axis=2,
+    )
+    shares = _showdown_shares(evaluate_batch(hero), evaluate_batch(opponents))
+    tally.add(shares, groups)
+
+
+def hand_equity(
+    hole_cards: Sequence[int],
+    board: Sequence[int],
+    num_opponents: int = 1,
+    trials: int = 10000,
+    rng: Optional[np.random.Generator] = None,
+    sampling: Sampling = Sampling.QUASI,
+) -> float:
+    """
+    Estimate the equity of a hand against random opponent hands by Monte
+    Carlo simulation, scoring all trials in one batch.
+
+    Args:
+        hole_cards: Hero's two int cards
+        board: Zero to five int cards on the board
+        num_opponents: Number of opponents holding random hands
+        trials: Number of simulated deals
+        rng: Random generator, a fresh unseeded one by default
+        sampling: How deals are drawn, see ``Sampling``
+
+    Returns:
+        float: Hero's expected share of the pot
+
+    Raises:
+        ValueError: If the cards don't form a valid situation or ``trials``
+            is not positive
+    """
+    if trials < 1:
+        raise ValueError("At least one trial is needed")
+    sampler, tally = _setup(hole_cards, board, num_opponents, sampling, rng)
+    _simulate(hole_cards, board, num_opponents, sampler, tally, trials)
+    return tally.estimate()[0]
+
+
+class EquityEstimate(NamedTuple):
+    """
+    A Monte Carlo equity estimate.
+
+    Args:
+        equity: Mean share of the pot
+        std_error: Standard error of the mean
+        trials: Number of simulated deals
+        confidence: Level of the confidence interval, e.g. 0.95
+    """
+
+    equity: float
+    std_error: float
+    trials: int
+    confidence: float
+
+    @property
+    def half_width(self) -> float:
+        return NormalDist().inv_cdf((1 + self.confidence) / 2) * self.std_error
+
+    @property
+    def interval(self) -> Tuple[float, float]:
+        return self.equity - self.half_width, self.equity + self.half_width
+
+
+def estimate_equity(
+    hole_cards: Sequence[int],
+    board: Sequence[int],
+    num_opponents: int = 1,
+    precision: float = 0.005,
+    confidence: float = 0.95,
+    max_time: Optional[float] = None,
+    batch_size: int = 2000,
+    max_trials: int = 1_000_000,
+    rng: Optional[np.random.Generator] = None,
+    sampling: Sampling = Sampling.QUASI,
+) -> EquityEstimate:
+    """
+    Estimate equity like ``hand_equity``, but simulate batch after batch
+    until the confidence interval is narrow enough.
+
+    Sampling stops as soon as the half-width of the interval is at most
+    ``precision``, ``max_time`` seconds have passed or ``max_trials`` deals
+    have been simulated, whichever comes first. Lopsided spots settle after
+    a batch or two; close ones keep sampling until they are resolved.
+
+    Args:
+        hole_cards: Hero's two int cards
+        board: Zero to five int cards on the board
+        num_opponents: Number of opponents holding random hands
+        precision: Target half-width of the confidence interval
+        confidence: Level of the confidence interval
+        max_time: Time budget in seconds, unlimited by default
+        batch_size: Number of deals simulated between checks
+        max_trials: Most deals simulated
+        rng: Random generator, a fresh unseeded one by default
+        sampling: How deals are drawn, see ``Sampling``
+
+    Returns:
+        EquityEstimate: The estimate, its standard error and interval
+
+    Raises:
+        ValueError: If the cards don't form a valid situation or
+            ``batch_size`` or ``max_trials`` is not positive
+    """
+    if batch_size < 1 or max_trials < 1:
+        raise ValueError("batch_size and max_trials must be positive")
+    sampler, tally = _setup(hole_cards, board, num_opponents, sampling, rng)
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    deadline = None if max_time is None else time.perf_counter() + max_time
+
+    # Every pass simulates at least one deal, and the loop ends before an
+    # empty batch
+    while tally.trials < max_trials:
+        size = min(batch_size, max_trials - tally.trials)
+        _simulate(hole_cards, board, num_opponents, sampler, tally, size)
+        mean, std_error = tally.estimate()
+        if z * std_error <= precision or (
+            deadline is not None and time.perf_counter() >= deadline
+        ):
+            break
+    return EquityEstimate(mean, std_error, tally.trials, confidence)
+
+
+def _class_matrix(classes: np.ndarray, num_classes: int) -> np.ndarray:
+    """One-hot matrix of shape ``(NUM_COMBOS, num_classes)``."""
+    matrix = np.zeros((NUM_COMBOS, num_classes), dtype=np.float64)
+    matrix[np.arange(NUM_COMBOS), classes] = 1
+    return matrix
+
+
+# CONFLICTS[c] lists the 100 other combos sharing a card with combo c
+CONFLICTS = np.array(
+    [
+        [
+            other
+            for other in np.concatenate([CARD_COMBOS[low], CARD_COMBOS[high]])
+            if other != combo
+        ]
+        for combo, (low, high) in enumerate(COMBOS)
+    ],
+    dtype=np.int64,
+)
+
+
+def class_equity(
+    classes: Sequence[int],
+    num_boards: int = 2000,
+    batch_size: int = 16,
+    rng: Optional[np.random.Generator] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Estimate the all-in preflop equity between classes of starting hands.
+
+    Every combo is scored on each sampled board in one batch. For each combo
+    and class, the class combos it beats and ties are counted with one sort
+    per board, and the combos sharing a card with it are taken back out, so
+    card removal between the two hands is exact and only the boards are
+    sampled.
+
+    Args:
+        classes: Class of each of the 1326 combos, e.g. ``preflop_index``
+        num_boards: Number of random five-card boards
+        batch_size: Number of boards scored at once
+        rng: Random generator, a fresh unseeded one by default
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The number of non-overlapping combo
+        pairs of each pair of classes, and the first class's share of the
+        pot between them, both of shape ``(num_classes, num_classes)``
+    """
+    rng = rng or np.random.default_rng()
+    classes = np.asarray(classes, dtype=np.int64)
+    num_classes = int(classes.max()) + 1
+    one_hot = _class_matrix(classes, num_classes)
+    conflict_classes = classes[CONFLICTS]
+
+    disjoint = (COMBO_MASKS[:, None] & COMBO_MASKS[None, :]) == 0
+    matchups = one_hot.T @ disjoint @ one_hot
+
+    # Twice the share of the pot and the number of matchups of each combo
+    # against each class, summed over boards
+    doubled = np.zeros((NUM_COMBOS, num_classes))
+    counts = np.zeros((NUM_COMBOS, num_classes))
+    boards_alive = np.zeros(NUM_COMBOS)
+    index = np.arange(NUM_COMBOS)[:, None] * num_classes + conflict_classes
+    length = NUM_COMBOS * num_classes
+    for start in range(0, num_boards, batch_size):
+        size = min(batch_size, num_boards - start)
+        boards = _sample_cards(np.arange(NUM_CARDS), 5, size, rng)
+        cards = np.concatenate(
+            [
+                np.broadcast_to(COMBOS, (size, NUM_COMBOS, 2)),
+                np.broadcast_to(boards[:, None, :], (size, NUM_COMBOS, 5)),
+            ],
+            axis=2,
+        )
+        board_masks = (np.int64(1) << boards).sum(axis=1)
+        alive = (COMBO_MASKS[None, :] & board_masks[:, None]) == 0
+        scores = np.where(alive, evaluate_batch(cards), -1)
+        boards_alive += alive.sum(axis=0)
+
+        # Class counts of the alive combos, cumulated in score order
+        order = np.argsort(scores, axis=1)
+        sorted_classes = np.where(
+            np.take_along_axis(alive, order, axis=1), classes[order], num_classes
+        )
+        cumulative = np.zeros((size, NUM_COMBOS + 1, num_classes + 1), np.int32)
+        np.put_along_axis(cumulative[:, 1:], sorted_classes[:, :, None], 1, axis=2)
+        cumulative = cumulative.cumsum(axis=1, dtype=np.int32)[:, :, :num_classes]
+
+        rows = np.arange(size)[:, None]
+        flat = (np.take_along_axis(scores, order, axis=1) + rows * _ROW_OFFSET).ravel()
+        keys = scores + rows * _ROW_OFFSET
+        row_starts = rows * NUM_COMBOS
+        # Dead combos point at the empty first row and add nothing
+        left = np.where(alive, np.searchsorted(flat, keys, "left") - row_starts, 0)
+        right = np.where(alive, np.searchsorted(flat, keys, "right") - row_starts, 0)
+        doubled += cumulative[rows, left].sum(axis=0, dtype=np.int64)
+        doubled += cumulative[rows, right].sum(axis=0, dtype=np.int64)
+        counts += alive.T.astype(np.int64) @ cumulative[:, -1]
+
+        # Take out the combos sharing a card: a lower one was counted twice
+        # and a tie once
+        conflict_scores = scores[:, CONFLICTS]
+        conflict_alive = alive[:, CONFLICTS] & alive[:, :, None]
+        own = scores[:, :, None]
+        lower = conflict_alive & (conflict_scores < own)
+        tied = conflict_alive & (conflict_scores == own)
+        flat_index = np.broadcast_to(index, conflict_scores.shape)
+        doubled -= np.bincount(
+            flat_index.ravel(), (2 * lower + tied).ravel(), minlength=length
+        ).reshape(NUM_COMBOS, num_classes)
+        counts -= np.bincount(flat_index[conflict_alive], minlength=length).reshape(
+            NUM_COMBOS, num_classes
+        )
+
+    # Every alive combo also tied itself
+    doubled -= one_hot * boards_alive[:, None]
+    counts -= one_hot * boards_alive[:, None]
+
+    class_shares = one_hot.T @ doubled / 2
+    class_counts = one_hot.T @ counts
+    equity = np.divide(
+        class_shares,
+        class_counts,
+        out=np.full_like(class_shares, 0.5),
+        where=class_counts > 0,
+    )
+    return matchups, equity
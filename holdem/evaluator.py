@@ -6,6 +6,7 @@ from typing import List, Tuple
 
 from pydantic import BaseModel
 
+from . import lookup, variants
 from .models import Card, Rank
 
 
@@ -83,6 +84,102 @@ class Evaluator:
         hand_type, ranks = cls._get_hand_type(all_cards)
         return HandEvaluation(hand_type=hand_type, ranks=ranks)
 
+    @classmethod
+    def score(cls, hole_cards: List[Card], community_cards: List[Card]) -> int:
+        """
+        Score a poker hand with the lookup tables. Scores order hands the same
+        way as ``evaluate`` but cost a few table lookups instead of building a
+        HandEvaluation, so they suit comparing many hands.
+
+        Args:
+            hole_cards: A player's two hole cards
+            community_cards: The community cards on the table
+
+        Returns:
+            int: The hand's score, higher is better
+
+        Raises:
+            ValueError: If the total number of cards is not between 5 and 7
+        """
+        cards = [card.to_int() for card in hole_cards + community_cards]
+        if not 5 <= len(cards) <= 7:
+            raise ValueError("Can only score poker hands of 5 to 7 cards")
+        return lookup.evaluate(cards)
+
+    @classmethod
+    def from_score(cls, score: int) -> HandEvaluation:
+        """Convert a score from ``score`` into a HandEvaluation."""
+        return HandEvaluation(
+            hand_type=HandType(lookup.hand_type(score)),
+            ranks=[Rank(rank) for rank in lookup.hand_ranks(score)],
+        )
+
+    @classmethod
+    def score_omaha(cls, hole_cards: List[Card], community_cards: List[Card]) -> int:
+        """
+        Score an Omaha hand: the best of two hole cards and three community
+        cards. Scores order hands the same way as ``score``.
+
+        Args:
+            hole_cards: A player's four or five hole cards
+            community_cards: Three to five community cards
+
+        Returns:
+            int: The hand's score, higher is better
+
+        Raises:
+            ValueError: If there are too few or too many cards
+        """
+        return variants.evaluate_omaha(
+            [card.to_int() for card in hole_cards],
+            [card.to_int() for card in community_cards],
+        )
+
+    @classmethod
+    def evaluate_omaha(
+        cls, hole_cards: List[Card], community_cards: List[Card]
+    ) -> HandEvaluation:
+        """Evaluate an Omaha hand, like ``score_omaha``, as a HandEvaluation."""
+        return cls.from_score(cls.score_omaha(hole_cards, community_cards))
+
+    @classmethod
+    def score_short_deck(
+        cls, hole_cards: List[Card], community_cards: List[Card]
+    ) -> int:
+        """
+        Score a short-deck (6+) hand, where a flush beats a full house and
+        three of a kind beats a straight. Short-deck scores only compare with
+        each other.
+
+        Args:
+            hole_cards: A player's two hole cards
+            community_cards: The community cards on the table
+
+        Returns:
+            int: The hand's short-deck score, higher is better
+
+        Raises:
+            ValueError: If the total number of cards is not between 5 and 7
+                or a card is below a six
+        """
+        cards = [card.to_int() for card in hole_cards + community_cards]
+        return variants.evaluate_short_deck(cards)
+
+    @classmethod
+    def evaluate_short_deck(
+        cls, hole_cards: List[Card], community_cards: List[Card]
+    ) -> HandEvaluation:
+        """
+        Evaluate a short-deck hand as a HandEvaluation. HandEvaluations order
+        hand types by the standard rules, so compare short-deck hands by
+        ``score_short_deck`` instead.
+        """
+        score = cls.score_short_deck(hole_cards, community_cards)
+        return HandEvaluation(
+            hand_type=HandType(variants.short_deck_hand_type(score)),
+            ranks=[Rank(rank) for rank in lookup.hand_ranks(score)],
+        )
+
     @classmethod
     def _get_hand_type(cls, cards: List[Card]) -> Tuple[HandType, List[Rank]]:
         """
@@ -173,22 +270,6 @@ class Evaluator:
         if most_common[0][1] == 3 and most_common[1][1] >= 2:
             return HandType.FULL_HOUSE, [most_common[0][0], most_common[1][0]]
 
-        # If we have three pairs, we can form a full house by using the two highest pairs
-        # By poker rules, we can choose which cards to use to make our best 5-card hand
-        # So from three pairs, we can use the highest pair twice (making a "trips") and the second highest as a pair
-        if (
-            len(most_common) >= 3
-            and most_common[0][1] == 2
-            and most_common[1][1] == 2
-            and most_common[2][1] == 2
-        ):
-            # Get the ranks of the three pairs in descending order
-            pair_ranks = sorted(
-                [rank for rank, count in most_common[:3] if count == 2], reverse=True
-            )
-            # Use the highest pair as trips and second highest as the pair part of the full house
-            return HandType.FULL_HOUSE, [pair_ranks[0], pair_ranks[1]]
-
         if is_flush:
             # Get the 5 highest cards of the flush suit
             flush_suit = next(suit for suit in set(suits) if suits.count(suit) >= 5)
@@ -216,8 +297,10 @@ class Evaluator:
             return HandType.THREE_OF_A_KIND, [trips_rank] + kickers
 
         if most_common[0][1] == 2 and most_common[1][1] == 2:  # Two pair
-            high_pair = most_common[0][0]
-            low_pair = most_common[1][0]
+            # With three pairs the lowest one only competes as a kicker
+            high_pair, low_pair = sorted(
+                [rank for rank, count in most_common if count == 2], reverse=True
+            )[:2]
             kicker = next(
                 r
                 for r in sorted(unique_ranks, reverse=True)
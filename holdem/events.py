@@ -0,0 +1,102 @@
+"""
+Typed events of the hands an engine plays.
+
+A ``HoldemEngine`` given an ``EventBuffer`` records what happens in each
+hand as ``Event`` tuples: the start of the hand, the hole cards dealt, the
+blinds, every action, every new street and the awards that settle it. Events
+are written into a preallocated buffer and handed to subscribers in
+batches, when the buffer fills up and when it is flushed, so that stats,
+persistence or a UI can consume them without parsing log messages.
+"""
+
+from enum import Enum
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .models import ActionType, Street
+
+
+class EventType(str, Enum):
+    HAND_START = "hand_start"
+    DEAL = "deal"
+    BLIND = "blind"
+    ACTION = "action"
+    STREET = "street"
+    SHOWDOWN = "showdown"
+
+
+class Event(NamedTuple):
+    """
+    One event of a hand.
+
+    Args:
+        type: What happened
+        hand: Number of the hand at the engine, counting from 1
+        street: Street of the hand
+        seat: Seat concerned: the button for ``HAND_START``, the player for
+            ``DEAL``, ``BLIND``, ``ACTION`` and ``SHOWDOWN``, otherwise -1
+        action: The action type of an ``ACTION``
+        amount: Chips put in by a ``BLIND`` or ``ACTION`` or won at
+            ``SHOWDOWN``
+        cards: Int cards: the hole cards of a ``DEAL`` or ``SHOWDOWN`` and
+            the new board cards of a ``STREET``
+
+    There is one ``SHOWDOWN`` per seat awarded chips, also when the hand
+    ended with everyone else folding.
+    """
+
+    type: EventType
+    hand: int
+    street: Street
+    seat: int = -1
+    action: Optional[ActionType] = None
+    amount: int = 0
+    cards: Tuple[int, ...] = ()
+
+
+Subscriber = Callable[[Sequence[Event]], None]
+
+
+class EventBuffer:
+    """
+    A fixed-size buffer of events delivered in batches.
+
+    Its slots are allocated once and written in turn; whenever they are all
+    used, and on ``flush``, the pending events go to every subscriber as one
+    list, which subscribers are free to keep.
+
+    Args:
+        capacity: Number of events delivered at most per batch
+    """
+
+    def __init__(self, capacity: int = 4096):
+        if capacity < 1:
+            raise ValueError("An event buffer needs at least one slot")
+        self._slots: List[Optional[Event]] = [None] * capacity
+        self._size = 0
+        self._subscribers: List[Subscriber] = []
+
+    def subscribe(self, subscriber: Subscriber):
+        """Deliver batches of events to ``subscriber`` from now on."""
+        self._subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.remove(subscriber)
+
+    def __len__(self) -> int:
+        """Return the number of events waiting to be delivered."""
+        return self._size
+
+    def emit(self, event: Event):
+        self._slots[self._size] = event
+        self._size += 1
+        if self._size == len(self._slots):
+            self.flush()
+
+    def flush(self):
+        """Deliver the pending events."""
+        if not self._size:
+            return
+        batch = self._slots[: self._size]
+        self._size = 0
+        for subscriber in self._subscribers:
+            subscriber(batch)
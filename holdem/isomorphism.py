@@ -0,0 +1,134 @@
+"""
+Suit isomorphism for hole cards and boards.
+
+Suits carry no value of their own, so situations that differ only by a
+permutation of suits are strategically the same. ``canonicalize`` maps every
+such situation to one representative: each suit is described by the ranks it
+holds in the hole cards and on each street of the board, suits are ordered by
+that description, and relabelled in that order. Suits with the same
+description are interchangeable, so ties don't change the result.
+"""
+
+from math import comb
+from typing import List, Sequence, Tuple
+
+from .lookup import NUM_CARDS
+
+NUM_PREFLOP_CLASSES = 169
+
+# Cards dealt in each round: hole cards, flop, turn, river
+_ROUND_SIZES = (2, 3, 1, 1)
+
+Situation = Tuple[Tuple[int, ...], ...]
+
+
+def _rounds(hole_cards: Sequence[int], board: Sequence[int]) -> List[Sequence[int]]:
+    if len(hole_cards) != 2 or len(board) not in (0, 3, 4, 5):
+        raise ValueError("Expected two hole cards and a board of 0, 3, 4 or 5 cards")
+    return [hole_cards, board[:3], board[3:4], board[4:5]][: 1 + max(len(board) - 2, 0)]
+
+
+def canonical_suits(hole_cards: Sequence[int], board: Sequence[int]) -> List[int]:
+    """
+    Return the suit relabelling that canonicalizes a situation.
+
+    Returns:
+        List[int]: The canonical suit of each suit index
+    """
+    return _suit_mapping(_rounds(hole_cards, board))
+
+
+def _suit_mapping(rounds: List[Sequence[int]]) -> List[int]:
+    signatures = [[0] * len(rounds) for _ in range(4)]
+    for round_index, cards in enumerate(rounds):
+        for card in cards:
+            signatures[card & 3][round_index] |= 1 << (card >> 2)
+    order = sorted(range(4), key=signatures.__getitem__, reverse=True)
+    mapping = [0] * 4
+    for canonical, suit in enumerate(order):
+        mapping[suit] = canonical
+    return mapping
+
+
+def canonicalize(hole_cards: Sequence[int], board: Sequence[int]) -> Situation:
+    """
+    Map a situation to the canonical member of its suit isomorphism class.
+
+    Args:
+        hole_cards: Two int cards
+        board: Zero, three, four or five int cards
+
+    Returns:
+        Situation: The relabelled cards of each round (hole cards, flop,
+        turn, river), each sorted in ascending order
+
+    Raises:
+        ValueError: If the number of cards is not a Hold'em situation
+    """
+    mapping = canonical_suits(hole_cards, board)
+    return tuple(
+        tuple(sorted(card & ~3 | mapping[card & 3] for card in cards))
+        for cards in _rounds(hole_cards, board)
+    )
+
+
+def canonical_board(board: Sequence[int]) -> Tuple[Tuple[int, ...], List[int]]:
+    """
+    Canonicalize a board on its own, without hole cards.
+
+    Args:
+        board: Zero, three, four or five int cards
+
+    Returns:
+        Tuple[Tuple[int, ...], List[int]]: The relabelled board, the flop
+        sorted and the turn and river in order, and the suit relabelling
+        that produced it
+
+    Raises:
+        ValueError: If the board is not a Hold'em board
+    """
+    if len(board) not in (0, 3, 4, 5):
+        raise ValueError("Expected a board of 0, 3, 4 or 5 cards")
+    rounds = [board[:3], board[3:4], board[4:5]][: max(len(board) - 2, 0)]
+    mapping = _suit_mapping(rounds)
+    relabelled = tuple(
+        card
+        for cards in rounds
+        for card in sorted(card & ~3 | mapping[card & 3] for card in cards)
+    )
+    return relabelled, mapping
+
+
+def _colex(cards: Sequence[int]) -> int:
+    """Index a sorted set of cards among all sets of the same size."""
+    return sum(comb(card, i + 1) for i, card in enumerate(cards))
+
+
+def canonical_index(hole_cards: Sequence[int], board: Sequence[int]) -> int:
+    """
+    Return a stable integer index for the isomorphism class of a situation.
+
+    Isomorphic situations share an index and different classes never do, as
+    long as they are on the same street. The index combines the colex index
+    of each round's canonical cards, so it is stable across runs and
+    processes but is not dense: it ranges over every set of cards, not only
+    canonical ones.
+    """
+    index = 0
+    for cards, size in zip(canonicalize(hole_cards, board), _ROUND_SIZES):
+        index = index * comb(NUM_CARDS, size) + _colex(cards)
+    return index
+
+
+def preflop_index(hole_cards: Sequence[int]) -> int:
+    """
+    Return the dense index of a starting hand among the 169 preflop classes.
+
+    Pairs come first, then suited hands, then offsuit hands.
+    """
+    first, second = hole_cards
+    high, low = max(first >> 2, second >> 2), min(first >> 2, second >> 2)
+    if high == low:
+        return high
+    offset = 13 if first & 3 == second & 3 else 13 + 78
+    return offset + high * (high - 1) // 2 + low
@@ -0,0 +1,558 @@
+"""
+Lookup-table hand evaluation on integer cards.
+
+Cards are ints in ``range(52)`` encoded as ``(rank - 2) * 4 + suit`` where
+``suit`` indexes ``Suit.all()``. A hand is scored as a single int that orders
+hands exactly like ``HandEvaluation``: the hand type sits above bit 20 and the
+tie-breaking ranks follow as 4-bit nibbles, most important first.
+
+Scores come from two tables:
+
+* a rank table keyed by the rank multiset of the hand (the sum of ``5 ** r``
+  over its cards), covering every hand of 5 to 7 cards that is not a flush
+* a flush table indexed by the 13-bit rank mask of a suit, which is zero for
+  masks with fewer than five ranks
+
+so scoring a hand is a handful of additions and a few table lookups, and
+``evaluate_batch`` does the same for whole arrays of hands with NumPy.
+
+Building the tables takes about a second, so the first import builds them
+into a versioned, checksummed file in a cache directory (see ``cache_path``)
+and later imports memory-map that file instead, rebuilding it only when it
+is missing, damaged or from another version of the tables.
+
+A process that starts workers can also ``publish_tables``: workers started
+afterwards find the published tables through the ``HOLDEM_SHARED_TABLES``
+environment variable when they import this module and map them in place,
+and worker initializers given the path switch to them with
+``attach_tables`` in case the module was imported earlier.
+The dict and list read by the scalar ``evaluate`` are built from the mapped
+arrays on its first call, so processes that only score batches keep to the
+shared pages.
+"""
+
+import hashlib
+import os
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .shared import SharedArrays
+
+# Mirrors evaluator.HandType, which can't be imported here without pydantic
+HIGH_CARD = 1
+PAIR = 2
+TWO_PAIR = 3
+THREE_OF_A_KIND = 4
+STRAIGHT = 5
+FLUSH = 6
+FULL_HOUSE = 7
+FOUR_OF_A_KIND = 8
+STRAIGHT_FLUSH = 9
+ROYAL_FLUSH = 10
+
+NUM_CARDS = 52
+NUM_RANKS = 13
+HAND_TYPE_SHIFT = 20
+
+_POW5 = [5**r for r in range(NUM_RANKS)]
+_WHEEL = [5, 4, 3, 2, 14]
+
+RANK_CHARS = "23456789TJQKA"
+SUIT_CHARS = "shdc"
+
+
+def card_to_int(rank: int, suit: int) -> int:
+    """Encode a rank (2-14) and suit index (0-3) as an int card."""
+    return (rank - 2) * 4 + suit
+
+
+def card_rank(card: int) -> int:
+    """Return the rank (2-14) of an int card."""
+    return (card >> 2) + 2
+
+
+def card_suit(card: int) -> int:
+    """Return the suit index (0-3) of an int card."""
+    return card & 3
+
+
+def parse_cards(text: str) -> List[int]:
+    """
+    Parse cards written like ``"AsKd"`` or ``"As Kd Th"`` into int cards.
+
+    Raises:
+        ValueError: If the text is not a sequence of rank and suit characters
+    """
+    text = text.replace(" ", "").replace(",", "")
+    if len(text) % 2:
+        raise ValueError(f"Invalid cards: {text}")
+    cards = []
+    for i in range(0, len(text), 2):
+        rank = RANK_CHARS.find(text[i].upper())
+        suit = SUIT_CHARS.find(text[i + 1].lower())
+        if rank < 0 or suit < 0:
+            raise ValueError(f"Invalid card: {text[i:i + 2]}")
+        cards.append(rank * 4 + suit)
+    return cards
+
+
+def card_str(card: int) -> str:
+    """Format an int card like ``"As"``."""
+    return RANK_CHARS[card >> 2] + SUIT_CHARS[card & 3]
+
+
+def hand_type(score: int) -> int:
+    """Return the ``HandType`` value of a score."""
+    return score >> HAND_TYPE_SHIFT
+
+
+def hand_ranks(score: int) -> List[int]:
+    """Return the tie-breaking ranks of a score, most important first."""
+    ranks = []
+    for shift in range(HAND_TYPE_SHIFT - 4, -4, -4):
+        rank = score >> shift & 0xF
+        if rank:
+            ranks.append(rank)
+    return ranks
+
+
+def _pack(hand_type: int, ranks: Sequence[int]) -> int:
+    score = hand_type
+    for i in range(5):
+        score = score << 4 | (ranks[i] if i < len(ranks) else 0)
+    return score
+
+
+def _straight_high(unique_ranks: Sequence[int]) -> int:
+    """Return the high card of the best straight in descending ranks, or 0."""
+    for i in range(len(unique_ranks) - 4):
+        if unique_ranks[i] - unique_ranks[i + 4] == 4:
+            return unique_ranks[i]
+    if 14 in unique_ranks and all(r in unique_ranks for r in (2, 3, 4, 5)):
+        return 5
+    return 0
+
+
+def _straight_ranks(high: int) -> List[int]:
+    return _WHEEL if high == 5 else list(range(high, high - 5, -1))
+
+
+def _rank_score(counts: Sequence[int]) -> int:
+    """
+    Score a hand that is not a flush from the count of each rank.
+
+    Follows the rules of ``Evaluator._get_hand_type``.
+    """
+    unique_ranks = [r + 2 for r in range(NUM_RANKS - 1, -1, -1) if counts[r]]
+    groups = sorted(
+        ((counts[r - 2], r) for r in unique_ranks),
+        key=lambda group: (-group[0], -group[1]),
+    )
+
+    if groups[0][0] == 4:
+        kicker = next(r for r in unique_ranks if r != groups[0][1])
+        return _pack(FOUR_OF_A_KIND, [groups[0][1], kicker])
+
+    if groups[0][0] == 3 and groups[1][0] >= 2:
+        return _pack(FULL_HOUSE, [groups[0][1], groups[1][1]])
+
+    high = _straight_high(unique_ranks)
+    if high:
+        return _pack(STRAIGHT, _straight_ranks(high))
+
+    if groups[0][0] == 3:
+        kickers = [r for r in unique_ranks if r != groups[0][1]][:2]
+        return _pack(THREE_OF_A_KIND, [groups[0][1]] + kickers)
+
+    if groups[0][0] == 2 and groups[1][0] == 2:
+        pairs = [groups[0][1], groups[1][1]]
+        kicker = next(r for r in unique_ranks if r not in pairs)
+        return _pack(TWO_PAIR, pairs + [kicker])
+
+    if groups[0][0] == 2:
+        kickers = [r for r in unique_ranks if r != groups[0][1]][:3]
+        return _pack(PAIR, [groups[0][1]] + kickers)
+
+    return _pack(HIGH_CARD, unique_ranks[:5])
+
+
+def _flush_score(mask: int) -> int:
+    """Score the flush made by the ranks in a suit's 13-bit rank mask."""
+    unique_ranks = [r + 2 for r in range(NUM_RANKS - 1, -1, -1) if mask >> r & 1]
+    if len(unique_ranks) < 5:
+        return 0
+    high = _straight_high(unique_ranks)
+    if high == 14:
+        return _pack(ROYAL_FLUSH, _straight_ranks(high))
+    if high:
+        return _pack(STRAIGHT_FLUSH, _straight_ranks(high))
+    return _pack(FLUSH, unique_ranks[:5])
+
+
+def _rank_multisets(num_cards: int):
+    """Yield every rank count vector of ``num_cards`` cards."""
+    counts = [0] * NUM_RANKS
+
+    def fill(rank: int, remaining: int):
+        if rank == NUM_RANKS - 1:
+            if remaining <= 4:
+                counts[rank] = remaining
+                yield counts
+            return
+        for count in range(min(remaining, 4) + 1):
+            counts[rank] = count
+            yield from fill(rank + 1, remaining - count)
+        counts[rank] = 0
+
+    yield from fill(0, num_cards)
+
+
+def build_tables() -> Tuple[Dict[int, int], List[int]]:
+    """Build the rank table and flush table from scratch."""
+    rank_table = {}
+    for num_cards in range(5, 8):
+        for counts in _rank_multisets(num_cards):
+            key = sum(_POW5[r] * count for r, count in enumerate(counts))
+            rank_table[key] = _rank_score(counts)
+    flush_table = [_flush_score(mask) for mask in range(1 << NUM_RANKS)]
+    return rank_table, flush_table
+
+
+SHARED_TABLES_VARIABLE = "HOLDEM_SHARED_TABLES"
+CACHE_DIR_VARIABLE = "HOLDEM_CACHE_DIR"
+
+# Bump whenever the tables' contents change, so that cached files are rebuilt
+TABLES_VERSION = 2
+_TABLE_NAMES = ("rank_keys", "rank_scores", "flush_scores")
+
+
+def _attach_tables() -> Optional[SharedArrays]:
+    path = os.environ.get(SHARED_TABLES_VARIABLE)
+    if not path:
+        return None
+    try:
+        shared = SharedArrays.attach(path)
+    except Exception:
+        # Published by a process that has since cleaned up, or not tables at
+        # all: the process loads its own
+        return None
+    if any(name not in shared for name in _TABLE_NAMES):
+        return None
+    return shared
+
+
+def _build_arrays() -> Dict[str, np.ndarray]:
+    rank_table, flush_table = build_tables()
+    # The rank table as sorted key and score arrays for evaluate_batch
+    keys = np.array(sorted(rank_table), dtype=np.int64)
+    return {
+        "rank_keys": keys,
+        "rank_scores": np.array([rank_table[key] for key in keys], dtype=np.int32),
+        "flush_scores": np.array(flush_table, dtype=np.int32),
+    }
+
+
+def cache_path() -> Optional[str]:
+    """
+    Return the file the tables are cached in, or None when caching is off.
+
+    The cache directory is ``HOLDEM_CACHE_DIR`` when set, caching being off
+    when it is empty, and ``holdem`` in the user's cache directory otherwise.
+    """
+    directory = os.environ.get(CACHE_DIR_VARIABLE)
+    if directory is None:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+            os.path.expanduser("~"), ".cache"
+        )
+        directory = os.path.join(base, "holdem")
+    if not directory:
+        return None
+    return os.path.join(directory, f"lookup-v{TABLES_VERSION}.tables")
+
+
+def _checksum(arrays: Dict[str, np.ndarray]) -> np.ndarray:
+    digest = hashlib.sha256()
+    for name in _TABLE_NAMES:
+        digest.update(arrays[name].tobytes())
+    return np.frombuffer(digest.digest(), dtype=np.uint8)
+
+
+def _read_cache(path: str) -> Optional[SharedArrays]:
+    """Map the cached tables, or return None if they are missing or damaged."""
+    try:
+        cached = SharedArrays.attach(path)
+        if any(name not in cached for name in _TABLE_NAMES + ("checksum",)):
+            return None
+        if not np.array_equal(cached["checksum"], _checksum(cached)):
+            return None
+    except Exception:
+        # Truncated, garbled or written with another layout: any failure to
+        # read it only means rebuilding
+        return None
+    return cached
+
+
+def _write_cache(path: str, arrays: Dict[str, np.ndarray]):
+    """Write the tables to the cache, leaving no partial file behind."""
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        SharedArrays.create({**arrays, "checksum": _checksum(arrays)}, temporary)
+        os.replace(temporary, path)
+    except OSError:
+        # An unwritable cache only costs later processes a rebuild
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def load_tables() -> Dict[str, np.ndarray]:
+    """
+    Return the evaluator tables as arrays, memory-mapped from the cache file
+    when it is there and intact, and otherwise built and written to it.
+    """
+    path = cache_path()
+    if path is None:
+        return _build_arrays()
+    cached = _read_cache(path)
+    if cached is not None:
+        return {name: cached[name] for name in _TABLE_NAMES}
+    arrays = _build_arrays()
+    _write_cache(path, arrays)
+    return arrays
+
+
+_SHARED_TABLES = _attach_tables()
+_TABLES = load_tables() if _SHARED_TABLES is None else _SHARED_TABLES
+_RANK_KEYS = _TABLES["rank_keys"]
+_RANK_SCORES = _TABLES["rank_scores"]
+_FLUSH_SCORES = _TABLES["flush_scores"]
+_POW5_ARRAY = np.array(_POW5, dtype=np.int64)
+
+# The dict and list that ``evaluate`` reads, built from the arrays the first
+# time it runs: processes that only score batches never hold private copies
+_RANK_TABLE: Optional[Dict[int, int]] = None
+_FLUSH_TABLE: Optional[List[int]] = None
+
+
+def _scalar_tables() -> Tuple[Dict[int, int], List[int]]:
+    """Return the rank and flush tables of ``evaluate``, building them once."""
+    global _RANK_TABLE, _FLUSH_TABLE
+    if _RANK_TABLE is None or _FLUSH_TABLE is None:
+        _RANK_TABLE = dict(zip(_RANK_KEYS.tolist(), _RANK_SCORES.tolist()))
+        _FLUSH_TABLE = _FLUSH_SCORES.tolist()
+    return _RANK_TABLE, _FLUSH_TABLE
+
+
+def __getattr__(name: str):
+    # RANK_TABLE and FLUSH_TABLE are built on first use, like in evaluate
+    if name == "RANK_TABLE":
+        return _scalar_tables()[0]
+    if name == "FLUSH_TABLE":
+        return _scalar_tables()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def publish_tables(arrays: Optional[Dict[str, np.ndarray]] = None) -> SharedArrays:
+    """
+    Share the evaluator tables, and any other arrays, with worker processes.
+
+    The tables are written to shared memory and ``HOLDEM_SHARED_TABLES`` is
+    set to their path, so worker processes started afterwards map them at
+    import. Workers reach the other arrays, such as equity or bucket tables,
+    through ``shared_tables``. Call ``unlink`` on the result once the workers
+    are done.
+
+    Args:
+        arrays: Other arrays to share, by name
+
+    Returns:
+        SharedArrays: The shared arrays
+    """
+    shared = SharedArrays.create(
+        {
+            "rank_keys": _RANK_KEYS,
+            "rank_scores": _RANK_SCORES,
+            "flush_scores": _FLUSH_SCORES,
+            **(arrays or {}),
+        }
+    )
+    os.environ[SHARED_TABLES_VARIABLE] = shared.path
+    return shared
+
+
+@contextmanager
+def published_tables(
+    arrays: Optional[Dict[str, np.ndarray]] = None
+) -> Iterator[SharedArrays]:
+    """
+    Publish the tables with ``publish_tables`` for the workers started in a
+    ``with`` block, unlinking them and restoring ``HOLDEM_SHARED_TABLES``
+    when it ends.
+    """
+    previous = os.environ.get(SHARED_TABLES_VARIABLE)
+    shared = publish_tables(arrays)
+    try:
+        yield shared
+    finally:
+        shared.unlink()
+        if previous is None:
+            os.environ.pop(SHARED_TABLES_VARIABLE, None)
+        else:
+            os.environ[SHARED_TABLES_VARIABLE] = previous
+
+
+def attach_tables(path: str):
+    """
+    Switch this process to the tables published at ``path``.
+
+    Worker initializers call it with the path their parent published: a
+    worker that imported this module before ``HOLDEM_SHARED_TABLES`` was set,
+    such as one forked from a server started earlier, then drops its own
+    tables for the shared ones. Nothing changes if they are already in use.
+
+    Raises:
+        FileNotFoundError: If nothing is published at ``path``
+    """
+    global _SHARED_TABLES, _TABLES, _RANK_KEYS, _RANK_SCORES, _FLUSH_SCORES
+    global _RANK_TABLE, _FLUSH_TABLE
+    if _SHARED_TABLES is not None and _SHARED_TABLES.path == path:
+        return
+    shared = SharedArrays.attach(path)
+    _SHARED_TABLES = _TABLES = shared
+    _RANK_KEYS = shared["rank_keys"]
+    _RANK_SCORES = shared["rank_scores"]
+    _FLUSH_SCORES = shared["flush_scores"]
+    _RANK_TABLE = _FLUSH_TABLE = None
+
+
+def shared_tables() -> Optional[SharedArrays]:
+    """Return the shared arrays this process mapped its tables from, if any."""
+    return _SHARED_TABLES
+
+
+def evaluate(cards: Sequence[int]) -> int:
+    """
+    Score a hand of 5 to 7 int cards. Higher scores are better hands.
+
+    Args:
+        cards: The int cards of the hand
+
+    Returns:
+        int: The hand's score
+    """
+    rank_table = _RANK_TABLE
+    flush = _FLUSH_TABLE
+    if rank_table is None or flush is None:
+        rank_table, flush = _scalar_tables()
+    key = 0
+    masks = [0, 0, 0, 0]
+    for card in cards:
+        rank = card >> 2
+        key += _POW5[rank]
+        masks[card & 3] |= 1 << rank
+    return max(
+        rank_table[key],
+        flush[masks[0]],
+        flush[masks[1]],
+        flush[masks[2]],
+        flush[masks[3]],
+    )
+
+
+def evaluate_on_board(
+    hole_cards: Sequence[Sequence[int]], board: Sequence[int]
+) -> List[int]:
+    """
+    Score several hands that share a board, like ``evaluate`` on each hand's
+    cards and the board but preparing the board's key and masks only once.
+
+    Args:
+        hole_cards: The int cards each hand adds to the board
+        board: The int cards on the board
+
+    Returns:
+        List[int]: The score of each hand
+    """
+    rank_table, flush = _scalar_tables()
+    board_key = 0
+    board_masks = [0, 0, 0, 0]
+    for card in board:
+        rank = card >> 2
+        board_key += _POW5[rank]
+        board_masks[card & 3] |= 1 << rank
+    scores = []
+    for cards in hole_cards:
+        key = board_key
+        masks = board_masks[:]
+        for card in cards:
+            rank = card >> 2
+            key += _POW5[rank]
+            masks[card & 3] |= 1 << rank
+        scores.append(
+            max(
+                rank_table[key],
+                flush[masks[0]],
+                flush[masks[1]],
+                flush[masks[2]],
+                flush[masks[3]],
+            )
+        )
+    return scores
+
+
+def batch_keys(cards: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute what scoring needs from a batch of (possibly partial) hands.
+
+    Rank keys of disjoint sets of cards add up and suit masks combine with
+    ``|``, so cards shared by many hands, like a board, and cards that vary,
+    like hole cards, can be prepared once each and combined by broadcasting
+    before calling ``score_keys``.
+
+    Args:
+        cards: Int cards of shape ``(..., k)``
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Rank keys of shape ``(...)`` and suit
+        rank masks of shape ``(..., 4)``
+    """
+    cards = np.asarray(cards)
+    ranks = cards >> 2
+    keys = _POW5_ARRAY[ranks].sum(axis=-1)
+    suits = cards & 3
+    bits = np.left_shift(1, ranks, dtype=np.int32)
+    masks = np.stack(
+        [
+            np.bitwise_or.reduce(np.where(suits == suit, bits, 0), axis=-1)
+            for suit in range(4)
+        ],
+        axis=-1,
+    )
+    return keys, masks
+
+
+def score_keys(keys: np.ndarray, masks: np.ndarray) -> np.ndarray:
+    """Score hands of 5 to 7 cards from their rank keys and suit masks."""
+    index = np.searchsorted(_RANK_KEYS, keys)
+    scores = np.asarray(_RANK_SCORES[np.minimum(index, len(_RANK_KEYS) - 1)])
+    for suit in range(4):
+        np.maximum(scores, _FLUSH_SCORES[masks[..., suit]], out=scores)
+    return scores
+
+
+def evaluate_batch(cards: np.ndarray) -> np.ndarray:
+    """
+    Score many hands at once.
+
+    Args:
+        cards: Int cards of shape ``(..., k)`` with ``5 <= k <= 7``, one hand
+            per row along the last axis
+
+    Returns:
+        np.ndarray: The int32 scores, with the last axis of ``cards`` removed.
+        Hands that repeat a card get a meaningless score instead of an error,
+        so callers can mask them out afterwards.
+    """
+    return score_keys(*batch_keys(cards))
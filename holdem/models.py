@@ -2,9 +2,9 @@ from __future__ import annotations
 
 import random
 from enum import Enum, IntEnum
-from typing import List
+from typing import Any, List, NamedTuple, Optional, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 
 class Rank(IntEnum):
@@ -54,16 +54,39 @@ class Card(BaseModel):
             rank_str = "A"
         return f"{rank_str}{self.suit.value}"
 
+    def to_int(self) -> int:
+        """Encode the card as an int card for the lookup evaluator."""
+        return (self.rank - 2) * 4 + _SUIT_INDEX[self.suit]
+
+    @classmethod
+    def from_int(cls, card: int) -> "Card":
+        return cls(rank=Rank((card >> 2) + 2), suit=_SUITS[card & 3])
+
+
+_SUITS = Suit.all()
+_SUIT_INDEX = {suit: index for index, suit in enumerate(_SUITS)}
+
+# Cards are never modified once made, so every deck shares one set of them,
+# in standard order: the position of a card is its int encoding
+_STANDARD_DECK = tuple(
+    Card(rank=rank, suit=suit) for rank in Rank.all() for suit in Suit.all()
+)
+
 
 class Deck(BaseModel):
-    cards: List[Card] = Field(
-        default_factory=lambda: [
-            Card(rank=rank, suit=suit) for rank in Rank.all() for suit in Suit.all()
-        ]
-    )
+    """
+    A deck of cards, in standard order until shuffled.
+
+    ``rng`` is anything with a ``shuffle`` method, such as a
+    ``random.Random`` or a ``holdem.rng.HandStream``; the global ``random``
+    module is used when it is not set.
+    """
+
+    cards: List[Card] = Field(default_factory=lambda: list(_STANDARD_DECK))
+    rng: Any = Field(default=None, exclude=True)
 
     def shuffle(self):
-        random.shuffle(self.cards)
+        (self.rng or random).shuffle(self.cards)
 
     def draw(self) -> Card:
         return self.cards.pop()
@@ -84,15 +107,15 @@ class Deck(BaseModel):
         return self.deal(1)
 
     def reset(self):
-        self.cards = [
-            Card(rank=rank, suit=suit) for rank in Rank.all() for suit in Suit.all()
-        ]
+        self.cards = list(_STANDARD_DECK)
 
 
 class ActionType(str, Enum):
     FOLD = "fold"
     CHECK = "check"
+    CALL = "call"
     BET = "bet"
+    RAISE = "raise"
 
 
 class Street(str, Enum):
@@ -103,6 +126,12 @@ class Street(str, Enum):
 
 
 class Action(BaseModel):
+    """
+    A player action. ``amount`` is the number of chips the action moves from
+    the player's stack into the pot, so a call is the amount owed and a raise
+    includes the call.
+    """
+
     type: ActionType
     street: Street
     amount: float
@@ -114,16 +143,69 @@ class Player(BaseModel):
     chips: int
     hand: List[Card] = Field(default_factory=list)
     is_folded: bool = False
+    bet: int = 0
+    contributed: int = 0
 
     def reset(self):
         self.hand = []
         self.is_folded = False
+        self.bet = 0
+        self.contributed = 0
 
     def make_decision(self, table: Table) -> Action:
         raise NotImplementedError("Subclasses must implement this method")
 
 
+class LegalActions(NamedTuple):
+    """
+    The actions open to the player to act. Amounts are chips moved into the
+    pot, matching ``Action.amount``; raising is allowed for any amount from
+    ``min_raise`` to ``max_raise``.
+    """
+
+    can_fold: bool
+    can_check: bool
+    call_amount: int
+    min_raise: int
+    max_raise: int
+
+    @property
+    def can_call(self) -> bool:
+        return self.call_amount > 0
+
+    @property
+    def can_raise(self) -> bool:
+        return self.max_raise > 0
+
+
+NO_LEGAL_ACTIONS = LegalActions(False, False, 0, 0, 0)
+
+
+# Kinds of entries in Table._undo_log
+_ACTION = 0
+_DEAL_BOARD = 1
+_DEAL_HANDS = 2
+
+
+def _next_seat(mask: int, seat: int) -> int:
+    """Return the first seat in ``mask`` after ``seat``, wrapping around."""
+    higher = mask >> (seat + 1) << (seat + 1)
+    if not higher:
+        higher = mask
+    return (higher & -higher).bit_length() - 1
+
+
 class Table(BaseModel):
+    """
+    A table and the state of the hand in play.
+
+    ``rng`` drives the table's own random choices and is shared with its
+    deck when the deck has none; the global ``random`` module is used when
+    it is not set.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     players: List[Player]
     deck: Deck = Field(default_factory=Deck)
     community_cards: List[Card] = Field(default_factory=list)
@@ -134,69 +216,376 @@ class Table(BaseModel):
     current_street: Street = Street.PREFLOP
     action_history: List[Action] = Field(default_factory=list)
     pot: int = 0
-
-    def reset(self):
+    current_bet: int = 0
+    min_raise: int = 0
+    rng: Optional[random.Random] = Field(default=None, exclude=True)
+
+    # Seat bitmasks: bit i is set when players[i] is in the hand (live), can
+    # still act (active, i.e. live and not all-in), owes an action in the
+    # current betting round (to_act) and may still raise in it (can_raise),
+    # which a player who has acted loses until a full raise reopens it
+    _live_mask: int = PrivateAttr(default=0)
+    _active_mask: int = PrivateAttr(default=0)
+    _to_act_mask: int = PrivateAttr(default=0)
+    _can_raise_mask: int = PrivateAttr(default=0)
+
+    # Legal actions of the player to act, refreshed whenever the turn moves
+    _legal_actions: LegalActions = PrivateAttr(default=NO_LEGAL_ACTIONS)
+
+    # Undo log for apply_action/undo_action: one tuple per applied step
+    _undo_log: List[Tuple] = PrivateAttr(default_factory=list)
+
+    def model_post_init(self, __context) -> None:
+        if self.deck.rng is None:
+            self.deck.rng = self.rng
+        self._reset_masks()
+
+    def reset(self, dealer_index: Optional[int] = None, shuffle: bool = True):
+        """
+        Reset for a new hand with the button at ``dealer_index``, or at random.
+
+        Pass ``shuffle=False`` to leave the deck in standard order when its
+        cards are about to be replaced, as when replaying a recorded hand.
+        """
+        self._reset_hand(shuffle)
+        if dealer_index is None:
+            dealer_index = (self.rng or random).randint(0, len(self.players) - 1)
+        self.dealer_index = dealer_index
+
+    def next_hand(self):
+        """Reset for a new hand and move the button to the next player."""
+        self._reset_hand()
+        self.dealer_index = _next_seat(self._live_mask, self.dealer_index)
+
+    def _reset_hand(self, shuffle: bool = True):
         self.deck.reset()
-        self.deck.shuffle()
+        if shuffle:
+            self.deck.shuffle()
         self.community_cards = []
         for player in self.players:
             player.reset()
-        self.dealer_index = random.randint(0, len(self.players) - 1)
+            # Players without chips sit the hand out
+            player.is_folded = player.chips <= 0
         self.current_street = Street.PREFLOP
+        self.action_history = []
+        self.pot = 0
+        self.current_bet = 0
+        self.min_raise = self.big_blind
+        self._reset_masks()
+        self._undo_log.clear()
+
+    def _reset_masks(self):
+        live = 0
+        active = 0
+        for seat, player in enumerate(self.players):
+            if not player.is_folded:
+                live |= 1 << seat
+                if player.chips > 0:
+                    active |= 1 << seat
+        self._live_mask = live
+        self._active_mask = active
+        self._to_act_mask = 0
+        self._can_raise_mask = 0
+        self._legal_actions = NO_LEGAL_ACTIONS
+
+    @property
+    def num_live(self) -> int:
+        """Number of players who have not folded."""
+        return bin(self._live_mask).count("1")
+
+    @property
+    def is_hand_over(self) -> bool:
+        """True once all but one player have folded."""
+        return self._live_mask & (self._live_mask - 1) == 0
+
+    @property
+    def is_round_complete(self) -> bool:
+        """True when nobody owes an action in the current betting round."""
+        return self._to_act_mask == 0 or self.is_hand_over
+
+    @property
+    def legal_actions(self) -> LegalActions:
+        """The legal actions of the player at ``current_player_index``."""
+        return self._legal_actions
+
+    def is_live(self, seat: int) -> bool:
+        return bool(self._live_mask >> seat & 1)
+
+    def is_all_in(self, seat: int) -> bool:
+        return bool((self._live_mask & ~self._active_mask) >> seat & 1)
 
     def deal_hands(self):
+        self._push_undo(_DEAL_HANDS)
         for player in self.players:
-            player.hand = self.deck.deal_hand()
+            if not player.is_folded:
+                player.hand = self.deck.deal_hand()
 
     def deal_flop(self):
-        self.community_cards = self.deck.deal_flop()
-        self.current_street = Street.FLOP
+        self._deal_board(3, Street.FLOP)
 
     def deal_turn(self):
-        self.community_cards.extend(self.deck.deal_turn())
-        self.current_street = Street.TURN
+        self._deal_board(1, Street.TURN)
 
     def deal_river(self):
-        self.community_cards.extend(self.deck.deal_river())
-        self.current_street = Street.RIVER
+        self._deal_board(1, Street.RIVER)
+
+    def _deal_board(self, n: int, street: Street):
+        self._push_undo(_DEAL_BOARD)
+        for _ in range(n):
+            self.community_cards.append(self.deck.draw())
+        self._start_round(street)
+
+    def _start_round(self, street: Street):
+        """Open the betting round for ``street``."""
+        for player in self.players:
+            player.bet = 0
+        self.current_street = street
+        self.current_bet = 0
+        self.min_raise = self.big_blind
+        active = self._active_mask
+        # No betting once fewer than two players can act
+        self._to_act_mask = active if active & (active - 1) else 0
+        self._can_raise_mask = self._to_act_mask
+        if active:
+            self.current_player_index = _next_seat(active, self.dealer_index)
+        self._update_legal_actions()
 
     def post_blinds(self) -> List[Action]:
         actions = []
-        self.current_player_index = self.dealer_index
-        actions.append(
-            Action(
-                type=ActionType.BET,
-                street=Street.PREFLOP,
-                amount=self.small_blind,
-                player=self.next_player(),
-            )
-        )
-        actions.append(
-            Action(
+        seat = self.dealer_index
+        for amount in (self.small_blind, self.big_blind):
+            seat = _next_seat(self._live_mask, seat)
+            player = self.players[seat]
+            self._push_undo(_ACTION, seat)
+            action = Action(
                 type=ActionType.BET,
                 street=Street.PREFLOP,
-                amount=self.big_blind,
-                player=self.next_player(),
+                amount=min(amount, player.chips),
+                player=player,
             )
+            self._commit(seat, int(action.amount))
+            self.action_history.append(action)
+            actions.append(action)
+
+        self.current_bet = self.big_blind
+        self.min_raise = self.big_blind
+        active = self._active_mask
+        self._to_act_mask = active if active & (active - 1) else 0
+        self._can_raise_mask = self._to_act_mask
+        self.current_player_index = _next_seat(
+            self._to_act_mask or self._live_mask, seat
         )
-        self.action_history.extend(actions)
+        self._update_legal_actions()
         return actions
 
     def next_player(self) -> Player:
-        self.current_player_index = (self.current_player_index + 1) % len(self.players)
+        self.current_player_index = _next_seat(
+            self._to_act_mask or self._live_mask, self.current_player_index
+        )
+        self._update_legal_actions()
         return self.players[self.current_player_index]
 
     def take_actions(self) -> List[Action]:
+        """Run the current betting round until the action closes."""
         actions = []
-        for player in self.players:
-            if player.is_active:
-                action = player.make_decision(self)
-                if not self.validate_action(action):
-                    raise ValueError(f"Invalid action: {action}")
-                actions.append(action)
-
-        self.action_history.extend(actions)
+        while not self.is_round_complete:
+            player = self.players[self.current_player_index]
+            action = player.make_decision(self)
+            self.apply_action(action)
+            actions.append(action)
         return actions
 
     def validate_action(self, action: Action) -> bool:
-        return True
+        """Check an action against the precomputed legal action set."""
+        if action.player is not self.players[self.current_player_index]:
+            return False
+        if action.street != self.current_street:
+            return False
+
+        legal = self._legal_actions
+        amount = action.amount
+        if action.type == ActionType.FOLD:
+            return legal.can_fold and amount == 0
+        if action.type == ActionType.CHECK:
+            return legal.can_check and amount == 0
+        if action.type == ActionType.CALL:
+            return legal.can_call and amount == legal.call_amount
+        if action.type == (ActionType.RAISE if self.current_bet else ActionType.BET):
+            return (
+                legal.can_raise
+                and legal.min_raise <= amount <= legal.max_raise
+                and amount == int(amount)
+            )
+        return False
+
+    def _update_legal_actions(self):
+        """Recompute the legal actions after the turn has moved."""
+        seat = self.current_player_index
+        bit = 1 << seat
+        if not self._to_act_mask & bit or self.is_hand_over:
+            self._legal_actions = NO_LEGAL_ACTIONS
+            return
+
+        player = self.players[seat]
+        to_call = min(self.current_bet - player.bet, player.chips)
+        # Raising needs chips beyond the call, an opponent who can respond and
+        # no action since the last full raise
+        if (
+            player.chips > to_call
+            and self._active_mask & ~bit
+            and self._can_raise_mask & bit
+        ):
+            max_raise = player.chips
+            min_raise = min(self.current_bet - player.bet + self.min_raise, max_raise)
+        else:
+            min_raise = max_raise = 0
+        self._legal_actions = LegalActions(
+            True, to_call == 0, to_call, min_raise, max_raise
+        )
+
+    def apply_action(self, action: Action):
+        """
+        Apply an action by the current player in place.
+
+        The previous state is pushed onto an undo log so that ``undo_action``
+        can restore it exactly. Nothing else is allocated, which lets tree
+        search agents walk the game tree on a single table.
+
+        Args:
+            action: The action taken by the player at ``current_player_index``
+
+        Raises:
+            ValueError: If the action is not valid in the current state
+        """
+        if not self.validate_action(action):
+            raise ValueError(f"Invalid action: {action}")
+
+        seat = self.current_player_index
+        bit = 1 << seat
+        player = self.players[seat]
+        self._push_undo(_ACTION, seat)
+
+        if action.type == ActionType.FOLD:
+            player.is_folded = True
+            self._live_mask &= ~bit
+            self._active_mask &= ~bit
+        elif action.type != ActionType.CHECK:
+            self._commit(seat, int(action.amount))
+            if player.bet > self.current_bet:
+                # Everyone else who can act owes at least a call, but only a
+                # full raise lets those who have acted raise again; a short
+                # all-in leaves it closed to them
+                raised = player.bet - self.current_bet
+                if raised >= self.min_raise:
+                    self.min_raise = raised
+                    self._can_raise_mask = self._active_mask
+                self.current_bet = player.bet
+                self._to_act_mask = self._active_mask
+
+        self._to_act_mask &= ~bit
+        self._can_raise_mask &= ~bit
+        self.action_history.append(action)
+        if self._to_act_mask and not self.is_hand_over:
+            self.current_player_index = _next_seat(self._to_act_mask, seat)
+        self._update_legal_actions()
+
+    def _commit(self, seat: int, amount: int):
+        """Move ``amount`` chips from a player's stack into the pot."""
+        player = self.players[seat]
+        player.chips -= amount
+        player.bet += amount
+        player.contributed += amount
+        self.pot += amount
+        if player.chips == 0:
+            self._active_mask &= ~(1 << seat)
+
+    def undo_action(self):
+        """
+        Revert the most recent ``apply_action``, blind post or deal.
+
+        Raises:
+            IndexError: If there is nothing to undo
+        """
+        if not self._undo_log:
+            raise IndexError("No action to undo")
+
+        (
+            kind,
+            seat,
+            player_state,
+            pot,
+            current_player_index,
+            current_street,
+            current_bet,
+            min_raise,
+            masks,
+            history_length,
+            board_length,
+        ) = self._undo_log.pop()
+
+        if kind == _ACTION:
+            player = self.players[seat]
+            (
+                player.chips,
+                player.bet,
+                player.contributed,
+                player.is_folded,
+            ) = player_state
+            del self.action_history[history_length:]
+        elif kind == _DEAL_BOARD:
+            # Cards go back on top of the deck in reverse order of drawing
+            while len(self.community_cards) > board_length:
+                self.deck.cards.append(self.community_cards.pop())
+            for player, bet in zip(self.players, player_state):
+                player.bet = bet
+        else:
+            for player in reversed(self.players):
+                self.deck.cards.extend(reversed(player.hand))
+                player.hand = []
+
+        self.pot = pot
+        self.current_player_index = current_player_index
+        self.current_street = current_street
+        self.current_bet = current_bet
+        self.min_raise = min_raise
+        (
+            self._live_mask,
+            self._active_mask,
+            self._to_act_mask,
+            self._can_raise_mask,
+        ) = masks
+        self._update_legal_actions()
+
+    def _push_undo(self, kind: int, seat: int = -1):
+        if kind == _ACTION:
+            player = self.players[seat]
+            player_state: Tuple = (
+                player.chips,
+                player.bet,
+                player.contributed,
+                player.is_folded,
+            )
+        elif kind == _DEAL_BOARD:
+            player_state = tuple(player.bet for player in self.players)
+        else:
+            player_state = ()
+        self._undo_log.append(
+            (
+                kind,
+                seat,
+                player_state,
+                self.pot,
+                self.current_player_index,
+                self.current_street,
+                self.current_bet,
+                self.min_raise,
+                (
+                    self._live_mask,
+                    self._active_mask,
+                    self._to_act_mask,
+                    self._can_raise_mask,
+                ),
+                len(self.action_history),
+                len(self.community_cards),
+            )
+        )
@@ -0,0 +1,228 @@
+"""
+Outs and draws on the flop and turn.
+
+Outs are found with bit operations on 13-bit rank masks rather than by
+scoring every possible next card: flush outs are the ranks missing from a
+four-card suit, straight outs come from a precomputed table of the ranks
+that complete a straight for every rank mask, and pair-based improvements
+come from the count of each rank.
+"""
+
+from math import comb
+from typing import Dict, List, NamedTuple, Sequence
+
+from .lookup import (
+    FLUSH,
+    FOUR_OF_A_KIND,
+    FULL_HOUSE,
+    HIGH_CARD,
+    NUM_CARDS,
+    NUM_RANKS,
+    PAIR,
+    STRAIGHT,
+    STRAIGHT_FLUSH,
+    THREE_OF_A_KIND,
+    TWO_PAIR,
+    evaluate,
+    hand_type,
+)
+
+FLUSH_DRAW = "flush draw"
+OPEN_ENDED = "open-ended straight draw"
+GUTSHOT = "gutshot"
+DOUBLE_GUTSHOT = "double gutshot"
+OVERCARDS = "overcards"
+
+_ALL_CARDS = (1 << NUM_CARDS) - 1
+_ALL_RANKS = (1 << NUM_RANKS) - 1
+
+# Rank masks of the ten straights, the wheel (ace low) last
+STRAIGHTS = [0b11111 << low for low in range(NUM_RANKS - 4)][::-1] + [1 << 12 | 0b1111]
+
+
+def _has_straight(mask: int) -> bool:
+    return any(mask & straight == straight for straight in STRAIGHTS)
+
+
+HAS_STRAIGHT = [_has_straight(mask) for mask in range(1 << NUM_RANKS)]
+
+# Ranks from ace low to ace high, for finding runs of four
+_RUN_ORDER = [NUM_RANKS - 1] + list(range(NUM_RANKS))
+
+# STRAIGHT_COMPLETIONS[mask] is the mask of ranks that would give a hand
+# holding the ranks in ``mask`` a straight it doesn't have yet
+STRAIGHT_COMPLETIONS = [
+    (
+        0
+        if HAS_STRAIGHT[mask]
+        else sum(
+            1 << rank
+            for rank in range(NUM_RANKS)
+            if not mask >> rank & 1 and HAS_STRAIGHT[mask | 1 << rank]
+        )
+    )
+    for mask in range(1 << NUM_RANKS)
+]
+
+
+class Outs(NamedTuple):
+    """
+    The cards that improve a hand, grouped by the hand type they make.
+
+    Each card is listed once, under the best type it is counted for.
+    """
+
+    by_type: Dict[int, List[int]]
+    draws: List[str]
+    probability: float
+
+    @property
+    def cards(self) -> List[int]:
+        return sorted(card for cards in self.by_type.values() for card in cards)
+
+    @property
+    def count(self) -> int:
+        return sum(len(cards) for cards in self.by_type.values())
+
+
+def _ranks(rank_mask: int) -> List[int]:
+    return [rank for rank in range(NUM_RANKS) if rank_mask >> rank & 1]
+
+
+def _cards_of_ranks(rank_mask: int, unseen: int) -> List[int]:
+    """Unseen cards whose rank is in ``rank_mask``."""
+    return [
+        rank * 4 + suit
+        for rank in _ranks(rank_mask)
+        for suit in range(4)
+        if unseen >> (rank * 4 + suit) & 1
+    ]
+
+
+def _rank_mask(cards: Sequence[int]) -> int:
+    mask = 0
+    for card in cards:
+        mask |= 1 << (card >> 2)
+    return mask
+
+
+def _pair_type(counts: Sequence[int]) -> int:
+    """Return the hand type made by the repeated ranks in ``counts`` alone."""
+    first, second = sorted(counts, reverse=True)[:2]
+    if first >= 4:
+        return FOUR_OF_A_KIND
+    if first == 3:
+        return FULL_HOUSE if second >= 2 else THREE_OF_A_KIND
+    if first == 2:
+        return TWO_PAIR if second == 2 else PAIR
+    return HIGH_CARD
+
+
+def _straight_draw(held: int, ranks: int) -> str:
+    """Name the shape of a straight draw completed by ``ranks``."""
+    if bin(ranks).count("1") == 1:
+        return GUTSHOT
+    for low in range(len(_RUN_ORDER) - 5):
+        below, *run, above = _RUN_ORDER[low : low + 6]
+        ends = 1 << below | 1 << above
+        if ranks & ends == ends and all(held >> rank & 1 for rank in run):
+            return OPEN_ENDED
+    return DOUBLE_GUTSHOT
+
+
+def find_outs(hole_cards: Sequence[int], board: Sequence[int]) -> Outs:
+    """
+    List the outs of a hand on the flop or turn.
+
+    Outs are counted for straight flushes, flushes and straights the hole
+    cards help make, for pairing a hole card, and for full houses and quads
+    that use a hole card. Cards that only improve the board are not outs.
+
+    Args:
+        hole_cards: Two int cards
+        board: Three or four int cards on the board
+
+    Returns:
+        Outs: The outs by hand type, the draws present and the chance of
+        hitting at least one out by the river
+
+    Raises:
+        ValueError: If the board is not a flop or a turn
+    """
+    if len(hole_cards) != 2 or len(board) not in (3, 4):
+        raise ValueError("Outs need two hole cards and a flop or turn")
+    cards = list(hole_cards) + list(board)
+    unseen = _ALL_CARDS
+    for card in cards:
+        unseen &= ~(1 << card)
+    current = hand_type(evaluate(cards))
+
+    counts = [0] * NUM_RANKS
+    board_counts = [0] * NUM_RANKS
+    suit_masks = [0, 0, 0, 0]
+    board_suit_masks = [0, 0, 0, 0]
+    for card in cards:
+        counts[card >> 2] += 1
+        suit_masks[card & 3] |= 1 << (card >> 2)
+    for card in board:
+        board_counts[card >> 2] += 1
+        board_suit_masks[card & 3] |= 1 << (card >> 2)
+    hole_ranks = _rank_mask(hole_cards)
+    board_ranks = _rank_mask(board)
+
+    # The best hand type each out makes
+    best: Dict[int, int] = {}
+    draws: List[str] = []
+
+    def add(hand: int, outs: List[int]):
+        for card in outs:
+            if hand > best.get(card, HIGH_CARD):
+                best[card] = hand
+
+    for suit, mask in enumerate(suit_masks):
+        if not any(card & 3 == suit for card in hole_cards):
+            continue
+        size = bin(mask).count("1")
+        if size == 4 and current < FLUSH:
+            draws.append(FLUSH_DRAW)
+            add(FLUSH, [rank * 4 + suit for rank in _ranks(_ALL_RANKS & ~mask)])
+        if size >= 4:
+            ranks = STRAIGHT_COMPLETIONS[mask]
+            ranks &= ~STRAIGHT_COMPLETIONS[board_suit_masks[suit]]
+            add(STRAIGHT_FLUSH, [rank * 4 + suit for rank in _ranks(ranks)])
+
+    if current < STRAIGHT:
+        # Ranks that complete a straight the board alone wouldn't make
+        ranks = STRAIGHT_COMPLETIONS[hole_ranks | board_ranks]
+        ranks &= ~STRAIGHT_COMPLETIONS[board_ranks]
+        if ranks:
+            draws.append(_straight_draw(hole_ranks | board_ranks, ranks))
+            add(STRAIGHT, _cards_of_ranks(ranks, unseen))
+
+    if current == HIGH_CARD and _ranks(hole_ranks)[0] > board_ranks.bit_length() - 1:
+        draws.append(OVERCARDS)
+    for rank in range(NUM_RANKS):
+        rank_cards = _cards_of_ranks(1 << rank, unseen)
+        if not rank_cards:
+            continue
+        counts[rank] += 1
+        board_counts[rank] += 1
+        hand = _pair_type(counts)
+        # Pairing a board card only counts when it fills up or makes quads
+        # with a hole card
+        if (
+            hand > current
+            and hand > _pair_type(board_counts)
+            and (hole_ranks >> rank & 1 or hand >= FULL_HOUSE)
+        ):
+            add(hand, rank_cards)
+        counts[rank] -= 1
+        board_counts[rank] -= 1
+
+    by_type: Dict[int, List[int]] = {}
+    for card in sorted(best):
+        by_type.setdefault(best[card], []).append(card)
+    num_unseen = NUM_CARDS - len(cards)
+    to_come = 5 - len(board)
+    probability = 1 - comb(num_unseen - len(best), to_come) / comb(num_unseen, to_come)
+    return Outs(by_type, draws, probability)
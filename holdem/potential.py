@@ -0,0 +1,128 @@
+"""
+Hand strength and hand potential.
+
+Implements the classic measures of Billings et al. against one opponent
+holding any hand:
+
+* HS, the share of opponent hands currently beaten (ties count half)
+* PPOT, the chance that a hand behind or tied ends up ahead
+* NPOT, the chance that a hand ahead or tied ends up behind
+
+Every opponent hand and every runout to the river is enumerated, but hands
+are scored in batches: the board-plus-runout part and the opponent part are
+prepared once each and combined by broadcasting.
+"""
+
+import itertools
+from typing import NamedTuple, Sequence
+
+import numpy as np
+
+from .lookup import NUM_CARDS, batch_keys, evaluate, evaluate_batch, score_keys
+from .ranges import cards_mask
+
+AHEAD = 0
+TIED = 1
+BEHIND = 2
+
+
+class HandPotential(NamedTuple):
+    hand_strength: float
+    positive_potential: float
+    negative_potential: float
+
+    @property
+    def effective_strength(self) -> float:
+        """EHS: the chance of being ahead now and staying there, or getting there."""
+        return (
+            self.hand_strength * (1 - self.negative_potential)
+            + (1 - self.hand_strength) * self.positive_potential
+        )
+
+
+def _compare(ours: np.ndarray, theirs: np.ndarray) -> np.ndarray:
+    """Map score comparisons to AHEAD, TIED or BEHIND."""
+    return np.where(ours > theirs, AHEAD, np.where(ours == theirs, TIED, BEHIND))
+
+
+def _combinations(cards: Sequence[int], size: int) -> np.ndarray:
+    combos = list(itertools.combinations(cards, size))
+    return np.array(combos, dtype=np.int64).reshape(len(combos), size)
+
+
+def _masks(cards: np.ndarray) -> np.ndarray:
+    return (np.int64(1) << cards).sum(axis=1)
+
+
+def hand_potential(hole_cards: Sequence[int], board: Sequence[int]) -> HandPotential:
+    """
+    Compute HS, PPOT and NPOT of a hand on the flop or turn.
+
+    The potentials look ahead to the river. Following Billings et al.,
+
+        PPOT = (HP[behind][ahead] + HP[behind][tied] / 2 + HP[tied][ahead] / 2)
+               / (HP[behind] + HP[tied] / 2)
+
+    and NPOT mirrors it, where ``HP[now][river]`` counts (opponent hand,
+    runout) pairs by the comparison now and on the river.
+
+    Args:
+        hole_cards: Two int cards
+        board: Three or four int cards on the board
+
+    Returns:
+        HandPotential: HS, PPOT and NPOT
+
+    Raises:
+        ValueError: If the board is not a flop or a turn
+    """
+    if len(hole_cards) != 2 or len(board) not in (3, 4):
+        raise ValueError("Hand potential needs two hole cards and a flop or turn")
+    dead = cards_mask(list(hole_cards) + list(board))
+    deck = [card for card in range(NUM_CARDS) if not dead >> card & 1]
+
+    opponents = _combinations(deck, 2)
+    runouts = _combinations(deck, 5 - len(board))
+
+    # Where each opponent hand stands now
+    ours_now = evaluate(list(hole_cards) + list(board))
+    board_now = np.broadcast_to(np.asarray(board), (len(opponents), len(board)))
+    theirs_now = evaluate_batch(np.concatenate([opponents, board_now], axis=1))
+    now = _compare(ours_now, theirs_now)
+
+    # Where it stands on the river, for every runout it doesn't block
+    runout_keys, runout_masks = batch_keys(
+        np.concatenate(
+            [np.broadcast_to(np.asarray(board), (len(runouts), len(board))), runouts],
+            axis=1,
+        )
+    )
+    hole_keys, hole_masks = batch_keys(np.asarray(hole_cards))
+    opponent_keys, opponent_masks = batch_keys(opponents)
+    ours_river = score_keys(runout_keys + hole_keys, runout_masks | hole_masks)
+    theirs_river = score_keys(
+        runout_keys[:, None] + opponent_keys[None, :],
+        runout_masks[:, None, :] | opponent_masks[None, :, :],
+    )
+    river = _compare(ours_river[:, None], theirs_river)
+    valid = (_masks(runouts)[:, None] & _masks(opponents)[None, :]) == 0
+
+    counts = np.bincount((now[None, :] * 3 + river)[valid], minlength=9).reshape(3, 3)
+    totals = counts.sum(axis=1)
+
+    now_counts = np.bincount(now, minlength=3)
+    hand_strength = (now_counts[AHEAD] + now_counts[TIED] / 2) / len(opponents)
+
+    behind_or_tied = totals[BEHIND] + totals[TIED] / 2
+    positive = (
+        counts[BEHIND, AHEAD] + counts[BEHIND, TIED] / 2 + counts[TIED, AHEAD] / 2
+    )
+    ahead_or_tied = totals[AHEAD] + totals[TIED] / 2
+    negative = (
+        counts[AHEAD, BEHIND] + counts[TIED, BEHIND] / 2 + counts[AHEAD, TIED] / 2
+    )
+    return HandPotential(
+        float(hand_strength),
+        float(positive / behind_or_tied) if behind_or_tied else 0.0,
+        float(negative / ahead_or_tied) if ahead_or_tied else 0.0,
+    )
@@ -0,0 +1,169 @@
+"""
+Hand ranges over the 1326 two-card combos.
+
+Combos are numbered in a fixed order with both cards as int cards (see
+``holdem.lookup``), and a range is a flat array of one weight per combo.
+"""
+
+import re
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .lookup import NUM_CARDS, RANK_CHARS, parse_cards
+
+NUM_COMBOS = NUM_CARDS * (NUM_CARDS - 1) // 2
+
+# COMBOS[i] holds the two cards of combo i, lowest card first
+COMBOS = np.array(
+    [(low, high) for high in range(NUM_CARDS) for low in range(high)], dtype=np.int64
+)
+
+# COMBO_INDEX[a, b] is the combo holding cards a and b, -1 when a == b
+COMBO_INDEX = np.full((NUM_CARDS, NUM_CARDS), -1, dtype=np.int64)
+COMBO_INDEX[COMBOS[:, 0], COMBOS[:, 1]] = np.arange(NUM_COMBOS)
+COMBO_INDEX[COMBOS[:, 1], COMBOS[:, 0]] = np.arange(NUM_COMBOS)
+
+# Bitmask of the cards in each combo, for testing card removal against a board
+COMBO_MASKS = (np.int64(1) << COMBOS[:, 0]) | (np.int64(1) << COMBOS[:, 1])
+
+_HAND_PATTERN = re.compile(
+    r"^([2-9TJQKA])([2-9TJQKA])([so]?)(\+?)(?:-([2-9TJQKA])([2-9TJQKA])[so]?)?$",
+    re.IGNORECASE,
+)
+
+
+def combo_index(cards: Sequence[int]) -> int:
+    """
+    Return the combo index of two int cards.
+
+    Raises:
+        ValueError: If the two cards are the same card
+    """
+    index = int(COMBO_INDEX[cards[0], cards[1]])
+    if index < 0:
+        raise ValueError(f"A combo needs two different cards, got {cards[0]} twice")
+    return index
+
+
+def cards_mask(cards: Sequence[int]) -> int:
+    """Return the bitmask of a collection of int cards."""
+    mask = 0
+    for card in cards:
+        mask |= 1 << card
+    return mask
+
+
+def _rank_combos(high: int, low: int, suited: str) -> List[int]:
+    """Combos of two rank indexes, restricted to suited ('s') or offsuit ('o')."""
+    combos = []
+    for suit_a in range(4):
+        for suit_b in range(4):
+            if high == low and suit_b <= suit_a:
+                continue
+            if suited == "s" and suit_a != suit_b:
+                continue
+            if suited == "o" and suit_a == suit_b:
+                continue
+            combos.append(int(COMBO_INDEX[high * 4 + suit_a, low * 4 + suit_b]))
+    return combos
+
+
+def _expand(token: str) -> List[int]:
+    """Expand one token of range notation into combo indexes."""
+    if len(token) == 4 and token[1] in "shdcSHDC":
+        return [combo_index(parse_cards(token))]
+
+    match = _HAND_PATTERN.match(token)
+    if not match:
+        raise ValueError(f"Invalid range token: {token}")
+    first, second, suited, plus, last_first, last_second = match.groups()
+    suited = suited.lower()
+    high = RANK_CHARS.index(first.upper())
+    low = RANK_CHARS.index(second.upper())
+    if low > high:
+        high, low = low, high
+    if high == low and suited:
+        raise ValueError(f"Pairs can't be suited or offsuit: {token}")
+
+    pairs: List[Tuple[int, int]] = []
+    if high == low:
+        # QQ+ climbs to aces, QQ-99 steps down to the end of the span
+        top = RANK_CHARS.index(last_first.upper()) if last_first else high
+        if plus:
+            top = len(RANK_CHARS) - 1
+        for rank in range(min(high, top), max(high, top) + 1):
+            pairs.append((rank, rank))
+    else:
+        # A9s+ raises the kicker up to just below the top card, and
+        # A9s-A6s steps it down to the end of the span
+        end = low
+        if plus:
+            end = high - 1
+        elif last_second:
+            end = RANK_CHARS.index(last_second.upper())
+        for kicker in range(min(low, end), max(low, end) + 1):
+            pairs.append((high, kicker))
+
+    combos = []
+    for first_rank, second_rank in pairs:
+        combos.extend(_rank_combos(first_rank, second_rank, suited))
+    return combos
+
+
+class Range:
+    """
+    A weighted range of hole-card combos.
+
+    ``weights[i]`` is the frequency in ``[0, 1]`` with which the range holds
+    combo ``i`` of ``COMBOS``.
+    """
+
+    def __init__(self, weights: Optional[np.ndarray] = None):
+        if weights is None:
+            weights = np.zeros(NUM_COMBOS)
+        self.weights = np.asarray(weights, dtype=np.float64)
+
+    @classmethod
+    def parse(cls, text: str) -> "Range":
+        """
+        Parse standard range notation such as ``"QQ+, AKs, T9s, A5s-A2s"``.
+
+        Tokens are separated by commas or spaces and can be pairs (``77``),
+        suited or offsuit hands (``AKs``, ``AKo``), both (``AK``), ranges
+        ending in ``+`` or given as ``high-low``, or exact combos (``AsKs``).
+        A token can carry a weight as ``AKo:0.5``.
+
+        Raises:
+            ValueError: If a token can't be parsed
+        """
+        weights = np.zeros(NUM_COMBOS)
+        for token in re.split(r"[,\s]+", text.strip()):
+            if not token:
+                continue
+            token, _, weight = token.partition(":")
+            weights[_expand(token)] = float(weight) if weight else 1.0
+        return cls(weights)
+
+    @classmethod
+    def full(cls) -> "Range":
+        """Return a range holding every combo."""
+        return cls(np.ones(NUM_COMBOS))
+
+    def without(self, dead_cards: Sequence[int]) -> "Range":
+        """Return a copy with the combos holding any of ``dead_cards`` removed."""
+        weights = self.weights.copy()
+        weights[(COMBO_MASKS & cards_mask(dead_cards)) != 0] = 0
+        return Range(weights)
+
+    def combos(self) -> np.ndarray:
+        """Return the indexes of the combos with a non-zero weight."""
+        return np.flatnonzero(self.weights)
+
+    @property
+    def num_combos(self) -> float:
+        """The weighted number of combos in the range."""
+        return float(self.weights.sum())
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.weights))
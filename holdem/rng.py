@@ -0,0 +1,132 @@
+"""
+Deterministic random streams for parallel simulation.
+
+Every stream is derived from one run seed with NumPy's ``SeedSequence``, so
+streams are independent of each other and of the order and the process in
+which they are used:
+
+* ``table_rng(seed, table)`` drives a table's choices before its first
+  hand, such as where the button starts
+* ``hand_rng(hand_id)`` drives the choices made during one hand, such as
+  those of random agents
+* ``worker_rng(seed, worker)`` is for work that belongs to a worker process
+* ``HandStream(seed, table)`` shuffles a table's decks, one hand after the
+  other, from permutations generated in bulk, and moves its ``rng`` on to
+  each hand's own stream
+
+A hand is identified by ``HandId(seed, table, hand)``. Its deck order and
+the random choices made in it can be regenerated from the id alone with
+``deck_order`` and ``hand_rng``, without playing the hands before it.
+"""
+
+import random
+from typing import List, MutableSequence, NamedTuple, Optional
+
+import numpy as np
+
+NUM_CARDS = 52
+HANDS_PER_BLOCK = 1024
+
+# Leading spawn key entries that keep the kinds of streams apart
+_WORKER = 0
+_TABLE = 1
+_DECKS = 2
+
+
+def _python_seed(sequence: np.random.SeedSequence) -> int:
+    state = sequence.generate_state(4, dtype=np.uint64)
+    return int.from_bytes(state.tobytes(), "little")
+
+
+def _python_rng(sequence: np.random.SeedSequence) -> random.Random:
+    return random.Random(_python_seed(sequence))
+
+
+def worker_rng(seed: int, worker: int) -> random.Random:
+    """Return the random stream of a worker process."""
+    return _python_rng(np.random.SeedSequence(seed, spawn_key=(_WORKER, worker)))
+
+
+def table_rng(seed: int, table: int) -> random.Random:
+    """Return the random stream of a table's own decisions."""
+    return _python_rng(np.random.SeedSequence(seed, spawn_key=(_TABLE, table)))
+
+
+class HandId(NamedTuple):
+    seed: int
+    table: int
+    hand: int
+
+
+def _hand_sequence(hand_id: HandId) -> np.random.SeedSequence:
+    return np.random.SeedSequence(
+        hand_id.seed, spawn_key=(_TABLE, hand_id.table, hand_id.hand)
+    )
+
+
+def hand_rng(hand_id: HandId) -> random.Random:
+    """Return the random stream of the choices made during one hand."""
+    return _python_rng(_hand_sequence(hand_id))
+
+
+def permutations(seed: int, table: int, block: int) -> np.ndarray:
+    """
+    Generate the deck orders of a block of hands at one table at once.
+
+    Returns:
+        np.ndarray: Array of shape ``(HANDS_PER_BLOCK, 52)``; row ``i`` is
+        the deck order of hand ``block * HANDS_PER_BLOCK + i`` as int cards,
+        the last card being dealt first
+    """
+    sequence = np.random.SeedSequence(seed, spawn_key=(_DECKS, table, block))
+    generator = np.random.Generator(np.random.PCG64(sequence))
+    decks = np.broadcast_to(np.arange(NUM_CARDS), (HANDS_PER_BLOCK, NUM_CARDS))
+    return generator.permuted(decks, axis=1)
+
+
+def deck_order(hand_id: HandId) -> np.ndarray:
+    """Regenerate the deck order of one hand from its id."""
+    block, row = divmod(hand_id.hand, HANDS_PER_BLOCK)
+    return permutations(hand_id.seed, hand_id.table, block)[row]
+
+
+class HandStream:
+    """
+    Shuffles the decks of one table in hand order.
+
+    It can be given to a ``Deck`` as its ``rng``: every ``shuffle`` puts a
+    freshly reset deck in the order of the next hand, generating the orders
+    a block of hands at a time. Give ``rng`` to the table as well: it is the
+    table's stream until the first shuffle and then, reseeded by every
+    shuffle, the stream of the hand being played (see ``hand_rng``).
+
+    Args:
+        seed: The run seed
+        table: The table's id
+        first_hand: Number of the next hand to shuffle for
+    """
+
+    def __init__(self, seed: int, table: int, first_hand: int = 0):
+        self.seed = seed
+        self.table = table
+        self.next_hand = first_hand
+        self._block = -1
+        self._orders: Optional[List[List[int]]] = None
+        self.rng = table_rng(seed, table)
+
+    @property
+    def hand_id(self) -> HandId:
+        """Id of the hand last shuffled for."""
+        return HandId(self.seed, self.table, self.next_hand - 1)
+
+    def shuffle(self, cards: MutableSequence):
+        """Reorder a deck in standard order into the next hand's order."""
+        block, row = divmod(self.next_hand, HANDS_PER_BLOCK)
+        if block != self._block:
+            self._orders = permutations(self.seed, self.table, block).tolist()
+            self._block = block
+        order = self._orders[row]
+        cards[:] = [cards[index] for index in order]
+        hand_id = HandId(self.seed, self.table, self.next_hand)
+        self.rng.seed(_python_seed(_hand_sequence(hand_id)))
+        self.next_hand += 1
@@ -0,0 +1,127 @@
+"""
+Read-only NumPy arrays shared between processes.
+
+``SharedArrays`` writes named arrays into one file, with a small header
+describing them, and maps it into memory. Any process can map the same file
+by its path alone and gets views of the same pages instead of copies, so
+tables built or loaded once by a parent process are read in place by every
+worker of a pool, whatever the number of workers. Files go to the shared
+memory filesystem ``/dev/shm`` when there is one, so nothing touches disk.
+"""
+
+import json
+import mmap
+import os
+import tempfile
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+# The header is its length as 8 bytes then the JSON layout of the arrays
+_LENGTH_BYTES = 8
+_ALIGNMENT = 64
+_SHARED_MEMORY_DIR = "/dev/shm"
+
+Layout = Dict[str, Tuple[str, Tuple[int, ...], int]]
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+class SharedArrays:
+    """
+    Named arrays in a shared memory-mapped file.
+
+    Create the file with ``create`` in the process that owns the arrays and
+    map it with ``attach`` elsewhere; arrays are looked up by name and are
+    read-only views of the mapping, which lives as long as any of them.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            memory = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        length = int.from_bytes(memory[:_LENGTH_BYTES], "little")
+        layout: Layout = json.loads(memory[_LENGTH_BYTES : _LENGTH_BYTES + length])
+        start = _align(_LENGTH_BYTES + length)
+        self._arrays: Dict[str, np.ndarray] = {}
+        for key, (dtype, shape, offset) in layout.items():
+            count = int(np.prod(shape, dtype=np.int64))
+            if not count:
+                # Nothing to map, and the offset may be past the file's end
+                self._arrays[key] = np.empty(shape, dtype=np.dtype(dtype))
+                continue
+            array = np.frombuffer(
+                memory, dtype=np.dtype(dtype), count=count, offset=start + offset
+            )
+            self._arrays[key] = array.reshape(shape)
+
+    @classmethod
+    def create(
+        cls, arrays: Dict[str, np.ndarray], path: Optional[str] = None
+    ) -> "SharedArrays":
+        """
+        Write arrays to a new shared file and map it.
+
+        Args:
+            arrays: The arrays by name
+            path: Where to write the file, a new file in ``/dev/shm`` (or
+                the temporary directory without it) by default
+
+        Returns:
+            SharedArrays: The arrays, mapped from the new file
+        """
+        if path is None:
+            directory = (
+                _SHARED_MEMORY_DIR if os.path.isdir(_SHARED_MEMORY_DIR) else None
+            )
+            descriptor, path = tempfile.mkstemp(
+                prefix="holdem-", suffix=".tables", dir=directory
+            )
+            os.close(descriptor)
+
+        layout: Layout = {}
+        size = 0
+        for key, array in arrays.items():
+            layout[key] = (array.dtype.str, array.shape, size)
+            size = _align(size + array.nbytes)
+        header = json.dumps(layout).encode()
+        start = _align(_LENGTH_BYTES + len(header))
+
+        with open(path, "wb") as file:
+            file.write(len(header).to_bytes(_LENGTH_BYTES, "little"))
+            file.write(header)
+            for key, array in arrays.items():
+                file.seek(start + layout[key][2])
+                file.write(np.ascontiguousarray(array).tobytes())
+        return cls(path)
+
+    @classmethod
+    def attach(cls, path: str) -> "SharedArrays":
+        """
+        Map a file created by another process.
+
+        Raises:
+            FileNotFoundError: If there is no file at ``path``
+        """
+        return cls(path)
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self._arrays[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._arrays
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._arrays)
+
+    def __len__(self) -> int:
+        return len(self._arrays)
+
+    def unlink(self):
+        """
+        Delete the file. Processes that have mapped it keep their arrays;
+        its memory is freed once they all let go of them.
+        """
+        os.remove(self.path)
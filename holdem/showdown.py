@@ -0,0 +1,120 @@
+"""Side pot construction and showdown settlement."""
+
+from typing import Dict, List, NamedTuple, Sequence
+
+from . import lookup
+from .models import Table
+
+
+class Pot(NamedTuple):
+    amount: int
+    seats: List[int]
+
+
+def build_pots(contributions: Sequence[int], live: Sequence[bool]) -> List[Pot]:
+    """
+    Split the chips each seat put in during a hand into a main pot and side
+    pots with a single sort of the contribution levels.
+
+    Every distinct contribution level closes a slice of the pot that holds
+    the chips each seat put in between the previous level and this one. A
+    slice can be won by the live seats that reached the level, and slices
+    with the same contenders are merged.
+
+    Args:
+        contributions: Chips put in by each seat during the hand
+        live: Whether each seat is still in the hand
+
+    Returns:
+        List[Pot]: The main pot followed by the side pots in order
+    """
+    num_seats = len(contributions)
+    order = sorted(range(num_seats), key=contributions.__getitem__)
+    contenders = [seat for seat in order if live[seat]]
+
+    pots: List[Pot] = []
+    previous = 0
+    first_contender = 0
+    for i, seat in enumerate(order):
+        level = contributions[seat]
+        if level == previous:
+            continue
+        amount = (level - previous) * (num_seats - i)
+        previous = level
+        while (
+            first_contender < len(contenders)
+            and contributions[contenders[first_contender]] < level
+        ):
+            first_contender += 1
+        seats = contenders[first_contender:]
+        # Dead money above every live seat goes to the last contested pot
+        if pots and (not seats or seats == pots[-1].seats):
+            pots[-1] = Pot(pots[-1].amount + amount, pots[-1].seats)
+        else:
+            pots.append(Pot(amount, seats))
+    return pots
+
+
+def award_pots(
+    pots: Sequence[Pot], scores: Dict[int, int], dealer: int, num_seats: int
+) -> Dict[int, int]:
+    """
+    Give every pot to its best eligible hands.
+
+    Split pots are shared evenly and odd chips go to the winners closest to
+    the left of the dealer.
+
+    Args:
+        pots: Pots from ``build_pots``
+        scores: Score of every live seat
+        dealer: Seat of the button
+        num_seats: Number of seats at the table
+
+    Returns:
+        Dict[int, int]: Chips won by each winning seat
+    """
+    awards: Dict[int, int] = {}
+    for pot in pots:
+        best = max(scores[seat] for seat in pot.seats)
+        winners = sorted(
+            (seat for seat in pot.seats if scores[seat] == best),
+            key=lambda seat: (seat - dealer - 1) % num_seats,
+        )
+        share, odd_chips = divmod(pot.amount, len(winners))
+        for i, seat in enumerate(winners):
+            awards[seat] = awards.get(seat, 0) + share + (i < odd_chips)
+    return awards
+
+
+def settle(table: Table) -> Dict[int, int]:
+    """
+    Award the pot to the winners of the hand.
+
+    Each live hand is scored once, then the pots are given out with
+    ``award_pots``.
+
+    Args:
+        table: A table whose hand has finished
+
+    Returns:
+        Dict[int, int]: Chips won by each winning seat
+    """
+    players = table.players
+    num_seats = len(players)
+    live = [not player.is_folded for player in players]
+    pots = build_pots([player.contributed for player in players], live)
+
+    live_seats = [seat for seat in range(num_seats) if live[seat]]
+    if len(live_seats) == 1:
+        # Everyone else folded: no showdown, nothing to evaluate
+        scores = {live_seats[0]: 0}
+    else:
+        board = [card.to_int() for card in table.community_cards]
+        hands = [[card.to_int() for card in players[seat].hand] for seat in live_seats]
+        scores = dict(zip(live_seats, lookup.evaluate_on_board(hands, board)))
+
+    awards = award_pots(pots, scores, table.dealer_index, num_seats)
+    for seat, amount in awards.items():
+        players[seat].chips += amount
+    table.pot = 0
+    return awards
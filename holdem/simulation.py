@@ -0,0 +1,220 @@
+"""
+Batch simulation of ring-game hands for load testing and agent comparison.
+
+Hands are played in chunks of ``HANDS_PER_BLOCK``, each at its own table
+whose cards and random choices come from the streams of ``holdem.rng`` for
+the run seed and the chunk number, so a run plays the same hands whatever
+the number of worker processes. Stacks are reset before every hand, which
+keeps hands independent and makes each agent's winnings per hand a sample
+for its win rate.
+"""
+
+import importlib
+import math
+import multiprocessing
+import os
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+from loguru import logger
+
+from . import lookup
+from .duplicate import AgentResult
+from .engine import HoldemEngine
+from .models import Deck, Player, Table
+from .rng import HANDS_PER_BLOCK, HandStream
+
+# Per agent: hands played, big blinds won and the sum of the squares of the
+# big blinds won in each hand over all the agent's seats
+_Totals = Dict[str, List[float]]
+
+
+class SimulationResult(NamedTuple):
+    """
+    Outcome of a simulation run.
+
+    Args:
+        hands: Number of hands played
+        evaluations: Number of hands evaluated at showdowns
+        seconds: Wall-clock time of the run
+        agents: Win rate of each agent, in the order given
+    """
+
+    hands: int
+    evaluations: int
+    seconds: float
+    agents: List[AgentResult]
+
+    @property
+    def hands_per_second(self) -> float:
+        return self.hands / self.seconds if self.seconds else math.inf
+
+    @property
+    def evaluations_per_second(self) -> float:
+        return self.evaluations / self.seconds if self.seconds else math.inf
+
+
+def load_agent(path: str) -> Type[Player]:
+    """
+    Import an agent class by its path.
+
+    Args:
+        path: ``package.module:Class`` or ``package.module.Class``
+
+    Raises:
+        ValueError: If the path doesn't name a ``Player`` subclass
+    """
+    module_name, _, class_name = path.replace(":", ".").rpartition(".")
+    if not module_name:
+        raise ValueError(f"Agent path {path!r} has no module")
+    agent = getattr(importlib.import_module(module_name), class_name, None)
+    if not (isinstance(agent, type) and issubclass(agent, Player)):
+        raise ValueError(f"{path!r} is not a Player class")
+    return agent
+
+
+class _Chunk(NamedTuple):
+    seats: Tuple[str, ...]
+    seed: int
+    index: int
+    num_hands: int
+    starting_stack: int
+    small_blind: int
+    big_blind: int
+
+
+def _play(chunk: _Chunk) -> Tuple[_Totals, int]:
+    """Play one chunk of hands; returns per-agent totals and evaluations."""
+    players = [
+        load_agent(path)(name=f"Seat {seat + 1}", chips=chunk.starting_stack)
+        for seat, path in enumerate(chunk.seats)
+    ]
+    stream = HandStream(chunk.seed, chunk.index)
+    table = Table(
+        players=players,
+        small_blind=chunk.small_blind,
+        big_blind=chunk.big_blind,
+        deck=Deck(rng=stream),
+        rng=stream.rng,
+    )
+    engine = HoldemEngine(table=table)
+    # next_hand shuffles, so the chunk's first deck goes to its first hand
+    table.reset(shuffle=False)
+    totals: _Totals = {path: [0, 0.0, 0.0] for path in chunk.seats}
+    evaluations = 0
+    for _ in range(chunk.num_hands):
+        for player in players:
+            player.chips = chunk.starting_stack
+        table.next_hand()
+        engine.run_hand()
+        if table.num_live > 1:
+            evaluations += table.num_live
+        won: Dict[str, float] = dict.fromkeys(chunk.seats, 0.0)
+        for path, player in zip(chunk.seats, players):
+            won[path] += (player.chips - chunk.starting_stack) / chunk.big_blind
+        for path, hand_won in won.items():
+            counts = totals[path]
+            counts[0] += 1
+            counts[1] += hand_won
+            counts[2] += hand_won * hand_won
+    return totals, evaluations
+
+
+def _start_worker(tables_path: str):
+    # Workers log nothing, and without handlers loguru returns at once
+    logger.remove()
+    lookup.attach_tables(tables_path)
+
+
+def simulate(
+    agents: Sequence[str],
+    num_hands: int,
+    num_players: Optional[int] = None,
+    seed: int = 0,
+    num_workers: Optional[int] = None,
+    starting_stack: int = 200,
+    small_blind: int = 1,
+    big_blind: int = 2,
+    confidence: float = 0.95,
+) -> SimulationResult:
+    """
+    Play hands between agents and measure their win rates and the throughput.
+
+    Worker processes log nothing. Hands played in the calling process are
+    logged as it has set up loguru; disable ``holdem`` to keep such a run
+    quiet and fast.
+
+    Args:
+        agents: Import paths of the agent classes, dealt to the seats in turn
+        num_hands: Number of hands to play
+        num_players: Number of seats, the number of agents by default
+        seed: The run seed
+        num_workers: Number of worker processes, the number of CPUs by
+            default; 0 plays in the calling process
+        starting_stack: Chips of every seat at the start of each hand
+        small_blind: Small blind
+        big_blind: Big blind
+        confidence: Level of the agents' confidence intervals
+
+    Returns:
+        SimulationResult: Hands played, evaluations, time and win rates
+    """
+    for path in agents:
+        load_agent(path)
+    num_players = num_players or len(agents)
+    if num_players < 2:
+        raise ValueError("A simulation needs at least two players")
+    seats = tuple(agents[seat % len(agents)] for seat in range(num_players))
+    chunks = [
+        _Chunk(
+            seats,
+            seed,
+            index,
+            min(HANDS_PER_BLOCK, num_hands - start),
+            starting_stack,
+            small_blind,
+            big_blind,
+        )
+        for index, start in enumerate(range(0, num_hands, HANDS_PER_BLOCK))
+    ]
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    num_workers = min(num_workers, len(chunks))
+
+    start = time.perf_counter()
+    if num_workers == 0:
+        results = [_play(chunk) for chunk in chunks]
+    else:
+        context = multiprocessing.get_context()
+        # The evaluator tables are published once and mapped by every worker
+        with lookup.published_tables() as tables, context.Pool(
+            num_workers, initializer=_start_worker, initargs=(tables.path,)
+        ) as pool:
+            results = pool.map(_play, chunks, chunksize=1)
+    seconds = time.perf_counter() - start
+
+    totals: _Totals = {path: [0, 0.0, 0.0] for path in agents}
+    evaluations = 0
+    for chunk_totals, chunk_evaluations in results:
+        evaluations += chunk_evaluations
+        for path, counts in chunk_totals.items():
+            totals[path] = [a + b for a, b in zip(totals[path], counts)]
+
+    agent_results = []
+    for path, (hands, won, squares) in totals.items():
+        # Seats of one agent win and lose against each other within a hand,
+        # so hands, not seats, are the independent samples
+        num_seats = seats.count(path) or 1
+        mean = won / hands if hands else 0.0
+        variance = (squares - hands * mean * mean) / (hands - 1) if hands > 1 else 0.0
+        std_error = math.sqrt(max(variance, 0) / hands) / num_seats if hands else 0.0
+        agent_results.append(
+            AgentResult(
+                path,
+                int(hands) * num_seats,
+                100 * mean / num_seats,
+                100 * std_error,
+                confidence,
+            )
+        )
+    return SimulationResult(num_hands, evaluations, seconds, agent_results)
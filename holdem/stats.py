@@ -0,0 +1,200 @@
+"""
+Running player statistics.
+
+``StatsAggregator`` folds hands into a handful of counters per player as
+they are played or read back from an archive, so its memory does not grow
+with the number of hands. Players are identified by name, which makes the
+aggregates of separate runs or worker processes combinable with ``merge``.
+
+The statistics are the usual ones of hand-history trackers:
+
+* VPIP: share of hands in which the player put chips in voluntarily before
+  the flop, blinds not counted
+* PFR: share of hands in which the player bet or raised before the flop
+* Aggression factor: bets and raises per call after the flop
+* WTSD: share of the flops seen that the player took to showdown
+* Win rate: big blinds won per 100 hands
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Set, Tuple
+
+from .models import ActionType, Street, Table
+from .replay import HandRecord
+
+_AGGRESSIVE = (ActionType.BET.value, ActionType.RAISE.value)
+_PREFLOP = Street.PREFLOP.value
+
+# Positions of the counters kept for each player
+_HANDS = 0
+_VPIP = 1
+_PFR = 2
+_AGGRESSIVE_ACTIONS = 3
+_CALLS = 4
+_FLOPS = 5
+_SHOWDOWNS = 6
+_BIG_BLINDS_WON = 7
+_NUM_COUNTERS = 8
+
+
+class PlayerStats(NamedTuple):
+    """
+    A player's statistics over the hands aggregated.
+
+    Args:
+        name: The player's name
+        hands: Number of hands dealt in
+        vpip: Share of hands with chips put in voluntarily preflop
+        pfr: Share of hands with a preflop bet or raise
+        aggression: Postflop bets and raises per call, infinite when the
+            player never called and zero when they never acted
+        wtsd: Share of flops seen that went to showdown
+        bb_per_100: Big blinds won per 100 hands
+    """
+
+    name: str
+    hands: int
+    vpip: float
+    pfr: float
+    aggression: float
+    wtsd: float
+    bb_per_100: float
+
+
+def _ratio(count: float, total: float) -> float:
+    return count / total if total else 0.0
+
+
+class StatsAggregator:
+    """Accumulates player statistics hand by hand."""
+
+    def __init__(self):
+        self._counters: Dict[str, List[float]] = {}
+
+    def add_hand(
+        self,
+        names: Sequence[str],
+        dealt: Sequence[bool],
+        actions: Iterable[Tuple[int, str, str]],
+        board_size: int,
+        winnings: Sequence[float],
+        big_blind: float,
+    ):
+        """
+        Add one hand.
+
+        Args:
+            names: Name of the player in each seat
+            dealt: Whether each seat was dealt in
+            actions: ``(seat, street, action type)`` of every action after
+                the blinds, with streets and action types by value
+            board_size: Number of board cards dealt
+            winnings: Chips won (or lost, when negative) by each seat
+            big_blind: The big blind
+        """
+        voluntary: Set[int] = set()
+        raised: Set[int] = set()
+        folded_preflop: Set[int] = set()
+        folded: Set[int] = set()
+        aggressive = [0] * len(names)
+        calls = [0] * len(names)
+        for seat, street, kind in actions:
+            if kind == ActionType.FOLD.value:
+                folded.add(seat)
+                if street == _PREFLOP:
+                    folded_preflop.add(seat)
+            elif street == _PREFLOP:
+                if kind != ActionType.CHECK.value:
+                    voluntary.add(seat)
+                if kind in _AGGRESSIVE:
+                    raised.add(seat)
+            elif kind in _AGGRESSIVE:
+                aggressive[seat] += 1
+            elif kind == ActionType.CALL.value:
+                calls[seat] += 1
+
+        seats = [seat for seat in range(len(names)) if dealt[seat]]
+        showdown = len([seat for seat in seats if seat not in folded]) > 1
+        for seat in seats:
+            counters = self._counters.get(names[seat])
+            if counters is None:
+                counters = self._counters[names[seat]] = [0] * _NUM_COUNTERS
+            counters[_HANDS] += 1
+            counters[_VPIP] += seat in voluntary
+            counters[_PFR] += seat in raised
+            counters[_AGGRESSIVE_ACTIONS] += aggressive[seat]
+            counters[_CALLS] += calls[seat]
+            if board_size >= 3 and seat not in folded_preflop:
+                counters[_FLOPS] += 1
+                counters[_SHOWDOWNS] += showdown and seat not in folded
+            counters[_BIG_BLINDS_WON] += winnings[seat] / big_blind
+
+    def add_table(self, table: Table, stacks: Sequence[int]):
+        """
+        Add the hand just settled at a table, from its action history.
+
+        Args:
+            table: A table whose hand has been settled
+            stacks: Chips of each seat before the hand was dealt
+        """
+        players = table.players
+        seats = {id(player): seat for seat, player in enumerate(players)}
+        self.add_hand(
+            [player.name for player in players],
+            [bool(player.hand) for player in players],
+            # The first two actions are the blinds
+            (
+                (seats[id(action.player)], action.street.value, action.type.value)
+                for action in table.action_history[2:]
+            ),
+            len(table.community_cards),
+            [player.chips - stack for player, stack in zip(players, stacks)],
+            table.big_blind,
+        )
+
+    def add_record(self, record: HandRecord, names: Sequence[str]):
+        """
+        Add a recorded hand.
+
+        Args:
+            record: The hand
+            names: Name of the player in each seat
+        """
+        self.add_hand(
+            names,
+            [bool(cards) for cards in record.hole_cards],
+            ((seat, street, kind) for seat, street, kind, _ in record.actions),
+            len(record.board),
+            [end - start for start, end in zip(record.stacks, record.results)],
+            record.big_blind,
+        )
+
+    def merge(self, other: "StatsAggregator") -> "StatsAggregator":
+        """Add the hands of another aggregator to this one and return it."""
+        for name, counters in other._counters.items():
+            mine = self._counters.get(name)
+            if mine is None:
+                self._counters[name] = list(counters)
+            else:
+                self._counters[name] = [a + b for a, b in zip(mine, counters)]
+        return self
+
+    def stats(self) -> Dict[str, PlayerStats]:
+        """Return the statistics of every player seen, by name."""
+        result = {}
+        for name, counters in self._counters.items():
+            hands = counters[_HANDS]
+            aggressive, calls = counters[_AGGRESSIVE_ACTIONS], counters[_CALLS]
+            if calls:
+                aggression = aggressive / calls
+            else:
+                aggression = float("inf") if aggressive else 0.0
+            result[name] = PlayerStats(
+                name,
+                int(hands),
+                _ratio(counters[_VPIP], hands),
+                _ratio(counters[_PFR], hands),
+                aggression,
+                _ratio(counters[_SHOWDOWNS], counters[_FLOPS]),
+                100 * _ratio(counters[_BIG_BLINDS_WON], hands),
+            )
+        return result
@@ -0,0 +1,103 @@
+"""
+Hand strength percentiles on a complete board.
+
+A ``BoardIndex`` scores every holding that a five-card board leaves
+possible once and keeps the scores sorted, so asking what share of
+holdings a hand beats is a few binary searches. Indexes are cached per
+board with LRU eviction by ``board_index``; each holds about 14 KB of
+int32 scores.
+"""
+
+import functools
+from bisect import bisect_left, bisect_right
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from .lookup import NUM_CARDS, evaluate, evaluate_batch
+from .ranges import COMBO_MASKS, COMBOS, cards_mask
+
+BOARD_CACHE_SIZE = 1024
+
+
+class BoardIndex:
+    """Sorted scores of every holding on one five-card board."""
+
+    def __init__(self, board: Sequence[int]):
+        if len(board) != 5:
+            raise ValueError("A board index needs a complete five-card board")
+        self.board = tuple(board)
+        alive = (COMBO_MASKS & cards_mask(board)) == 0
+        combos = COMBOS[alive]
+        cards = np.concatenate(
+            [combos, np.broadcast_to(np.asarray(board), (len(combos), 5))], axis=1
+        )
+        scores = evaluate_batch(cards)
+
+        self.num_holdings = len(combos)
+        self.scores = np.sort(scores).astype(np.int32)
+
+        # Sorted scores of the holdings that hold each card, to take out the
+        # holdings blocked by the hand being ranked; rows of board cards are
+        # never read
+        self.card_scores = np.zeros((NUM_CARDS, NUM_CARDS - 6), dtype=np.int32)
+        for card in set(range(NUM_CARDS)) - set(board):
+            holds = (combos[:, 0] == card) | (combos[:, 1] == card)
+            self.card_scores[card] = np.sort(scores[holds])
+
+        # bisect reads memoryviews of the arrays as fast as lists of ints
+        self._scores = memoryview(self.scores)
+        self._card_scores = memoryview(self.card_scores.reshape(-1))
+
+    def count(self, hole_cards: Sequence[int]) -> Tuple[int, int, int]:
+        """
+        Count the opposing holdings a hand beats and ties.
+
+        Holdings that share a card with ``hole_cards`` are left out.
+
+        Args:
+            hole_cards: Two int cards that are not on the board
+
+        Returns:
+            Tuple[int, int, int]: Holdings beaten, tied and in total
+        """
+        first, second = hole_cards
+        score = evaluate(list(hole_cards) + list(self.board))
+        size = self.card_scores.shape[1]
+        first_scores = self._card_scores[first * size : (first + 1) * size]
+        second_scores = self._card_scores[second * size : (second + 1) * size]
+
+        beaten = (
+            bisect_left(self._scores, score)
+            - bisect_left(first_scores, score)
+            - bisect_left(second_scores, score)
+        )
+        # The hand itself holds both of its cards and ties its own score
+        at_or_below = (
+            bisect_right(self._scores, score)
+            - bisect_right(first_scores, score)
+            - bisect_right(second_scores, score)
+            + 1
+        )
+        total = self.num_holdings - 2 * size + 1
+        return beaten, at_or_below - beaten, total
+
+    def percentile(self, hole_cards: Sequence[int]) -> float:
+        """Return the share of opposing holdings beaten, counting ties as half."""
+        beaten, tied, total = self.count(hole_cards)
+        return (beaten + tied / 2) / total
+
+
+@functools.lru_cache(maxsize=BOARD_CACHE_SIZE)
+def _cached_index(board: Tuple[int, ...]) -> BoardIndex:
+    return BoardIndex(board)
+
+
+def board_index(board: Sequence[int]) -> BoardIndex:
+    """Return the cached index of a board, building it on first use."""
+    return _cached_index(tuple(sorted(board)))
+
+
+def hand_percentile(hole_cards: Sequence[int], board: Sequence[int]) -> float:
+    """Return the share of holdings that a hand beats on a complete board."""
+    return board_index(board).percentile(hole_cards)
@@ -0,0 +1,346 @@
+"""
+Multi-table tournaments.
+
+Tables are spread over worker processes that each own a set of tables and
+play them independently between balancing points. At a balancing point the
+parent breaks tables that are no longer needed and evens out table sizes,
+moving only the players that change tables between workers.
+"""
+
+import math
+import multiprocessing
+import os
+import random
+import traceback
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+from pydantic import BaseModel
+
+from . import lookup
+from .engine import HoldemEngine
+from .models import Deck, Player, Table
+from .rng import HandStream
+
+# Stacks reported by a worker for each of its tables: table id -> (name, chips)
+Stacks = Dict[int, List[Tuple[str, int]]]
+
+# A bust reported by a worker: (hand number, chips at the start of the hand,
+# table id, seat, name)
+Bust = Tuple[int, int, int, int, str]
+
+
+class BlindLevel(BaseModel):
+    small_blind: int
+    big_blind: int
+    hands: int
+
+
+class _TableWorker:
+    """Plays the tables assigned to one worker."""
+
+    def __init__(self):
+        self.engines: Dict[int, HoldemEngine] = {}
+
+    def seat(self, table_id: int, players: List[Player], seed: Optional[int] = None):
+        engine = self.engines.get(table_id)
+        if engine is None:
+            if seed is None:
+                table = Table(players=players)
+            else:
+                stream = HandStream(seed, table_id)
+                table = Table(players=players, deck=Deck(rng=stream), rng=stream.rng)
+            table.dealer_index = (table.rng or random).randrange(len(players))
+            self.engines[table_id] = HoldemEngine(table=table)
+        else:
+            engine.table.players.extend(players)
+
+    def remove(self, table_id: int, names: List[str]) -> List[Player]:
+        table = self.engines[table_id].table
+        removed = []
+        for name in names:
+            seat = next(i for i, p in enumerate(table.players) if p.name == name)
+            removed.append(self._unseat(table, seat))
+        return removed
+
+    def close(self, table_id: int) -> List[Player]:
+        return self.engines.pop(table_id).table.players
+
+    def play(
+        self, num_hands: int, small_blind: int, big_blind: int
+    ) -> Tuple[Stacks, List[Bust]]:
+        stacks: Stacks = {}
+        busts: List[Bust] = []
+        for table_id, engine in self.engines.items():
+            table = engine.table
+            table.small_blind = small_blind
+            table.big_blind = big_blind
+            for hand in range(num_hands):
+                if len(table.players) < 2:
+                    break
+                starting_chips = [player.chips for player in table.players]
+                table.next_hand()
+                engine.run_hand()
+                for seat in range(len(table.players) - 1, -1, -1):
+                    if table.players[seat].chips == 0:
+                        busts.append(
+                            (
+                                hand,
+                                starting_chips[seat],
+                                table_id,
+                                seat,
+                                table.players[seat].name,
+                            )
+                        )
+                        self._unseat(table, seat)
+            stacks[table_id] = [(player.name, player.chips) for player in table.players]
+        return stacks, busts
+
+    @staticmethod
+    def _unseat(table: Table, seat: int) -> Player:
+        if seat < table.dealer_index:
+            table.dealer_index -= 1
+        player = table.players.pop(seat)
+        table.dealer_index %= max(len(table.players), 1)
+        return player
+
+
+class _LocalWorker:
+    """Runs a table worker in the calling process."""
+
+    def __init__(self):
+        self._worker = _TableWorker()
+        self._result: Any = None
+
+    def send(self, method: str, *args):
+        self._result = getattr(self._worker, method)(*args)
+
+    def receive(self) -> Any:
+        return self._result
+
+    def stop(self):
+        pass
+
+
+class WorkerError(Exception):
+    """A worker process failed; the message is its traceback."""
+
+
+def _serve(connection, tables_path: str):
+    """
+    Worker process loop: run table worker methods until told to stop.
+
+    The worker maps the evaluator tables published at ``tables_path``. Every
+    reply is ``(error, result)``: an exception raised by the method is sent
+    back with its traceback instead of killing the worker.
+    """
+    logger.disable("holdem")
+    lookup.attach_tables(tables_path)
+    worker = _TableWorker()
+    while True:
+        method, args = connection.recv()
+        if method is None:
+            break
+        try:
+            reply: Tuple[Any, Any] = (None, getattr(worker, method)(*args))
+        except Exception as error:
+            reply = (error, traceback.format_exc())
+        try:
+            connection.send(reply)
+        except Exception:
+            # The exception itself could not be pickled
+            connection.send((WorkerError(reply[1]), reply[1]))
+    connection.close()
+
+
+class _ProcessWorker:
+    """Runs a table worker in a separate process."""
+
+    def __init__(self, context, tables_path: str):
+        self._connection, child = context.Pipe()
+        self._process = context.Process(
+            target=_serve, args=(child, tables_path), daemon=True
+        )
+        self._process.start()
+        # Only the worker uses its end; closing ours lets a dead worker show
+        # up as EOFError instead of a hang
+        child.close()
+
+    def send(self, method: str, *args):
+        try:
+            self._connection.send((method, args))
+        except OSError:
+            raise self._exited() from None
+
+    def receive(self) -> Any:
+        """
+        Return the result of the last method sent.
+
+        Raises:
+            Exception: The exception raised by the method in the worker,
+                chained to a ``WorkerError`` holding the worker's traceback
+            WorkerError: If the worker process has exited
+        """
+        try:
+            error, result = self._connection.recv()
+        except EOFError:
+            raise self._exited() from None
+        if error is not None:
+            raise error from WorkerError(result)
+        return result
+
+    def _exited(self) -> WorkerError:
+        self._process.join(timeout=1)
+        return WorkerError(f"Worker process exited with code {self._process.exitcode}")
+
+    def stop(self):
+        """Stop the worker, terminating it if it doesn't stop by itself."""
+        try:
+            self._connection.send((None, ()))
+        except OSError:
+            # Already gone
+            pass
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self._connection.close()
+
+
+class Tournament(BaseModel):
+    """
+    A freezeout tournament played over as many tables as the field needs.
+
+    Every table plays ``hands_per_round`` hands between balancing points, and
+    the blinds follow ``levels``, each level lasting ``hands`` hands. The last
+    level is kept until the tournament ends.
+
+    With a ``seed`` the seating and every table's cards and random choices
+    come from streams derived from it, so the tournament plays out the same
+    whatever the number of workers.
+    """
+
+    players: List[Player]
+    levels: List[BlindLevel]
+    table_size: int = 9
+    hands_per_round: int = 10
+    num_workers: Optional[int] = None
+    seed: Optional[int] = None
+
+    def run(self) -> List[str]:
+        """
+        Play the tournament to completion.
+
+        Returns:
+            List[str]: Player names in finishing order, winner first
+        """
+        num_workers = self.num_workers
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+        num_tables = math.ceil(len(self.players) / self.table_size)
+        num_workers = min(num_workers, num_tables)
+
+        if num_workers == 0:
+            return self._run_workers([_LocalWorker()], num_tables)
+        context = multiprocessing.get_context()
+        # The evaluator tables are published once and mapped by every worker
+        with lookup.published_tables() as tables:
+            workers = [_ProcessWorker(context, tables.path) for _ in range(num_workers)]
+            return self._run_workers(workers, num_tables)
+
+    def _run_workers(self, workers: List[Any], num_tables: int) -> List[str]:
+        try:
+            return self._run(workers, num_tables)
+        finally:
+            for worker in workers:
+                worker.stop()
+
+    def _run(self, workers: List[Any], num_tables: int) -> List[str]:
+        players = list(self.players)
+        (random if self.seed is None else random.Random(self.seed)).shuffle(players)
+        tables: Dict[int, List[str]] = {}
+        owner: Dict[int, Any] = {}
+        for table_id in range(num_tables):
+            seated = players[table_id::num_tables]
+            tables[table_id] = [player.name for player in seated]
+            owner[table_id] = workers[table_id % len(workers)]
+            self._call(owner[table_id], "seat", table_id, seated, self.seed)
+
+        eliminated: List[str] = []
+        hands_played = 0
+        while sum(len(names) for names in tables.values()) > 1:
+            level = self._level(hands_played)
+            logger.info(
+                "Hand {}: blinds {}/{}, {} tables",
+                hands_played,
+                level.small_blind,
+                level.big_blind,
+                len(tables),
+            )
+            for worker in workers:
+                worker.send(
+                    "play", self.hands_per_round, level.small_blind, level.big_blind
+                )
+            busts: List[Bust] = []
+            for worker in workers:
+                stacks, worker_busts = worker.receive()
+                busts.extend(worker_busts)
+                for table_id, seats in stacks.items():
+                    tables[table_id] = [name for name, _ in seats]
+            # Earlier busts finish lower, and so do shorter stacks in one hand;
+            # table and seat settle the rest whatever the workers' order
+            for *_, name in sorted(busts, key=lambda bust: bust[:4]):
+                eliminated.append(name)
+            hands_played += self.hands_per_round
+            self._balance(tables, owner)
+
+        winners = [name for names in tables.values() for name in names]
+        return winners + eliminated[::-1]
+
+    def _level(self, hands_played: int) -> BlindLevel:
+        for level in self.levels:
+            if hands_played < level.hands:
+                return level
+            hands_played -= level.hands
+        return self.levels[-1]
+
+    def _balance(self, tables: Dict[int, List[str]], owner: Dict[int, Any]):
+        """Break surplus tables and move players until table sizes differ by one."""
+        origin = {
+            name: table_id for table_id, names in tables.items() for name in names
+        }
+        remaining = len(origin)
+        while len(tables) > max(math.ceil(remaining / self.table_size), 1):
+            broken = min(tables, key=lambda table_id: len(tables[table_id]))
+            for name in tables.pop(broken):
+                target = min(tables, key=lambda table_id: len(tables[table_id]))
+                tables[target].append(name)
+
+        while tables:
+            largest = max(tables, key=lambda table_id: len(tables[table_id]))
+            smallest = min(tables, key=lambda table_id: len(tables[table_id]))
+            if len(tables[largest]) - len(tables[smallest]) <= 1:
+                break
+            tables[smallest].append(tables[largest].pop())
+
+        closed: Dict[int, List[Player]] = {}
+        for table_id in [table_id for table_id in owner if table_id not in tables]:
+            closed[table_id] = self._call(owner.pop(table_id), "close", table_id)
+
+        # Only the players who change tables travel between workers
+        routes: Dict[Tuple[int, int], List[str]] = {}
+        for target, names in tables.items():
+            for name in names:
+                if origin[name] != target:
+                    routes.setdefault((origin[name], target), []).append(name)
+        for (source, target), names in routes.items():
+            if source in closed:
+                players = [p for p in closed[source] if p.name in names]
+            else:
+                players = self._call(owner[source], "remove", source, names)
+            self._call(owner[target], "seat", target, players)
+
+    @staticmethod
+    def _call(worker: Any, method: str, *args) -> Any:
+        worker.send(method, *args)
+        return worker.receive()
@@ -0,0 +1,314 @@
+"""
+Pot-Limit Omaha and short-deck hand evaluation on int cards.
+
+Omaha hands use exactly two of the four or five hole cards and three of the
+board cards. The pairs of hole cards and triples of board cards are listed
+once per hand size in index tables, so a showdown scores every pair against
+every triple (60 five-card hands for four hole cards on a river) with the
+rank and flush tables of ``holdem.lookup``, which rank five-card hands as
+they rank seven.
+
+Short-deck (6+) hold'em removes the deuces to fives. A-6-7-8-9 is a
+straight, a flush beats a full house and, as under the Triton rules, three
+of a kind beats a straight. Its scores come from a rank table and a flush
+table of their own, built from the best five of the cards on first use,
+with hand types packed in short-deck order: compare short-deck scores with
+each other only, and decode their hand type with ``short_deck_hand_type``.
+"""
+
+import itertools
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Sequence
+
+import numpy as np
+
+from .lookup import (
+    _POW5,
+    FLUSH,
+    FOUR_OF_A_KIND,
+    FULL_HOUSE,
+    HAND_TYPE_SHIFT,
+    HIGH_CARD,
+    NUM_RANKS,
+    PAIR,
+    ROYAL_FLUSH,
+    STRAIGHT,
+    STRAIGHT_FLUSH,
+    THREE_OF_A_KIND,
+    TWO_PAIR,
+    _pack,
+    _scalar_tables,
+    batch_keys,
+    score_keys,
+)
+
+# Positions of the two hole cards and three board cards of every Omaha hand
+HOLE_PAIRS: Dict[int, np.ndarray] = {
+    size: np.array(list(itertools.combinations(range(size), 2))) for size in (4, 5)
+}
+BOARD_TRIPLES: Dict[int, np.ndarray] = {
+    size: np.array(list(itertools.combinations(range(size), 3))) for size in (3, 4, 5)
+}
+_HOLE_PAIRS = {
+    size: [tuple(pair) for pair in pairs.tolist()] for size, pairs in HOLE_PAIRS.items()
+}
+_BOARD_TRIPLES = {
+    size: [tuple(triple) for triple in triples.tolist()]
+    for size, triples in BOARD_TRIPLES.items()
+}
+
+
+def _check_omaha(num_hole: int, num_board: int):
+    if num_hole not in HOLE_PAIRS:
+        raise ValueError("Omaha hands have four or five hole cards")
+    if num_board not in BOARD_TRIPLES:
+        raise ValueError("Omaha boards have three to five cards")
+
+
+def evaluate_omaha(hole_cards: Sequence[int], board: Sequence[int]) -> int:
+    """
+    Score an Omaha hand. Scores order hands like ``lookup.evaluate``.
+
+    Args:
+        hole_cards: Four or five int cards
+        board: Three to five int cards
+
+    Returns:
+        int: The score of the best hand of two hole cards and three board
+        cards
+
+    Raises:
+        ValueError: If there are too few or too many cards
+    """
+    _check_omaha(len(hole_cards), len(board))
+    # Rank key, suit (when suited) and rank bits of every pair and triple;
+    # the suit markers differ when unsuited so they never match
+    pairs = []
+    for first, second in _HOLE_PAIRS[len(hole_cards)]:
+        a, b = hole_cards[first], hole_cards[second]
+        suit = a & 3 if a & 3 == b & 3 else -1
+        pairs.append(
+            (_POW5[a >> 2] + _POW5[b >> 2], suit, 1 << (a >> 2) | 1 << (b >> 2))
+        )
+    triples = []
+    for first, second, third in _BOARD_TRIPLES[len(board)]:
+        a, b, c = board[first], board[second], board[third]
+        suit = a & 3 if a & 3 == b & 3 == c & 3 else -2
+        key = _POW5[a >> 2] + _POW5[b >> 2] + _POW5[c >> 2]
+        triples.append((key, suit, 1 << (a >> 2) | 1 << (b >> 2) | 1 << (c >> 2)))
+
+    rank_table, flush_table = _scalar_tables()
+    best = 0
+    for key, suit, bits in pairs:
+        for board_key, board_suit, board_bits in triples:
+            # Five cards of one suit are a flush, which beats their ranks
+            if suit == board_suit:
+                score = flush_table[bits | board_bits]
+            else:
+                score = rank_table[key + board_key]
+            if score > best:
+                best = score
+    return best
+
+
+def evaluate_omaha_batch(hole_cards: np.ndarray, board: np.ndarray) -> np.ndarray:
+    """
+    Score many Omaha hands at once.
+
+    Args:
+        hole_cards: Int cards of shape ``(..., 4)`` or ``(..., 5)``
+        board: Int cards of shape ``(..., k)`` with ``3 <= k <= 5``,
+            broadcasting against ``hole_cards``
+
+    Returns:
+        np.ndarray: The int32 scores, with the last axes removed
+    """
+    hole_cards = np.asarray(hole_cards)
+    board = np.asarray(board)
+    _check_omaha(hole_cards.shape[-1], board.shape[-1])
+    hole_keys, hole_masks = batch_keys(
+        hole_cards[..., HOLE_PAIRS[hole_cards.shape[-1]]]
+    )
+    board_keys, board_masks = batch_keys(board[..., BOARD_TRIPLES[board.shape[-1]]])
+    keys = hole_keys[..., :, None] + board_keys[..., None, :]
+    masks = hole_masks[..., :, None, :] | board_masks[..., None, :, :]
+    return score_keys(keys, masks).max(axis=(-2, -1))
+
+
+# Hand types from worst to best in short deck, and their place in that order
+_SHORT_DECK_TYPES = (
+    HIGH_CARD,
+    PAIR,
+    TWO_PAIR,
+    STRAIGHT,
+    THREE_OF_A_KIND,
+    FULL_HOUSE,
+    FLUSH,
+    FOUR_OF_A_KIND,
+    STRAIGHT_FLUSH,
+    ROYAL_FLUSH,
+)
+_SHORT_DECK_ORDER = {
+    hand_type: order for order, hand_type in enumerate(_SHORT_DECK_TYPES, 1)
+}
+
+SHORT_DECK_LOWEST_RANK = 6
+# Cards below the sixes, which short deck leaves out
+_LOWEST_CARD = (SHORT_DECK_LOWEST_RANK - 2) * 4
+_SHORT_DECK_RANKS = range(SHORT_DECK_LOWEST_RANK, 15)
+_SHORT_WHEEL = [9, 8, 7, 6, 14]
+
+
+def short_deck_hand_type(score: int) -> int:
+    """Return the ``HandType`` value of a short-deck score."""
+    return _SHORT_DECK_TYPES[(score >> HAND_TYPE_SHIFT) - 1]
+
+
+def _short_deck_pack(hand_type: int, ranks: Sequence[int]) -> int:
+    return _pack(_SHORT_DECK_ORDER[hand_type], ranks)
+
+
+def _short_straight(unique_ranks: Sequence[int]) -> List[int]:
+    """Return the ranks of the best short-deck straight in descending ranks."""
+    for i in range(len(unique_ranks) - 4):
+        if unique_ranks[i] - unique_ranks[i + 4] == 4:
+            return list(unique_ranks[i : i + 5])
+    if all(rank in unique_ranks for rank in _SHORT_WHEEL):
+        return _SHORT_WHEEL
+    return []
+
+
+def _short_deck_five(ranks: Sequence[int]) -> int:
+    """Score five cards of these ranks that are not a flush."""
+    counts: Dict[int, int] = {}
+    for rank in ranks:
+        counts[rank] = counts.get(rank, 0) + 1
+    groups = sorted(((count, rank) for rank, count in counts.items()), reverse=True)
+    shape = [count for count, _ in groups]
+    grouped = [rank for _, rank in groups]
+    if shape == [4, 1]:
+        return _short_deck_pack(FOUR_OF_A_KIND, grouped)
+    if shape == [3, 2]:
+        return _short_deck_pack(FULL_HOUSE, grouped)
+    if shape == [3, 1, 1]:
+        return _short_deck_pack(THREE_OF_A_KIND, grouped)
+    if shape == [2, 2, 1]:
+        return _short_deck_pack(TWO_PAIR, grouped)
+    if shape == [2, 1, 1, 1]:
+        return _short_deck_pack(PAIR, grouped)
+    straight = _short_straight(grouped)
+    if straight:
+        return _short_deck_pack(STRAIGHT, straight)
+    return _short_deck_pack(HIGH_CARD, grouped)
+
+
+def _short_deck_flush(mask: int) -> int:
+    """Score the flush made by the ranks in a suit's 13-bit rank mask."""
+    unique_ranks = [r + 2 for r in range(NUM_RANKS - 1, -1, -1) if mask >> r & 1]
+    if len(unique_ranks) < 5:
+        return 0
+    straight = _short_straight(unique_ranks)
+    if straight and straight[0] == 14:
+        return _short_deck_pack(ROYAL_FLUSH, straight)
+    if straight:
+        return _short_deck_pack(STRAIGHT_FLUSH, straight)
+    return _short_deck_pack(FLUSH, unique_ranks[:5])
+
+
+class _ShortDeckTables(NamedTuple):
+    rank_table: Dict[int, int]
+    flush_table: List[int]
+    rank_keys: np.ndarray
+    rank_scores: np.ndarray
+    flush_scores: np.ndarray
+
+
+@lru_cache(maxsize=None)
+def _short_deck_tables() -> _ShortDeckTables:
+    """Build the short-deck tables, scoring the best five of each rank multiset."""
+    rank_table = {}
+    for num_cards in range(5, 8):
+        for ranks in itertools.combinations_with_replacement(
+            _SHORT_DECK_RANKS, num_cards
+        ):
+            if any(ranks.count(rank) > 4 for rank in set(ranks)):
+                continue
+            key = sum(_POW5[rank - 2] for rank in ranks)
+            rank_table[key] = max(
+                _short_deck_five(sorted(five, reverse=True))
+                for five in set(itertools.combinations(ranks, 5))
+            )
+    flush_table = [0] * (1 << NUM_RANKS)
+    low_bit = SHORT_DECK_LOWEST_RANK - 2
+    for bits in range(1 << (NUM_RANKS - low_bit)):
+        mask = bits << low_bit
+        flush_table[mask] = _short_deck_flush(mask)
+    keys = np.array(sorted(rank_table), dtype=np.int64)
+    return _ShortDeckTables(
+        rank_table,
+        flush_table,
+        keys,
+        np.array([rank_table[key] for key in keys.tolist()], dtype=np.int32),
+        np.array(flush_table, dtype=np.int32),
+    )
+
+
+def evaluate_short_deck(cards: Sequence[int]) -> int:
+    """
+    Score a short-deck hand of 5 to 7 int cards, sixes or higher.
+
+    Returns:
+        int: The hand's short-deck score, higher is better
+
+    Raises:
+        ValueError: If there are not 5 to 7 cards or a card is below a six
+    """
+    if not 5 <= len(cards) <= 7:
+        raise ValueError("Can only score poker hands of 5 to 7 cards")
+    if min(cards) < _LOWEST_CARD:
+        raise ValueError("Short deck has no cards below the sixes")
+    tables = _short_deck_tables()
+    key = 0
+    masks = [0, 0, 0, 0]
+    for card in cards:
+        rank = card >> 2
+        key += _POW5[rank]
+        masks[card & 3] |= 1 << rank
+    flush = tables.flush_table
+    return max(
+        tables.rank_table[key],
+        flush[masks[0]],
+        flush[masks[1]],
+        flush[masks[2]],
+        flush[masks[3]],
+    )
+
+
+def evaluate_short_deck_batch(cards: np.ndarray) -> np.ndarray:
+    """
+    Score many short-deck hands at once, like ``lookup.evaluate_batch``.
+
+    Args:
+        cards: Int cards, sixes or higher, of shape ``(..., k)`` with
+            ``5 <= k <= 7``
+
+    Returns:
+        np.ndarray: The int32 short-deck scores, with the last axis removed
+
+    Raises:
+        ValueError: If hands don't have 5 to 7 cards or a card is below a six
+    """
+    cards = np.asarray(cards)
+    if not 5 <= cards.shape[-1] <= 7:
+        raise ValueError("Can only score poker hands of 5 to 7 cards")
+    if cards.size and cards.min() < _LOWEST_CARD:
+        raise ValueError("Short deck has no cards below the sixes")
+    tables = _short_deck_tables()
+    keys, masks = batch_keys(cards)
+    index = np.searchsorted(tables.rank_keys, keys)
+    scores = np.asarray(
+        tables.rank_scores[np.minimum(index, len(tables.rank_keys) - 1)]
+    )
+    for suit in range(4):
+        np.maximum(scores, tables.flush_scores[masks[..., suit]], out=scores)
+    return scores
@@ -1,19 +1,108 @@
-from holdem.agents import RandomAgent
-from holdem.engine import HoldemEngine
-from holdem.models import Table
+"""
+Simulate hands between agents and report throughput and win rates.
 
+Example:
+    python main.py --hands 100000 --players 6 --workers 8 --format json
+"""
 
-def main():
+import argparse
+import json
+import sys
+from typing import List, Optional, Sequence
+
+from loguru import logger
+
+from holdem.simulation import SimulationResult, simulate
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse the command line, filling in the default agent and seat count."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--hands", type=int, default=10_000, help="number of hands to play"
+    )
+    parser.add_argument(
+        "--players", type=int, help="number of seats, the number of agents by default"
+    )
+    parser.add_argument(
+        "--agent",
+        dest="agents",
+        action="append",
+        metavar="PATH",
+        help="agent class as package.module:Class, dealt to the seats in turn; "
+        "may be repeated (default: holdem.agents:RandomAgent)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="run seed")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="worker processes, the number of CPUs by default; 0 runs in-process",
+    )
+    parser.add_argument("--stack", type=int, default=200, help="starting stack")
+    parser.add_argument("--small-blind", type=int, default=1)
+    parser.add_argument("--big-blind", type=int, default=2)
+    parser.add_argument("--format", choices=("text", "json"), default="text")
+    args = parser.parse_args(argv)
+    args.agents = args.agents or ["holdem.agents:RandomAgent"]
+    if args.players is None:
+        # A lone agent plays against copies of itself
+        args.players = max(len(args.agents), 2)
+    return args
+
+
+def format_text(result: SimulationResult) -> str:
+    """Format a result as a report for the terminal."""
+    lines = [
+        f"{'Hands:':<15}{result.hands} in {result.seconds:.2f}s",
+        f"{'Hands/s:':<15}{result.hands_per_second:,.0f}",
+        f"{'Evaluations/s:':<15}{result.evaluations_per_second:,.0f}",
+        "",
+        f"{'Agent':<40} {'Hands':>10} {'bb/100':>10} {'Interval':>24}",
+    ]
+    for agent in result.agents:
+        low, high = agent.interval
+        lines.append(
+            f"{agent.name:<40} {agent.hands:>10} {agent.bb_per_100:>10.2f} "
+            f"{f'[{low:.2f}, {high:.2f}]':>24}"
+        )
+    return "\n".join(lines)
+
+
+def format_json(result: SimulationResult) -> str:
+    """Format a result as JSON for other tools."""
+    return json.dumps(
+        {
+            "hands": result.hands,
+            "evaluations": result.evaluations,
+            "seconds": result.seconds,
+            "hands_per_second": result.hands_per_second,
+            "evaluations_per_second": result.evaluations_per_second,
+            "agents": [
+                {**agent._asdict(), "interval": agent.interval}
+                for agent in result.agents
+            ],
+        },
+        indent=2,
+    )
+
+
+def main(argv: Optional[List[str]] = None):
     """Execute the main functionality of the program."""
-    table = Table(
-        players=[
-            RandomAgent(name="Player 1", chips=1000),
-            RandomAgent(name="Player 2", chips=1000),
-            RandomAgent(name="Player 3", chips=1000),
-        ]
+    args = parse_args(argv)
+    # Only the summary is reported, also when hands are played in-process
+    logger.disable("holdem")
+    result = simulate(
+        args.agents,
+        args.hands,
+        num_players=args.players,
+        seed=args.seed,
+        num_workers=args.workers,
+        starting_stack=args.stack,
+        small_blind=args.small_blind,
+        big_blind=args.big_blind,
     )
-    engine = HoldemEngine(table=table)
-    engine.run()
+    formatter = format_json if args.format == "json" else format_text
+    sys.stdout.write(formatter(result) + "\n")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,89 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from holdem.abstraction import (
+    BucketTable,
+    build_buckets,
+    canonical_boards,
+    equity_histograms,
+    kmeans,
+)
+from holdem.lookup import parse_cards
+from holdem.ranges import combo_index
+
+
+def test_canonical_boards():
+    assert canonical_boards(0) == [()]
+    assert len(canonical_boards(3)) == 1755
+
+
+def test_equity_histograms():
+    board = parse_cards("Ah7c2d")
+    histograms = equity_histograms(board, num_bins=10)
+    assert histograms.shape == (1326, 10)
+    # Hands holding a board card are blocked
+    assert histograms[combo_index(parse_cards("AsAh"))].sum() == 0
+    assert histograms[combo_index(parse_cards("KsKd"))].sum() == pytest.approx(1)
+
+    sets = histograms[combo_index(parse_cards("7s7d"))]
+    trash = histograms[combo_index(parse_cards("4s3h"))]
+    assert sets[-1] > 0.9
+    assert trash[0] > trash[-1]
+
+
+def test_equity_histograms_sampled():
+    rng = np.random.default_rng(0)
+    histograms = equity_histograms([], num_bins=5, num_runouts=200, rng=rng)
+    aces = histograms[combo_index(parse_cards("AsAd"))]
+    assert aces.sum() == pytest.approx(1)
+    assert aces.argmax() == 4
+
+
+def test_kmeans_separates_clusters():
+    rng = np.random.default_rng(0)
+    low = np.tile([0.8, 0.2, 0.0, 0.0], (50, 1))
+    high = np.tile([0.0, 0.0, 0.2, 0.8], (50, 1))
+    blocked = np.zeros((5, 4))
+    data = np.concatenate([low, high, blocked]).astype(np.float32)
+    _, labels = kmeans(data, 2, chunk_size=16, rng=rng)
+    assert len(set(labels[:50])) == 1
+    assert len(set(labels[50:100])) == 1
+    assert labels[0] != labels[50]
+
+
+def test_preflop_buckets(tmp_path):
+    path = str(tmp_path / "preflop.npy")
+    table = build_buckets(
+        0, 8, num_runouts=300, path=path, rng=np.random.default_rng(1)
+    )
+    assert isinstance(table.buckets, np.memmap)
+    assert table.num_buckets <= 8
+
+    # Suit permutations of a hand land in the same bucket
+    hand = parse_cards("AsKs")
+    buckets = {
+        table.bucket([card & ~3 | permutation[card & 3] for card in hand], [])
+        for permutation in itertools.permutations(range(4))
+    }
+    assert len(buckets) == 1
+    assert table.bucket(parse_cards("AsAd"), []) != table.bucket(
+        parse_cards("7s2d"), []
+    )
+
+    loaded = BucketTable.load(path, 0)
+    assert np.array_equal(loaded.buckets, table.buckets)
+
+
+def test_bucket_lookup_is_suit_invariant():
+    rng = np.random.default_rng(0)
+    table = BucketTable(rng.integers(0, 10, size=(1755, 1326)), 3)
+    hole, board = parse_cards("AhKh"), parse_cards("Qh7c2d")
+    expected = table.bucket(hole, board)
+    for permutation in itertools.permutations(range(4)):
+        permuted = [
+            [card & ~3 | permutation[card & 3] for card in cards]
+            for cards in (hole, board)
+        ]
+        assert table.bucket(*permuted) == expected
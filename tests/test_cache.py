@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from holdem.cache import CacheStats, EquityCache, EquityCacheManager, cached_equity
+from holdem.lookup import parse_cards
+
+
+def test_lru_eviction_and_counters():
+    cache = EquityCache(maxsize=2)
+    cache.put("a", 0.1)
+    cache.put("b", 0.2)
+    assert cache.get("a") == 0.1
+    cache.put("c", 0.3)  # evicts "b", the least recently used
+    assert cache.get("b") is None
+    assert cache.get("c") == 0.3
+    assert cache.stats() == CacheStats(hits=2, misses=1, evictions=1, size=2)
+
+
+def test_cached_equity_shares_isomorphic_situations():
+    cache = EquityCache()
+    first = cached_equity(
+        cache, parse_cards("AhKh"), parse_cards("Qh7c2d"), trials=2000
+    )
+    second = cached_equity(
+        cache, parse_cards("AsKs"), parse_cards("Qs7h2c"), trials=2000
+    )
+    assert first == second
+    assert cache.stats().hits == 1
+    assert cache.stats().misses == 1
+
+    cached_equity(cache, parse_cards("AhKh"), parse_cards("Qh7c2d"), 2, trials=2000)
+    assert cache.stats().size == 2
+
+
+def test_cached_equity_keys_on_precision():
+    cache = EquityCache()
+    hole, board = parse_cards("AhKh"), parse_cards("Qh7c2d")
+    cheap = cached_equity(cache, hole, board, trials=10)
+    # A more precise request is not served the cheap estimate
+    precise = cached_equity(cache, hole, board, trials=20000)
+    assert cache.stats().misses == 2
+    assert precise != cheap
+    cached_equity(cache, hole, board, trials=20000, sampling="next_card")
+    assert cache.stats().size == 3
+    assert cached_equity(cache, hole, board, trials=20000) == precise
+    assert cache.stats().hits == 1
+
+
+def test_thread_safety():
+    cache = EquityCache(maxsize=50)
+
+    def work(offset):
+        for i in range(1000):
+            cache.put(offset + i % 100, float(i))
+            cache.get(offset + (i * 7) % 100)
+
+    threads = [threading.Thread(target=work, args=(n * 1000,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = cache.stats()
+    assert stats.size == 50
+    assert stats.hits + stats.misses == 4000
+
+
+def test_persistence(tmp_path):
+    path = str(tmp_path / "equity.pkl")
+    cache = EquityCache(path=path)
+    cache.put(("x", 1), 0.5)
+    cache.save()
+
+    restored = EquityCache(path=path)
+    assert restored.get(("x", 1)) == 0.5
+
+    with pytest.raises(ValueError):
+        EquityCache().save()
+
+
+def test_shared_between_processes():
+    with EquityCacheManager() as manager:
+        cache = manager.EquityCache(maxsize=10)
+        cache.put("key", 0.25)
+        assert cache.get("key") == 0.25
+        assert cache.stats().hits == 1
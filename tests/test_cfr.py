@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from holdem.cfr import (
+    CFRSolver,
+    Decision,
+    Terminal,
+    preflop_matchups,
+    push_fold_tree,
+    river_matchups,
+    solve_push_fold,
+)
+from holdem.lookup import parse_cards
+from holdem.ranges import combo_index
+
+
+def _kuhn():
+    """Kuhn poker: three cards, one chip antes and one chip bets."""
+    tree = Decision(
+        0,
+        ("check", "bet"),
+        (
+            Decision(
+                1,
+                ("check", "bet"),
+                (
+                    Terminal((1, 1)),
+                    Decision(
+                        0, ("fold", "call"), (Terminal((1, 2), 0), Terminal((2, 2)))
+                    ),
+                ),
+            ),
+            Decision(1, ("fold", "call"), (Terminal((2, 1), 1), Terminal((2, 2)))),
+        ),
+    )
+    matchups = 1 - np.eye(3)
+    equity = (np.arange(3)[:, None] > np.arange(3)[None, :]).astype(float)
+    return CFRSolver(tree, matchups, equity)
+
+
+def test_kuhn_poker_value():
+    solver = _kuhn()
+    assert solver.solve(2000) < 1e-3
+    assert solver.value() == pytest.approx(-1 / 18, abs=1e-3)
+
+    # The second player always calls with the king and never with the jack
+    facing_bet = solver.strategy(("bet",))
+    assert facing_bet[2, 1] == pytest.approx(1, abs=1e-3)
+    assert facing_bet[0, 1] == pytest.approx(0, abs=1e-3)
+
+
+def test_solve_stops_at_tolerance():
+    solver = _kuhn()
+    solver.solve(10000, tolerance=1e-2)
+    assert solver.iterations < 10000
+
+
+@pytest.fixture(scope="module")
+def matchups():
+    return preflop_matchups(num_boards=100, rng=np.random.default_rng(0))
+
+
+def test_push_fold(matchups):
+    weights, equity = matchups
+    assert weights.shape == (169, 169)
+    assert weights.sum() == 1326 * 1225
+
+    result = solve_push_fold(10, iterations=500, matchups=matchups)
+    assert result.exploitability < 1e-3
+    assert result.push_probability(parse_cards("AsAd")) > 0.99
+    assert result.call_probability(parse_cards("AsAd")) > 0.99
+    assert result.call_probability(parse_cards("7s2d")) < 0.01
+
+    # Deeper stacks push fewer hands
+    deep = solve_push_fold(30, iterations=500, matchups=matchups)
+    assert deep.push.sum() < result.push.sum()
+
+
+def test_push_fold_tree():
+    tree = push_fold_tree(10)
+    assert tree.actions == ("fold", "push")
+    assert tree.children[0] == Terminal((0.5, 1.0), folder=0)
+    assert tree.children[1].children[1] == Terminal((10, 10))
+
+
+def test_river_subgame():
+    board = parse_cards("2c7d9hJsKs")
+    weights, equity = river_matchups(board)
+    nuts = combo_index(parse_cards("QhTh"))
+    air = combo_index(parse_cards("4h3h"))
+    blocked = combo_index(parse_cards("Ks2s"))
+    assert equity[nuts, air] == 1
+    assert weights[blocked].sum() == 0
+
+    # One bet of the pot: the bettor's value hands bet and air bluffs
+    tree = Decision(
+        0,
+        ("check", "bet"),
+        (
+            Terminal((1, 1)),
+            Decision(1, ("fold", "call"), (Terminal((2, 1), 1), Terminal((2, 2)))),
+        ),
+    )
+    solver = CFRSolver(tree, weights, equity)
+    solver.solve(200)
+    assert solver.strategy()[nuts, 1] > 0.99
+    assert solver.exploitability() < 0.01
@@ -0,0 +1,74 @@
+import json
+import os
+import subprocess
+import sys
+
+import holdem
+from holdem import core
+from holdem.rng import HandStream
+
+# Seconds a fresh interpreter may take to import holdem.core, tables cached
+IMPORT_BUDGET = 0.5
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import holdem.core
+elapsed = time.perf_counter() - start
+heavy = sorted(name for name in ("pydantic", "loguru", "holdem.models") if name in sys.modules)
+scalar_tables = sys.modules["holdem.lookup"]._RANK_TABLE is not None
+print(json.dumps([elapsed, heavy, scalar_tables]))
+"""
+
+
+def _import_core(cache_dir):
+    env = dict(os.environ, HOLDEM_CACHE_DIR=str(cache_dir))
+    env.pop("HOLDEM_SHARED_TABLES", None)
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        env=env,
+        capture_output=True,
+        check=True,
+        text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(holdem.__file__))),
+    ).stdout
+    return json.loads(output)
+
+
+def test_import_is_light_and_fast(tmp_path):
+    # The first import builds the table cache, later ones map it
+    _, heavy, scalar_tables = _import_core(tmp_path)
+    assert heavy == []
+    # The dict and list of the scalar evaluator wait for its first call
+    assert not scalar_tables
+    elapsed = min(_import_core(tmp_path)[0] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET
+
+
+def test_deck():
+    deck = core.Deck()
+    assert deck.cards == list(range(52))
+    assert deck.deal(2) == [51, 50]
+    assert deck.draw() == 49
+    assert len(deck) == 49
+    deck.reset()
+    assert len(deck) == 52
+
+    # Seeded decks deal the same cards as the model deck
+    seeded = core.Deck(rng=HandStream(4, 0))
+    seeded.shuffle()
+    model = holdem.Deck(rng=HandStream(4, 0))
+    model.shuffle()
+    assert seeded.deal(5) == [card.to_int() for card in model.deal(5)]
+
+
+def test_evaluate():
+    royal = core.parse_cards("As Ks Qs Js Ts")
+    assert core.hand_type(core.evaluate(royal)) == core.ROYAL_FLUSH
+
+
+def test_lazy_package_attributes():
+    from holdem.models import Table
+
+    assert holdem.Table is Table
+    assert "HoldemEngine" in dir(holdem)
@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+from holdem.agents import RandomAgent
+from holdem.duplicate import DuplicateMatch
+from holdem.models import Action, ActionType, Player
+
+
+class CallingStation(Player):
+    def make_decision(self, table):
+        legal = table.legal_actions
+        if legal.can_call:
+            action_type, amount = ActionType.CALL, legal.call_amount
+        else:
+            action_type, amount = ActionType.CHECK, 0
+        return Action(
+            type=action_type, amount=amount, street=table.current_street, player=self
+        )
+
+
+class HighCards(Player):
+    """Raises pairs and two high cards, folds everything else to a bet."""
+
+    def make_decision(self, table):
+        legal = table.legal_actions
+        ranks = [card.rank for card in self.hand]
+        strong = ranks[0] == ranks[1] or min(ranks) >= 10
+        if strong and legal.can_raise:
+            action_type = ActionType.RAISE if table.current_bet else ActionType.BET
+            amount = legal.min_raise
+        elif legal.can_call:
+            action_type = ActionType.CALL if strong else ActionType.FOLD
+            amount = legal.call_amount if strong else 0
+        else:
+            action_type, amount = ActionType.CHECK, 0
+        return Action(
+            type=action_type, amount=amount, street=table.current_street, player=self
+        )
+
+
+def _stations(n):
+    return [CallingStation(name=f"Player {i}", chips=0) for i in range(n)]
+
+
+def test_duplicate_cancels_card_luck():
+    duplicate = DuplicateMatch(players=_stations(2), num_deals=100).run()
+    for result in duplicate:
+        assert result.hands == 200
+        assert result.bb_per_100 == 0
+        assert result.std_error == 0
+
+    plain = DuplicateMatch(players=_stations(2), num_deals=100, duplicate=False).run()
+    assert plain[0].hands == 100
+    assert plain[0].std_error > 0
+
+
+def test_every_agent_plays_every_seat():
+    results = DuplicateMatch(players=_stations(3), num_deals=30).run()
+    assert [result.hands for result in results] == [90] * 3
+    assert sum(result.bb_per_100 for result in results) == pytest.approx(0)
+    for result in results:
+        assert result.bb_per_100 == pytest.approx(0)
+
+
+def test_deals_are_seeded():
+    match = DuplicateMatch(players=_stations(2), num_deals=2, seed=7)
+    assert match.deal(0) == DuplicateMatch(players=[], num_deals=1, seed=7).deal(0)
+    assert match.deal(0) != match.deal(1)
+
+
+def test_interval():
+    players = [
+        CallingStation(name="Station", chips=0),
+        RandomAgent(name="Random", chips=0),
+    ]
+    results = DuplicateMatch(players=players, num_deals=50).run()
+    low, high = results[0].interval
+    assert low < results[0].bb_per_100 < high
+    assert results[0].bb_per_100 == pytest.approx(-results[1].bb_per_100)
+
+
+def _rule_vs_random():
+    return [HighCards(name="High cards", chips=0), RandomAgent(name="Random", chips=0)]
+
+
+def test_duplicate_reduces_the_error_of_real_agents():
+    duplicate = DuplicateMatch(players=_rule_vs_random(), num_deals=300).run()
+    plain = DuplicateMatch(
+        players=_rule_vs_random(), num_deals=300, duplicate=False
+    ).run()
+    assert duplicate[0].std_error < 0.75 * plain[0].std_error
+
+
+def test_match_is_seeded_and_leaves_global_random_alone():
+    state = random.getstate()
+    first = DuplicateMatch(players=_rule_vs_random(), num_deals=20, seed=3).run()
+    assert random.getstate() == state
+    second = DuplicateMatch(players=_rule_vs_random(), num_deals=20, seed=3).run()
+    assert first == second
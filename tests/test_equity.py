@@ -0,0 +1,224 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from holdem.equity import (
+    Sampling,
+    _Tally,
+    class_equity,
+    estimate_equity,
+    hand_equity,
+    range_vs_range,
+)
+from holdem.isomorphism import preflop_index
+from holdem.lookup import evaluate, parse_cards
+from holdem.ranges import COMBOS, Range
+
+
+def _brute_force(hero, villain, board):
+    deck = [card for card in range(52) if card not in board]
+    won = matchups = 0.0
+    for runout in itertools.combinations(deck, 5 - len(board)):
+        full_board = board + list(runout)
+        for i in hero.combos():
+            for j in villain.combos():
+                cards = set(COMBOS[i]) | set(COMBOS[j]) | set(full_board)
+                if len(cards) < 9:
+                    continue
+                weight = hero.weights[i] * villain.weights[j]
+                hero_score = evaluate(list(COMBOS[i]) + full_board)
+                villain_score = evaluate(list(COMBOS[j]) + full_board)
+                if hero_score > villain_score:
+                    won += weight
+                elif hero_score == villain_score:
+                    won += weight / 2
+                matchups += weight
+    return won / matchups
+
+
+@pytest.mark.parametrize("board", ["AhTd9c2s5h", "AhTd9c2s"])
+def test_range_vs_range_matches_brute_force(board):
+    hero = Range.parse("QQ+, AKs, T9s")
+    villain = Range.parse("JJ-88, AQ:0.5, KQs, 7h6h")
+    board_cards = parse_cards(board)
+    assert range_vs_range(hero, villain, board_cards) == pytest.approx(
+        _brute_force(hero, villain, board_cards)
+    )
+
+
+def test_range_vs_itself_is_even():
+    hand_range = Range.parse("TT+, AQs+")
+    assert range_vs_range(hand_range, hand_range, parse_cards("8h7h2c")) == (
+        pytest.approx(0.5)
+    )
+
+
+def test_range_vs_range_errors():
+    with pytest.raises(ValueError):
+        range_vs_range(Range.full(), Range.full(), parse_cards("AhKd"))
+    with pytest.raises(ValueError):
+        range_vs_range(Range.parse("AsAh"), Range.parse("AsAd"), parse_cards("2c3c4d"))
+
+
+def test_hand_equity_preflop():
+    rng = np.random.default_rng(0)
+    # Aces win about 85% heads-up and about 56% against four opponents
+    assert hand_equity(parse_cards("AsAh"), [], 1, 50000, rng) == pytest.approx(
+        0.852, abs=0.01
+    )
+    assert hand_equity(parse_cards("AsAh"), [], 4, 50000, rng) == pytest.approx(
+        0.558, abs=0.015
+    )
+
+
+def test_hand_equity_made_hands():
+    rng = np.random.default_rng(0)
+    assert hand_equity(parse_cards("AsKs"), parse_cards("QsJsTs2d3c"), 3, 100, rng) == 1
+    # Both hands play the board's straight
+    assert hand_equity(
+        parse_cards("2h3h"), parse_cards("AsKdQcJhTd"), 1, 1000, rng
+    ) == pytest.approx(0.5, abs=0.05)
+
+
+def test_hand_equity_errors():
+    with pytest.raises(ValueError):
+        hand_equity(parse_cards("AsAs"), [])
+    with pytest.raises(ValueError):
+        hand_equity(parse_cards("As"), [])
+
+
+def test_class_equity():
+    classes = [preflop_index(combo) for combo in COMBOS.tolist()]
+    matchups, equity = class_equity(
+        classes, num_boards=200, rng=np.random.default_rng(0)
+    )
+    aces = preflop_index(parse_cards("AsAd"))
+    kings = preflop_index(parse_cards("KsKd"))
+    suited = preflop_index(parse_cards("AsKs"))
+    assert matchups[aces, aces] == 6
+    assert matchups[aces, kings] == 36
+    # Two aces leave two of the four suited ace-kings
+    assert matchups[aces, suited] == 6 * 2
+    assert equity[aces, kings] == pytest.approx(0.82, abs=0.05)
+    assert equity[aces, aces] == pytest.approx(0.5)
+    assert np.allclose(equity + equity.T, 1)
+
+
+def test_estimate_equity_stops_at_precision():
+    rng = np.random.default_rng(0)
+    hole = parse_cards("AsKd")
+    estimate = estimate_equity(
+        hole, [], precision=0.01, rng=rng, sampling=Sampling.RANDOM
+    )
+    assert estimate.half_width <= 0.01
+    low, high = estimate.interval
+    assert low < 0.65 < high
+
+    # A lopsided spot needs fewer deals than a close one
+    lopsided = estimate_equity(
+        parse_cards("AsAd"),
+        parse_cards("KsKdKc"),
+        precision=0.01,
+        rng=rng,
+        sampling=Sampling.RANDOM,
+    )
+    assert lopsided.trials < estimate.trials
+
+
+def test_estimate_equity_budgets():
+    rng = np.random.default_rng(0)
+    hole = parse_cards("AsKd")
+    capped = estimate_equity(
+        hole, [], precision=1e-6, batch_size=500, max_trials=2000, rng=rng
+    )
+    assert capped.trials == 2000
+    assert capped.half_width > 1e-6
+
+    timed = estimate_equity(hole, [], precision=1e-6, max_time=0.05, rng=rng)
+    assert timed.trials < 1_000_000
+
+    with pytest.raises(ValueError):
+        estimate_equity(hole, [], max_trials=0, rng=rng)
+    with pytest.raises(ValueError):
+        estimate_equity(hole, [], batch_size=0, rng=rng)
+    with pytest.raises(ValueError):
+        hand_equity(hole, [], trials=0, rng=rng)
+
+
+@pytest.fixture(scope="module")
+def flop_equity():
+    return range_vs_range(Range.parse("9s8s"), Range.full(), parse_cards("7s6d2h"))
+
+
+@pytest.mark.parametrize("sampling", list(Sampling))
+def test_sampling_is_unbiased(sampling, flop_equity):
+    hole, board = parse_cards("9s8s"), parse_cards("7s6d2h")
+    estimate = estimate_equity(
+        hole, board, precision=0.003, rng=np.random.default_rng(1), sampling=sampling
+    )
+    assert estimate.equity == pytest.approx(flop_equity, abs=0.01)
+
+
+def _trials(hole, board, sampling, precision=0.004):
+    return estimate_equity(
+        parse_cards(hole),
+        parse_cards(board),
+        precision=precision,
+        rng=np.random.default_rng(0),
+        sampling=sampling,
+    ).trials
+
+
+def test_quasi_random_needs_fewer_deals():
+    for hole, board in [("AhKh", "Qh7h2c9d"), ("9s8s", "7s6d2h")]:
+        random = _trials(hole, board, Sampling.RANDOM)
+        assert _trials(hole, board, Sampling.QUASI) * 2.5 < random
+
+
+def test_quasi_random_is_the_default():
+    hole, board = parse_cards("AhKh"), parse_cards("Qh7h2c")
+    default = estimate_equity(hole, board, rng=np.random.default_rng(3))
+    quasi = estimate_equity(
+        hole, board, rng=np.random.default_rng(3), sampling=Sampling.QUASI
+    )
+    assert default == quasi
+
+
+def test_stratified_sampling_needs_fewer_deals():
+    # A made hand on the turn: most of the variance is the opponent's hand
+    random = _trials("KsKd", "Ah7h2c8d", Sampling.RANDOM)
+    assert _trials("KsKd", "Ah7h2c8d", Sampling.OPPONENT) * 2 < random
+    # A combo draw on the turn: most of it is the river card
+    random = _trials("QhJh", "Th9h2c3d", Sampling.RANDOM)
+    assert _trials("QhJh", "Th9h2c3d", Sampling.NEXT_CARD) * 2 < random
+
+
+def test_stratified_river_is_exact():
+    # On the river the opponent's hand is all that is left to sample
+    hole, board = parse_cards("AsKd"), parse_cards("Qs7h2c8d3c")
+    stratified = estimate_equity(hole, board, sampling=Sampling.OPPONENT)
+    assert stratified.std_error == 0
+    assert stratified.equity == pytest.approx(
+        range_vs_range(Range.parse("AsKd"), Range.full(), board)
+    )
+
+
+def test_stratified_estimate_waits_for_every_stratum():
+    tally = _Tally(between_groups=False, num_groups=3)
+    tally.add(np.array([1.0, 1.0, 0.0]), np.array([0, 0, 1]))
+    # Averaging the two strata seen would give 0.5
+    mean, std_error = tally.estimate()
+    assert mean == pytest.approx(2 / 3)
+    assert 0 < std_error < float("inf")
+
+    tally.add(np.array([0.5]), np.array([2]))
+    mean, _ = tally.estimate()
+    assert mean == pytest.approx(0.5)
+
+
+def test_next_card_needs_a_card_to_come():
+    with pytest.raises(ValueError):
+        hand_equity(
+            parse_cards("AsKd"), parse_cards("Qs7h2c8d3c"), sampling=Sampling.NEXT_CARD
+        )
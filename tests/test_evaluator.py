@@ -1,6 +1,9 @@
+import random
+
 import pytest
 
 from holdem.evaluator import Evaluator, HandType
+from holdem.lookup import parse_cards
 from holdem.models import Card, Rank, Suit
 
 
@@ -737,8 +740,8 @@ def test_wheel_straight_flush():
     ]  # Ace is low in this case
 
 
-def test_full_house_three_pair():
-    # Three pairs and a card, should form a full house with the best two pairs
+def test_two_pair_three_pair():
+    # Three pairs and a card are two pair, the third pair playing as a kicker
     hand = [
         Card(rank=Rank.ACE, suit=Suit.SPADES),
         Card(rank=Rank.ACE, suit=Suit.HEARTS),
@@ -753,8 +756,9 @@ def test_full_house_three_pair():
 
     evaluation = Evaluator.evaluate(hand, community)
 
-    assert evaluation.hand_type == HandType.FULL_HOUSE
-    assert evaluation.ranks == [Rank.ACE, Rank.KING]  # Aces full of Kings
+    assert evaluation.hand_type == HandType.TWO_PAIR
+    assert evaluation.ranks == [Rank.ACE, Rank.KING, Rank.QUEEN]
+    assert Evaluator.from_score(Evaluator.score(hand, community)) == evaluation
 
 
 def test_best_hand_selection():
@@ -1062,3 +1066,68 @@ def test_best_hand_selection_2():
         Rank.SIX,
         Rank.FIVE,
     ], "9-high straight flush"
+
+
+def test_score_matches_evaluate():
+    rng = random.Random(0)
+    for _ in range(2000):
+        cards = [Card.from_int(card) for card in rng.sample(range(52), 7)]
+        # Sort so that equal-count groups are ranked high to low by evaluate
+        cards.sort(key=lambda card: card.rank, reverse=True)
+        expected = Evaluator.evaluate(cards[:2], cards[2:])
+        if expected.hand_type == HandType.STRAIGHT_FLUSH and not expected.ranks:
+            # evaluate flags a straight and a flush in different cards
+            continue
+        score = Evaluator.score(cards[:2], cards[2:])
+        assert Evaluator.from_score(score) == expected
+
+
+def test_score_ordering():
+    royal = Evaluator.score(
+        [Card(rank=Rank.ACE, suit=Suit.HEARTS), Card(rank=Rank.KING, suit=Suit.HEARTS)],
+        [
+            Card(rank=Rank.QUEEN, suit=Suit.HEARTS),
+            Card(rank=Rank.JACK, suit=Suit.HEARTS),
+            Card(rank=Rank.TEN, suit=Suit.HEARTS),
+        ],
+    )
+    wheel = Evaluator.score(
+        [Card(rank=Rank.ACE, suit=Suit.SPADES), Card(rank=Rank.TWO, suit=Suit.HEARTS)],
+        [
+            Card(rank=Rank.THREE, suit=Suit.CLUBS),
+            Card(rank=Rank.FOUR, suit=Suit.HEARTS),
+            Card(rank=Rank.FIVE, suit=Suit.DIAMONDS),
+        ],
+    )
+    six_high = Evaluator.score(
+        [Card(rank=Rank.SIX, suit=Suit.SPADES), Card(rank=Rank.TWO, suit=Suit.HEARTS)],
+        [
+            Card(rank=Rank.THREE, suit=Suit.CLUBS),
+            Card(rank=Rank.FOUR, suit=Suit.HEARTS),
+            Card(rank=Rank.FIVE, suit=Suit.DIAMONDS),
+        ],
+    )
+    assert royal > six_high > wheel
+    assert Evaluator.from_score(royal).hand_type == HandType.ROYAL_FLUSH
+
+    with pytest.raises(ValueError):
+        Evaluator.score([Card(rank=Rank.ACE, suit=Suit.SPADES)], [])
+
+
+def test_omaha_and_short_deck():
+    def cards(text):
+        return [Card.from_int(card) for card in parse_cards(text)]
+
+    hole, board = cards("As Kd 7c 2h"), cards("Qs Js Ts 3s 8d")
+    assert Evaluator.evaluate_omaha(hole, board).hand_type == HandType.STRAIGHT
+    assert Evaluator.score_omaha(hole, board) < Evaluator.score(hole[:1], board)
+
+    flush = Evaluator.evaluate_short_deck(cards("Ks Qs"), cards("Kd Kc 9s 7s 6s"))
+    assert flush.hand_type == HandType.FLUSH
+    assert flush.ranks == [Rank.KING, Rank.QUEEN, Rank.NINE, Rank.SEVEN, Rank.SIX]
+    full_house = Evaluator.score_short_deck(cards("Ks Kh"), cards("Kd 9c 9s 7s 6d"))
+    assert (
+        Evaluator.score_short_deck(cards("Ks Qs"), cards("Kd Kc 9s 7s 6s")) > full_house
+    )
+    with pytest.raises(ValueError):
+        Evaluator.score_short_deck(cards("Ks"), cards("Kd Kc 9s"))
@@ -0,0 +1,87 @@
+import pytest
+from loguru import logger
+
+from holdem.agents import RandomAgent
+from holdem.engine import HoldemEngine
+from holdem.events import Event, EventBuffer, EventType
+from holdem.models import Deck, Street, Table
+from holdem.rng import HandStream
+
+
+def _event(hand):
+    return Event(EventType.HAND_START, hand, Street.PREFLOP)
+
+
+def test_buffer_delivers_batches():
+    buffer = EventBuffer(capacity=3)
+    first, second = [], []
+    buffer.subscribe(first.append)
+    buffer.subscribe(second.append)
+    for hand in range(7):
+        buffer.emit(_event(hand))
+    assert [len(batch) for batch in first] == [3, 3]
+    assert len(buffer) == 1
+    buffer.flush()
+    assert [event.hand for batch in first for event in batch] == list(range(7))
+    assert second == first
+
+    buffer.unsubscribe(second.append)
+    buffer.emit(_event(7))
+    buffer.flush()
+    assert len(first) == 4 and len(second) == 3
+
+    with pytest.raises(ValueError):
+        EventBuffer(capacity=0)
+
+
+def test_engine_events():
+    players = [RandomAgent(name=f"Player {i}", chips=100) for i in range(3)]
+    stream = HandStream(1, 0)
+    table = Table(players=players, deck=Deck(rng=stream), rng=stream.rng)
+    events = []
+    buffer = EventBuffer(capacity=16)
+    buffer.subscribe(events.extend)
+    engine = HoldemEngine(table=table, events=buffer)
+    table.reset()
+    for _ in range(20):
+        table.next_hand()
+        engine.run_hand()
+        for player in players:
+            if player.chips <= 0:
+                player.chips = 100
+        buffer.flush()
+        hand = [event for event in events if event.hand == events[-1].hand]
+
+        assert hand[0].type == EventType.HAND_START
+        assert hand[0].seat == table.dealer_index
+        assert [event.type for event in hand[1:6]] == [EventType.DEAL] * 3 + [
+            EventType.BLIND
+        ] * 2
+        board = [
+            card
+            for event in hand
+            if event.type == EventType.STREET
+            for card in event.cards
+        ]
+        assert board == [card.to_int() for card in table.community_cards]
+        # Chips put in and won balance out
+        put_in = [0] * 3
+        for event in hand:
+            if event.type in (EventType.BLIND, EventType.ACTION):
+                put_in[event.seat] -= event.amount
+            elif event.type == EventType.SHOWDOWN:
+                put_in[event.seat] += event.amount
+        assert sum(put_in) == 0
+
+
+def test_disabled_logging_formats_nothing(monkeypatch):
+    def fail(self, cards):
+        raise AssertionError("cards formatted for a disabled log")
+
+    monkeypatch.setattr(HoldemEngine, "print_cards", fail)
+    players = [RandomAgent(name=f"Player {i}", chips=100) for i in range(3)]
+    logger.disable("holdem")
+    try:
+        HoldemEngine(table=Table(players=players)).run()
+    finally:
+        logger.enable("holdem")
@@ -0,0 +1,99 @@
+import itertools
+
+import pytest
+
+from holdem.isomorphism import (
+    NUM_PREFLOP_CLASSES,
+    canonical_board,
+    canonical_index,
+    canonicalize,
+    preflop_index,
+)
+from holdem.lookup import parse_cards
+
+
+def _permute(cards, permutation):
+    return [card & ~3 | permutation[card & 3] for card in cards]
+
+
+def test_isomorphic_situations_share_index():
+    hole = parse_cards("AhKh")
+    board = parse_cards("Qh7c2dTs")
+    expected = canonical_index(hole, board)
+    for permutation in itertools.permutations(range(4)):
+        assert canonicalize(
+            _permute(hole, permutation), _permute(board, permutation)
+        ) == canonicalize(hole, board)
+        assert (
+            canonical_index(_permute(hole, permutation), _permute(board, permutation))
+            == expected
+        )
+
+
+def test_order_within_round_is_ignored():
+    assert canonical_index(parse_cards("AhKh"), parse_cards("Qh7c2d")) == (
+        canonical_index(parse_cards("KhAh"), parse_cards("2d7cQh"))
+    )
+
+
+def test_rounds_are_kept_apart():
+    # The same seven cards with a different flop are different situations
+    assert canonical_index(parse_cards("AhKh"), parse_cards("Qh7h2cTs")) != (
+        canonical_index(parse_cards("AhKh"), parse_cards("Qh7h2c") + [0])
+    )
+    assert canonical_index(parse_cards("AhKh"), parse_cards("Qh7h2c3h")) != (
+        canonical_index(parse_cards("AhKh"), parse_cards("Qh7h3h2c"))
+    )
+
+
+def test_suited_and_offsuit_differ():
+    board = parse_cards("Qh7c2d")
+    assert canonical_index(parse_cards("AhKh"), board) != canonical_index(
+        parse_cards("AhKs"), board
+    )
+
+
+@pytest.mark.parametrize("flop", ["2c7d9h", "2c7c9c", "2c2d9h"])
+def test_classes_match_brute_force(flop):
+    board = parse_cards(flop)
+    deck = [card for card in range(52) if card not in board]
+    by_index = {}
+    by_orbit = {}
+    for hole in itertools.combinations(deck, 2):
+        orbit = min(
+            (
+                tuple(sorted(_permute(hole, permutation))),
+                tuple(sorted(_permute(board, permutation))),
+            )
+            for permutation in itertools.permutations(range(4))
+        )
+        by_index.setdefault(canonical_index(list(hole), board), set()).add(orbit)
+        by_orbit.setdefault(orbit, set()).add(canonical_index(list(hole), board))
+    assert all(len(orbits) == 1 for orbits in by_index.values())
+    assert all(len(indexes) == 1 for indexes in by_orbit.values())
+
+
+def test_preflop_index():
+    indexes = {
+        preflop_index(list(hole)) for hole in itertools.combinations(range(52), 2)
+    }
+    assert indexes == set(range(NUM_PREFLOP_CLASSES))
+    assert preflop_index(parse_cards("AsAh")) == 12
+    assert preflop_index(parse_cards("AsKs")) == preflop_index(parse_cards("KdAd"))
+    assert preflop_index(parse_cards("AsKs")) != preflop_index(parse_cards("AsKd"))
+
+
+def test_canonical_board():
+    board = parse_cards("Qh7c2dTs")
+    canonical, mapping = canonical_board(board)
+    for permutation in itertools.permutations(range(4)):
+        assert canonical_board(_permute(board, permutation))[0] == canonical
+    assert list(canonical[:3]) == sorted(_permute(board[:3], mapping))
+    assert list(canonical[3:]) == _permute(board[3:], mapping)
+
+
+def test_invalid_situation():
+    with pytest.raises(ValueError):
+        canonicalize(parse_cards("As"), [])
+    with pytest.raises(ValueError):
+        canonicalize(parse_cards("AsKs"), parse_cards("2c3c"))
@@ -0,0 +1,120 @@
+import os
+
+import numpy as np
+import pytest
+
+from holdem import lookup
+from holdem.shared import SharedArrays
+
+
+def test_parse_cards():
+    assert lookup.parse_cards("2s") == [0]
+    assert lookup.parse_cards("As Kd, 3c") == [48, 46, 7]
+    assert [lookup.card_str(card) for card in lookup.parse_cards("AsKdTc")] == [
+        "As",
+        "Kd",
+        "Tc",
+    ]
+    with pytest.raises(ValueError):
+        lookup.parse_cards("Ax")
+    with pytest.raises(ValueError):
+        lookup.parse_cards("AsK")
+
+
+def test_evaluate_batch_matches_evaluate():
+    rng = np.random.default_rng(0)
+    for num_cards in (5, 6, 7):
+        hands = np.argsort(rng.random((2000, 52)), axis=1)[:, :num_cards]
+        scores = lookup.evaluate_batch(hands)
+        assert scores.shape == (2000,)
+        assert scores.tolist() == [lookup.evaluate(hand) for hand in hands.tolist()]
+
+
+def test_evaluate_on_board_matches_evaluate():
+    rng = np.random.default_rng(1)
+    for num_board in (3, 4, 5):
+        for cards in np.argsort(rng.random((200, 52)), axis=1)[:, :11].tolist():
+            board, holes = cards[:num_board], [cards[5:7], cards[7:9], cards[9:11]]
+            assert lookup.evaluate_on_board(holes, board) == [
+                lookup.evaluate(hole + board) for hole in holes
+            ]
+
+
+def test_evaluate_batch_shapes():
+    hands = np.array(
+        [lookup.parse_cards("AsKsQsJsTs"), lookup.parse_cards("2c3d4h5s7c")]
+    )
+    scores = lookup.evaluate_batch(hands.reshape(1, 2, 5))
+    assert scores.shape == (1, 2)
+    assert lookup.hand_type(int(scores[0, 0])) == lookup.ROYAL_FLUSH
+    assert lookup.hand_type(int(scores[0, 1])) == lookup.HIGH_CARD
+
+
+def test_table_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv(lookup.CACHE_DIR_VARIABLE, str(tmp_path))
+    path = lookup.cache_path()
+    assert path.startswith(str(tmp_path))
+    built = lookup.load_tables()
+    assert os.path.exists(path)
+
+    # Later loads map the file instead of building
+    def no_build():
+        raise AssertionError("Tables were rebuilt")
+
+    monkeypatch.setattr(lookup, "build_tables", no_build)
+    cached = lookup.load_tables()
+    for name, array in built.items():
+        np.testing.assert_array_equal(cached[name], array)
+        np.testing.assert_array_equal(cached[name], getattr(lookup, f"_{name.upper()}"))
+    monkeypatch.undo()
+
+    # A damaged file is rebuilt
+    monkeypatch.setenv(lookup.CACHE_DIR_VARIABLE, str(tmp_path))
+    with open(path, "r+b") as file:
+        file.seek(-1, os.SEEK_END)
+        file.write(b"\xff")
+    np.testing.assert_array_equal(
+        lookup.load_tables()["flush_scores"], built["flush_scores"]
+    )
+    assert lookup._read_cache(path) is not None
+
+    monkeypatch.setenv(lookup.CACHE_DIR_VARIABLE, "")
+    assert lookup.cache_path() is None
+
+
+def _write_header(path, header):
+    with open(path, "wb") as file:
+        file.write(len(header).to_bytes(8, "little"))
+        file.write(header)
+
+
+def test_unreadable_cache_is_ignored(tmp_path):
+    path = str(tmp_path / "cache")
+    open(path, "wb").close()
+    assert lookup._read_cache(path) is None
+
+    # An older layout listed the names only
+    _write_header(path, b'["rank_keys", "rank_scores", "flush_scores"]')
+    assert lookup._read_cache(path) is None
+
+    # Truncated after the header
+    _write_header(path, b'{"rank_keys": ["<i8", [100], 0]}')
+    assert lookup._read_cache(path) is None
+
+
+def test_unusable_shared_tables_fall_back(tmp_path, monkeypatch):
+    garbage = tmp_path / "garbage"
+    _write_header(garbage, b"[1, 2]")
+    other = SharedArrays.create({"equity": np.ones(3)}, str(tmp_path / "other"))
+    for path in (str(tmp_path / "missing"), str(garbage), other.path):
+        monkeypatch.setenv(lookup.SHARED_TABLES_VARIABLE, path)
+        assert lookup._attach_tables() is None
+
+
+def test_three_pairs_are_two_pair():
+    score = lookup.evaluate(lookup.parse_cards("As Ad Ks Kd Qs Qd 2c"))
+    assert lookup.hand_type(score) == lookup.TWO_PAIR
+    assert lookup.hand_ranks(score) == [14, 13, 12]
+    # Trips beat them, and so does a better kicker beside the same pairs
+    assert score < lookup.evaluate(lookup.parse_cards("2s 2d 2h 3c 4d 7s 9h"))
+    assert score > lookup.evaluate(lookup.parse_cards("As Ad Ks Kd Js Jd 2c"))
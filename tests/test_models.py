@@ -1,4 +1,14 @@
-from holdem.models import Deck, Player, Table
+import pytest
+
+from holdem.models import (
+    NO_LEGAL_ACTIONS,
+    Action,
+    ActionType,
+    Deck,
+    Player,
+    Street,
+    Table,
+)
 
 
 def test_deck():
@@ -45,3 +55,215 @@ def test_table():
     table.deal_river()
     assert len(table.community_cards) == 5
     assert len(table.deck.cards) == 52 - 2 * len(table.players) - 5
+
+
+def _snapshot(table):
+    return (
+        [(p.chips, p.is_folded, list(p.hand)) for p in table.players],
+        table.pot,
+        table.current_player_index,
+        table.current_street,
+        list(table.community_cards),
+        list(table.deck.cards),
+        len(table.action_history),
+    )
+
+
+def test_apply_and_undo_action():
+    table = Table(
+        players=[
+            Player(name="Player 1", chips=1000),
+            Player(name="Player 2", chips=1000),
+            Player(name="Player 3", chips=1000),
+        ]
+    )
+    table.reset()
+    table.dealer_index = 0
+    before_deal = _snapshot(table)
+    table.deal_hands()
+    table.post_blinds()
+    start = _snapshot(table)
+
+    first = table.players[table.current_player_index]
+    table.apply_action(
+        Action(type=ActionType.RAISE, street=Street.PREFLOP, amount=50, player=first)
+    )
+    assert first.chips == 950
+    assert table.pot == 53
+
+    second = table.players[table.current_player_index]
+    assert second is not first
+    table.apply_action(
+        Action(type=ActionType.FOLD, street=Street.PREFLOP, amount=0, player=second)
+    )
+    assert second.is_folded
+    third = table.players[table.current_player_index]
+    table.apply_action(
+        Action(type=ActionType.CALL, street=Street.PREFLOP, amount=48, player=third)
+    )
+    assert table.is_round_complete
+
+    table.deal_flop()
+    assert len(table.community_cards) == 3
+    assert table.current_street == Street.FLOP
+
+    for _ in range(4):
+        table.undo_action()
+    assert _snapshot(table) == start
+    assert table.legal_actions.call_amount == 2
+
+    for _ in range(3):
+        table.undo_action()
+    assert _snapshot(table) == before_deal
+
+    with pytest.raises(IndexError):
+        table.undo_action()
+
+
+def _action(table, action_type, amount=0):
+    return Action(
+        type=action_type,
+        street=table.current_street,
+        amount=amount,
+        player=table.players[table.current_player_index],
+    )
+
+
+def _three_handed(chips=(1000, 1000, 1000)):
+    table = Table(
+        players=[
+            Player(name=f"Player {i + 1}", chips=stack) for i, stack in enumerate(chips)
+        ]
+    )
+    table.reset()
+    table.dealer_index = 0
+    table.deal_hands()
+    table.post_blinds()
+    return table
+
+
+def test_betting_round_closes():
+    table = _three_handed()
+    assert table.pot == 3
+    assert table.current_bet == 2
+    assert table.current_player_index == 0  # first to act after the big blind
+
+    table.apply_action(_action(table, ActionType.CALL, 2))
+    table.apply_action(_action(table, ActionType.CALL, 1))
+    assert not table.is_round_complete  # big blind has the option
+    assert table.current_player_index == 2
+    table.apply_action(_action(table, ActionType.CHECK))
+    assert table.is_round_complete
+
+    table.deal_flop()
+    assert table.current_bet == 0
+    assert table.current_player_index == 1  # first live seat after the dealer
+    table.apply_action(_action(table, ActionType.BET, 4))
+    table.apply_action(_action(table, ActionType.RAISE, 12))
+    assert table.current_bet == 12
+    assert table.min_raise == 8
+    # The raise reopens the action for the original bettor
+    table.apply_action(_action(table, ActionType.FOLD))
+    assert table.current_player_index == 1
+    table.apply_action(_action(table, ActionType.CALL, 8))
+    assert table.is_round_complete
+    assert table.num_live == 2
+
+
+def test_fold_ends_hand_early():
+    table = _three_handed()
+    table.apply_action(_action(table, ActionType.FOLD))
+    assert not table.is_hand_over
+    table.apply_action(_action(table, ActionType.FOLD))
+    assert table.is_hand_over
+    assert table.is_round_complete
+    assert table.is_live(2)
+
+
+def test_all_in_player_is_skipped():
+    table = _three_handed(chips=(1000, 1000, 10))
+    table.apply_action(_action(table, ActionType.RAISE, 20))
+    table.apply_action(_action(table, ActionType.CALL, 19))
+    table.apply_action(_action(table, ActionType.CALL, 8))
+    assert table.is_all_in(2)
+    assert table.is_round_complete
+
+    table.deal_flop()
+    table.apply_action(_action(table, ActionType.CHECK))
+    # The all-in big blind never comes up to act
+    assert table.current_player_index == 0
+
+
+def test_legal_actions():
+    table = _three_handed(chips=(1000, 1000, 10))
+    legal = table.legal_actions
+    assert legal.can_fold and not legal.can_check
+    assert legal.call_amount == 2
+    assert (legal.min_raise, legal.max_raise) == (4, 1000)
+
+    assert not table.validate_action(_action(table, ActionType.CHECK))
+    assert not table.validate_action(_action(table, ActionType.CALL, 3))
+    assert not table.validate_action(_action(table, ActionType.RAISE, 3))
+    assert not table.validate_action(_action(table, ActionType.BET, 10))
+    assert table.validate_action(_action(table, ActionType.RAISE, 4))
+
+    wrong_player = Action(
+        type=ActionType.CALL,
+        street=Street.PREFLOP,
+        amount=2,
+        player=table.players[1],
+    )
+    assert not table.validate_action(wrong_player)
+    with pytest.raises(ValueError):
+        table.apply_action(wrong_player)
+
+    table.apply_action(_action(table, ActionType.RAISE, 100))
+    # The small blind must at least match the 98 chip raise
+    assert table.legal_actions.call_amount == 99
+    assert table.legal_actions.min_raise == 197
+    table.apply_action(_action(table, ActionType.CALL, 99))
+
+    # The short big blind can only call all-in
+    legal = table.legal_actions
+    assert legal.call_amount == 8
+    assert not legal.can_raise
+
+    table.apply_action(_action(table, ActionType.CALL, 8))
+    assert table.legal_actions == NO_LEGAL_ACTIONS
+
+
+def test_short_all_in_does_not_reopen_raising():
+    table = _three_handed(chips=(1000, 1000, 27))
+    table.apply_action(_action(table, ActionType.RAISE, 20))
+    table.apply_action(_action(table, ActionType.CALL, 19))
+    # All-in for 7 more than the 20 chip bet, short of an 18 chip raise
+    table.apply_action(_action(table, ActionType.RAISE, 25))
+    assert table.is_all_in(2)
+    assert table.current_bet == 27
+    assert table.min_raise == 18
+
+    # The players who have acted must call or fold but cannot raise again
+    assert table.current_player_index == 0
+    legal = table.legal_actions
+    assert legal.call_amount == 7
+    assert not legal.can_raise
+    assert not table.validate_action(_action(table, ActionType.RAISE, 50))
+    table.apply_action(_action(table, ActionType.CALL, 7))
+    assert not table.legal_actions.can_raise
+    table.apply_action(_action(table, ActionType.CALL, 7))
+    assert table.is_round_complete
+
+    # A full raise reopens the raising
+    table = _three_handed()
+    table.apply_action(_action(table, ActionType.RAISE, 20))
+    table.apply_action(_action(table, ActionType.CALL, 19))
+    table.apply_action(_action(table, ActionType.RAISE, 38))
+    assert table.legal_actions.can_raise
+    assert table.legal_actions.min_raise == 40
+
+
+def test_reset_without_shuffle():
+    table = _three_handed()
+    table.reset(dealer_index=1, shuffle=False)
+    assert table.dealer_index == 1
+    assert [card.to_int() for card in table.deck.cards] == list(range(52))
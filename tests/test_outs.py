@@ -0,0 +1,108 @@
+import pytest
+
+from holdem.lookup import (
+    FLUSH,
+    FULL_HOUSE,
+    HIGH_CARD,
+    PAIR,
+    STRAIGHT,
+    STRAIGHT_FLUSH,
+    THREE_OF_A_KIND,
+    evaluate,
+    hand_type,
+    parse_cards,
+)
+from holdem.outs import (
+    DOUBLE_GUTSHOT,
+    FLUSH_DRAW,
+    GUTSHOT,
+    OPEN_ENDED,
+    OVERCARDS,
+    find_outs,
+)
+
+
+def _outs(hole, board):
+    return find_outs(parse_cards(hole), parse_cards(board))
+
+
+def test_flush_draw_with_overcards():
+    outs = _outs("AhKh", "Qh7h2c")
+    assert outs.draws == [FLUSH_DRAW, OVERCARDS]
+    assert len(outs.by_type[FLUSH]) == 9
+    assert len(outs.by_type[PAIR]) == 6
+    assert outs.count == 15
+    assert outs.probability == pytest.approx(1 - (32 * 31) / (47 * 46))
+
+
+def test_straight_draws():
+    open_ended = _outs("9h8h", "7c6d2s")
+    assert OPEN_ENDED in open_ended.draws
+    assert len(open_ended.by_type[STRAIGHT]) == 8
+
+    gutshot = _outs("9h8c", "Jd7s2s")
+    assert gutshot.draws == [GUTSHOT]
+    assert sorted(gutshot.by_type[STRAIGHT]) == parse_cards("Ts Th Td Tc")
+
+    double_gutshot = _outs("9h7c", "5d3s6c")
+    assert DOUBLE_GUTSHOT in double_gutshot.draws
+    assert OPEN_ENDED not in double_gutshot.draws
+    assert len(double_gutshot.by_type[STRAIGHT]) == 8
+
+
+def test_full_house_outs_pair_the_board():
+    # A third king makes kings full of sevens
+    outs = _outs("7h7d", "KsKd2c")
+    assert outs.by_type == {FULL_HOUSE: parse_cards("7s 7c Kh Kc")}
+
+
+def test_straight_flush_outs_are_their_own_type():
+    outs = _outs("9h8h", "7h6h2c")
+    assert outs.by_type[STRAIGHT_FLUSH] == parse_cards("5h Th")
+    assert not set(outs.by_type[STRAIGHT_FLUSH]) & set(outs.by_type[FLUSH])
+    assert len(outs.by_type[FLUSH]) == 7
+
+    # A made flush still draws to the straight flush
+    made = _outs("9h8h", "7h6h2h")
+    assert made.by_type == {STRAIGHT_FLUSH: parse_cards("5h Th")}
+
+
+def test_board_straight_is_not_an_out():
+    # Any nine makes a straight for everyone on this board
+    outs = _outs("2h2d", "8c7d6s5h")
+    assert STRAIGHT not in outs.by_type
+
+
+def test_set_draw_and_turn_probability():
+    outs = _outs("7h7d", "Ac9s2d4c")
+    assert outs.by_type == {THREE_OF_A_KIND: parse_cards("7s 7c")}
+    assert outs.probability == pytest.approx(2 / 46)
+
+
+def test_made_hand_outs_improve():
+    for hole, board in [
+        ("AhKh", "Qh7h2c"),
+        ("7h7d", "7c9s2d"),
+        ("9h8c", "Jd7s2s"),
+        ("7h7d", "KsKd2c"),
+        ("9h8h", "7h6h2c"),
+    ]:
+        hole, board = parse_cards(hole), parse_cards(board)
+        current = evaluate(hole + board)
+        outs = find_outs(hole, board)
+        for hand, cards in outs.by_type.items():
+            for card in cards:
+                score = evaluate(hole + board + [card])
+                assert score > current
+                assert hand_type(score) >= hand
+
+
+def test_no_outs_for_made_straight():
+    outs = _outs("9h8h", "7c6d5s")
+    assert outs.by_type.get(STRAIGHT) is None
+    assert hand_type(evaluate(parse_cards("9h8h7c6d5s"))) > HIGH_CARD
+
+
+def test_invalid_board():
+    with pytest.raises(ValueError):
+        _outs("AhKh", "Qh7h")
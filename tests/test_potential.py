@@ -0,0 +1,66 @@
+import itertools
+
+import pytest
+
+from holdem.lookup import evaluate, parse_cards
+from holdem.potential import hand_potential
+
+
+def _brute_force(hole_cards, board):
+    deck = [card for card in range(52) if card not in hole_cards + board]
+    now_counts = [0, 0, 0]
+    counts = [[0, 0, 0] for _ in range(3)]
+
+    def compare(ours, theirs):
+        return 0 if ours > theirs else 1 if ours == theirs else 2
+
+    for opponent in itertools.combinations(deck, 2):
+        now = compare(evaluate(hole_cards + board), evaluate(list(opponent) + board))
+        now_counts[now] += 1
+        rest = [card for card in deck if card not in opponent]
+        for runout in itertools.combinations(rest, 5 - len(board)):
+            river_board = board + list(runout)
+            river = compare(
+                evaluate(hole_cards + river_board),
+                evaluate(list(opponent) + river_board),
+            )
+            counts[now][river] += 1
+
+    totals = [sum(row) for row in counts]
+    hand_strength = (now_counts[0] + now_counts[1] / 2) / sum(now_counts)
+    positive = (counts[2][0] + counts[2][1] / 2 + counts[1][0] / 2) / (
+        totals[2] + totals[1] / 2
+    )
+    negative = (counts[0][2] + counts[1][2] / 2 + counts[0][1] / 2) / (
+        totals[0] + totals[1] / 2
+    )
+    return hand_strength, positive, negative
+
+
+def test_billings_example():
+    # The flop example from Billings et al.: HS .585, PPOT .208 and NPOT .274
+    potential = hand_potential(parse_cards("AdQc"), parse_cards("3h4cJh"))
+    assert potential.hand_strength == pytest.approx(0.585, abs=0.001)
+    assert potential.negative_potential == pytest.approx(0.274, abs=0.001)
+    assert potential.positive_potential == pytest.approx(0.208, abs=0.001)
+
+
+@pytest.mark.parametrize("hole, board", [("AhKh", "Qh7h2c3s"), ("7c7d", "8s9sTd2h")])
+def test_turn_matches_brute_force(hole, board):
+    hole_cards = parse_cards(hole)
+    board_cards = parse_cards(board)
+    assert tuple(hand_potential(hole_cards, board_cards)) == pytest.approx(
+        _brute_force(hole_cards, board_cards)
+    )
+
+
+def test_effective_strength():
+    nuts = hand_potential(parse_cards("AsKs"), parse_cards("QsJsTs"))
+    assert nuts.hand_strength == 1
+    assert nuts.negative_potential == 0
+    assert nuts.effective_strength == 1
+
+
+def test_invalid_board():
+    with pytest.raises(ValueError):
+        hand_potential(parse_cards("AsKs"), parse_cards("QsJsTs2c3c"))
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from holdem.lookup import parse_cards
+from holdem.ranges import COMBOS, NUM_COMBOS, Range, combo_index
+
+
+def test_combo_index():
+    assert NUM_COMBOS == 1326
+    assert len({tuple(combo) for combo in COMBOS.tolist()}) == NUM_COMBOS
+    for index in (0, 100, 1325):
+        low, high = COMBOS[index]
+        assert combo_index([low, high]) == index
+        assert combo_index([high, low]) == index
+    with pytest.raises(ValueError):
+        combo_index(parse_cards("AsAs"))
+
+
+@pytest.mark.parametrize(
+    "text, count",
+    [
+        ("AA", 6),
+        ("QQ+", 18),
+        ("AKs", 4),
+        ("AKo", 12),
+        ("AK", 16),
+        ("T9s", 4),
+        ("QQ+, AKs, T9s", 26),
+        ("A2s+", 48),
+        ("KTo+", 36),
+        ("JJ-88", 24),
+        ("A5s-A2s", 16),
+        ("AsKs", 1),
+    ],
+)
+def test_parse_counts(text, count):
+    assert len(Range.parse(text)) == count
+
+
+def test_parse_weights():
+    hand_range = Range.parse("AKs, AKo:0.25")
+    assert hand_range.num_combos == pytest.approx(4 + 12 * 0.25)
+    assert hand_range.weights[combo_index(parse_cards("AsKs"))] == 1
+    assert hand_range.weights[combo_index(parse_cards("AsKd"))] == 0.25
+
+
+def test_parse_errors():
+    with pytest.raises(ValueError):
+        Range.parse("AAs")
+    with pytest.raises(ValueError):
+        Range.parse("AX")
+    with pytest.raises(ValueError):
+        Range.parse("AsAs")
+
+
+def test_parse_lowercase():
+    assert np.array_equal(
+        Range.parse("qq+, aks, t9o, a5s-a2s").weights,
+        Range.parse("QQ+, AKs, T9o, A5s-A2s").weights,
+    )
+    assert len(Range.parse("AKS")) == 4
+
+
+def test_without():
+    hand_range = Range.parse("AA, KK").without(parse_cards("As"))
+    assert len(hand_range) == 9
+    assert np.all(Range.full().without(parse_cards("AsKd")).weights.sum() == 1225)
@@ -0,0 +1,98 @@
+import pytest
+
+from holdem.agents import RandomAgent
+from holdem.engine import HoldemEngine
+from holdem.models import Deck, Table
+from holdem.replay import (
+    HandRecord,
+    Replayer,
+    ReplayError,
+    final_stacks,
+    read_records,
+    write_records,
+)
+from holdem.rng import HandStream
+
+
+@pytest.fixture(scope="module")
+def records():
+    players = [RandomAgent(name=f"Player {i}", chips=100) for i in range(4)]
+    stream = HandStream(3, 0)
+    table = Table(players=players, deck=Deck(rng=stream), rng=stream.rng)
+    engine = HoldemEngine(table=table)
+    table.reset()
+    records = []
+    for _ in range(200):
+        for player in players:
+            if player.chips <= 0:
+                player.chips = 100
+        stacks = [player.chips for player in players]
+        table.next_hand()
+        engine.run_hand()
+        records.append(HandRecord.from_table(table, stacks))
+    return records
+
+
+def test_replay_reproduces_results(records):
+    assert Replayer().verify_all(records) == []
+    assert Replayer().verify_all(records, validate=True) == []
+    # Some hands are decided by folds and some go to showdown
+    assert any(len(record.board) == 5 for record in records)
+    assert any(len(record.board) < 5 for record in records)
+
+
+def test_archive_round_trip(records, tmp_path):
+    path = tmp_path / "hands.jsonl"
+    write_records(path, records)
+    assert list(read_records(path)) == records
+
+
+def test_final_stacks_match_the_table(records):
+    replayer = Replayer()
+    for record in records:
+        table = replayer.replay(record)
+        assert final_stacks(record) == [player.chips for player in table.players]
+
+
+def test_altered_results_fail(records):
+    record = records[0]
+    results = list(record.results)
+    results[0] += 1
+    altered = record._replace(results=tuple(results))
+    assert not Replayer().verify(altered)
+    assert not Replayer().verify(altered, validate=True)
+
+
+def test_final_stacks_rejects_impossible_records(records):
+    record = next(record for record in records if record.actions)
+    seat, street, _, _ = record.actions[0]
+    too_much = ((seat, street, "raise", 10**6),) + record.actions[1:]
+    with pytest.raises(ReplayError):
+        final_stacks(record._replace(actions=too_much))
+
+    after_folding = ((seat, street, "fold", 0), (seat, street, "check", 0))
+    with pytest.raises(ReplayError):
+        final_stacks(record._replace(actions=after_folding + record.actions[1:]))
+
+    showdown = next(
+        record for record in records if Replayer().replay(record).num_live > 1
+    )
+    with pytest.raises(ReplayError):
+        final_stacks(showdown._replace(board=showdown.board[:3]))
+
+
+def test_illegal_action_raises(records):
+    record = next(record for record in records if record.actions)
+    seat, street, _, _ = record.actions[0]
+    actions = ((seat, street, "raise", 10**6),) + record.actions[1:]
+    with pytest.raises(ReplayError):
+        Replayer().replay(record._replace(actions=actions))
+
+    actions = ((seat, "river") + record.actions[0][2:],) + record.actions[1:]
+    with pytest.raises(ReplayError):
+        Replayer().replay(record._replace(actions=actions))
+
+    other = (seat + 1) % len(record.stacks)
+    actions = ((other,) + record.actions[0][1:],) + record.actions[1:]
+    with pytest.raises(ReplayError):
+        Replayer().replay(record._replace(actions=actions))
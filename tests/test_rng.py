@@ -0,0 +1,110 @@
+import numpy as np
+
+from holdem.agents import RandomAgent
+from holdem.engine import HoldemEngine
+from holdem.models import Card, Deck, Table
+from holdem.rng import (
+    HANDS_PER_BLOCK,
+    HandId,
+    HandStream,
+    deck_order,
+    hand_rng,
+    permutations,
+    table_rng,
+    worker_rng,
+)
+
+
+def test_permutations():
+    block = permutations(1, 0, 0)
+    assert block.shape == (HANDS_PER_BLOCK, 52)
+    assert (np.sort(block, axis=1) == np.arange(52)).all()
+    assert np.array_equal(block, permutations(1, 0, 0))
+    assert not np.array_equal(block, permutations(1, 1, 0))
+    assert not np.array_equal(block, permutations(1, 0, 1))
+    assert not np.array_equal(block, permutations(2, 0, 0))
+
+
+def test_hand_stream_matches_hand_ids():
+    stream = HandStream(seed=3, table=5, first_hand=HANDS_PER_BLOCK - 1)
+    for _ in range(3):
+        deck = Deck()
+        stream.shuffle(deck.cards)
+        expected = deck_order(stream.hand_id)
+        assert [card.to_int() for card in deck.cards] == expected.tolist()
+    assert stream.hand_id == HandId(3, 5, HANDS_PER_BLOCK + 1)
+
+
+def test_streams_are_independent():
+    assert table_rng(0, 0).random() == table_rng(0, 0).random()
+    assert table_rng(0, 0).random() != table_rng(0, 1).random()
+    assert table_rng(0, 0).random() != worker_rng(0, 0).random()
+
+
+def _table(seed):
+    players = [RandomAgent(name=f"Player {i}", chips=100) for i in range(3)]
+    stream = HandStream(seed, table=0)
+    return Table(players=players, deck=Deck(rng=stream), rng=stream.rng)
+
+
+def test_seeded_tables_replay():
+    results = []
+    for _ in range(2):
+        table = _table(seed=11)
+        engine = HoldemEngine(table=table)
+        table.reset()
+        for _ in range(5):
+            engine.run_hand()
+            table.next_hand()
+        results.append([player.chips for player in table.players])
+    assert results[0] == results[1]
+
+
+def test_hand_replays_from_id():
+    table = _table(seed=4)
+    table.reset()
+    table.next_hand()
+    table.deal_hands()
+    hand_id = table.deck.rng.hand_id
+    assert hand_id == HandId(4, 0, 1)
+
+    # Dealing the regenerated deck gives every seat the same cards
+    replay = Table(players=[RandomAgent(name=p.name, chips=100) for p in table.players])
+    replay.deck.cards = [Card.from_int(int(card)) for card in deck_order(hand_id)]
+    replay.deal_hands()
+    assert [p.hand for p in replay.players] == [p.hand for p in table.players]
+
+
+def test_hand_stream_moves_rng_to_each_hand():
+    stream = HandStream(seed=2, table=1)
+    assert stream.rng.random() == table_rng(2, 1).random()
+    for hand in range(3):
+        stream.shuffle(list(range(52)))
+        assert stream.rng.random() == hand_rng(HandId(2, 1, hand)).random()
+
+
+def test_hand_replays_alone_from_id():
+    table = _table(seed=7)
+    engine = HoldemEngine(table=table)
+    table.reset()
+    for _ in range(4):
+        engine.run_hand()
+        table.next_hand()
+    # Hand 4 as it is played after the four before it
+    stacks = [player.chips for player in table.players]
+    dealer = table.dealer_index
+    hand_id = table.deck.rng.hand_id
+    engine.run_hand()
+    played = [(a.player.name, a.type, a.amount) for a in table.action_history]
+
+    # Only its id, the stacks and the button are needed to play it again
+    players = [
+        RandomAgent(name=p.name, chips=chips) for p, chips in zip(table.players, stacks)
+    ]
+    replay = Table(players=players)
+    replay.reset(dealer_index=dealer)
+    replay.deck.cards = [Card.from_int(int(card)) for card in deck_order(hand_id)]
+    replay.rng = hand_rng(hand_id)
+    HoldemEngine(table=replay).run_hand()
+    assert [(a.player.name, a.type, a.amount) for a in replay.action_history] == played
+    assert [p.chips for p in replay.players] == [p.chips for p in table.players]
@@ -0,0 +1,77 @@
+import multiprocessing
+import os
+
+import numpy as np
+import pytest
+
+from holdem import lookup
+from holdem.shared import SharedArrays
+
+
+def test_round_trip(tmp_path):
+    arrays = {
+        "keys": np.arange(10, dtype=np.int64),
+        "table": np.arange(12, dtype=np.float32).reshape(3, 4),
+        "empty": np.zeros(0, dtype=np.int32),
+    }
+    shared = SharedArrays.create(arrays, str(tmp_path / "tables"))
+    attached = SharedArrays.attach(shared.path)
+    assert sorted(attached) == sorted(arrays)
+    for key, array in arrays.items():
+        assert attached[key].dtype == array.dtype
+        np.testing.assert_array_equal(attached[key], array)
+    with pytest.raises(ValueError):
+        attached["keys"][0] = 1
+
+    shared.unlink()
+    # Mapped arrays outlive the file
+    assert attached["table"].sum() == 66
+    with pytest.raises(FileNotFoundError):
+        SharedArrays.attach(shared.path)
+
+
+def _worker_tables(_):
+    shared = lookup.shared_tables()
+    return (
+        shared is not None,
+        lookup.evaluate([48, 44, 40, 36, 32]),
+        float(shared["equity"].sum()),
+    )
+
+
+def test_workers_attach():
+    with lookup.published_tables({"equity": np.ones((4, 4))}):
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(2) as pool:
+            results = pool.map(_worker_tables, range(2))
+    royal_flush = lookup.evaluate([48, 44, 40, 36, 32])
+    assert results == [(True, royal_flush, 16.0)] * 2
+
+
+def test_published_tables_are_cleaned_up(monkeypatch):
+    monkeypatch.setenv(lookup.SHARED_TABLES_VARIABLE, "/previous")
+    with lookup.published_tables() as shared:
+        assert os.environ[lookup.SHARED_TABLES_VARIABLE] == shared.path
+        assert SharedArrays.attach(shared.path)["rank_keys"].size
+    assert os.environ[lookup.SHARED_TABLES_VARIABLE] == "/previous"
+    assert not os.path.exists(shared.path)
+
+
+def _tables_path(_):
+    shared = lookup.shared_tables()
+    return shared.path if shared is not None else None, lookup.evaluate(
+        [48, 44, 40, 36, 32]
+    )
+
+
+def test_initializer_attaches_published_tables():
+    with lookup.published_tables() as shared:
+        # As if the worker had imported the module before publication
+        del os.environ[lookup.SHARED_TABLES_VARIABLE]
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(
+            1, initializer=lookup.attach_tables, initargs=(shared.path,)
+        ) as pool:
+            path, score = pool.apply(_tables_path, (0,))
+    assert path == shared.path
+    assert score == lookup.evaluate([48, 44, 40, 36, 32])
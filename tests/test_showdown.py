@@ -0,0 +1,97 @@
+from holdem.models import Card, Player, Rank, Suit, Table
+from holdem.showdown import Pot, build_pots, settle
+
+
+def test_single_pot():
+    pots = build_pots([10, 10, 10], [True, True, True])
+    assert pots == [Pot(30, [0, 1, 2])]
+
+
+def test_side_pots():
+    # Seat 0 is all-in for 10, seat 1 for 40, seat 2 covers and seat 3 folded
+    pots = build_pots([10, 40, 100, 20], [True, True, True, False])
+    assert pots == [
+        Pot(40, [0, 1, 2]),
+        Pot(70, [1, 2]),
+        Pot(60, [2]),
+    ]
+    assert sum(pot.amount for pot in pots) == 170
+
+
+def test_folded_money_merges_into_pot():
+    pots = build_pots([5, 30, 30], [False, True, True])
+    assert pots == [Pot(65, [1, 2])]
+
+
+def _table(hands, board, contributions, folded=()):
+    players = []
+    for i, (hand, contributed) in enumerate(zip(hands, contributions)):
+        player = Player(name=f"Player {i + 1}", chips=0)
+        player.hand = hand
+        player.contributed = contributed
+        player.is_folded = i in folded
+        players.append(player)
+    table = Table(players=players, community_cards=board)
+    table.pot = sum(contributions)
+    return table
+
+
+def _cards(*cards):
+    return [Card(rank=rank, suit=suit) for rank, suit in cards]
+
+
+BOARD = _cards(
+    (Rank.TWO, Suit.CLUBS),
+    (Rank.SEVEN, Suit.DIAMONDS),
+    (Rank.NINE, Suit.HEARTS),
+    (Rank.JACK, Suit.SPADES),
+    (Rank.THREE, Suit.CLUBS),
+)
+
+
+def test_settle_side_pots():
+    table = _table(
+        [
+            _cards((Rank.ACE, Suit.SPADES), (Rank.ACE, Suit.HEARTS)),
+            _cards((Rank.KING, Suit.SPADES), (Rank.KING, Suit.HEARTS)),
+            _cards((Rank.QUEEN, Suit.SPADES), (Rank.QUEEN, Suit.HEARTS)),
+        ],
+        BOARD,
+        [10, 50, 100],
+    )
+    awards = settle(table)
+    # Aces win the main pot, kings win the side pot and the queens
+    # only get their uncalled chips back
+    assert awards == {0: 30, 1: 80, 2: 50}
+    assert [player.chips for player in table.players] == [30, 80, 50]
+    assert table.pot == 0
+
+
+def test_settle_split_pot_odd_chip():
+    table = _table(
+        [
+            _cards((Rank.ACE, Suit.SPADES), (Rank.TWO, Suit.HEARTS)),
+            _cards((Rank.ACE, Suit.HEARTS), (Rank.TWO, Suit.SPADES)),
+            _cards((Rank.THREE, Suit.SPADES), (Rank.FOUR, Suit.HEARTS)),
+        ],
+        BOARD,
+        [10, 10, 5],
+        folded=(2,),
+    )
+    table.dealer_index = 0
+    awards = settle(table)
+    # The odd chip goes to the first winner left of the dealer
+    assert awards == {1: 13, 0: 12}
+
+
+def test_settle_uncontested():
+    table = _table(
+        [
+            _cards((Rank.TWO, Suit.SPADES), (Rank.THREE, Suit.HEARTS)),
+            _cards((Rank.ACE, Suit.HEARTS), (Rank.ACE, Suit.SPADES)),
+        ],
+        [],
+        [8, 4],
+        folded=(1,),
+    )
+    assert settle(table) == {0: 12}
@@ -0,0 +1,110 @@
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+
+import pytest
+from loguru import logger
+
+import holdem
+from holdem import lookup
+from holdem.agents import RandomAgent
+from holdem.engine import HoldemEngine
+from holdem.models import Table
+from holdem.rng import HandStream
+from holdem.simulation import load_agent, simulate
+
+RANDOM = "holdem.agents:RandomAgent"
+
+
+def test_load_agent():
+    assert load_agent(RANDOM) is RandomAgent
+    assert load_agent("holdem.agents.RandomAgent") is RandomAgent
+    for path in ("RandomAgent", "holdem.models:Table", "holdem.agents:Missing"):
+        with pytest.raises(ValueError):
+            load_agent(path)
+
+
+def test_simulate():
+    result = simulate([RANDOM], 300, num_players=3, seed=1, num_workers=0)
+    assert result.hands == 300
+    assert result.evaluations > 0
+    assert result.hands_per_second > 0
+    (agent,) = result.agents
+    assert agent.hands == 900
+    # Every chip won is lost by another seat of the same agent, in every hand
+    assert agent.bb_per_100 == pytest.approx(0)
+    assert agent.std_error == pytest.approx(0)
+
+    again = simulate([RANDOM], 300, num_players=3, seed=1, num_workers=0)
+    assert again.agents == result.agents
+    assert again.evaluations == result.evaluations
+
+
+def test_workers_play_the_same_hands():
+    agents = [RANDOM, "holdem.agents.RandomAgent"]
+    local = simulate(agents, 1500, seed=2, num_workers=0)
+    pooled = simulate(agents, 1500, seed=2, num_workers=2)
+    assert pooled.agents == local.agents
+    assert pooled.evaluations == local.evaluations
+    assert local.agents[0].bb_per_100 == pytest.approx(-local.agents[1].bb_per_100)
+
+    with pytest.raises(ValueError):
+        simulate([RANDOM], 10, num_players=1)
+
+
+def test_every_deck_is_played(monkeypatch):
+    shuffles = []
+    shuffle = HandStream.shuffle
+
+    def counted(self, cards):
+        shuffles.append(self.next_hand)
+        shuffle(self, cards)
+
+    monkeypatch.setattr(HandStream, "shuffle", counted)
+    simulate([RANDOM], 20, num_players=2, num_workers=0)
+    assert shuffles == list(range(20))
+
+
+def test_logging_is_left_to_the_caller():
+    messages = []
+    sink = logger.add(messages.append)
+    logger.disable("holdem")
+    try:
+        simulate([RANDOM], 5, num_players=2, num_workers=0)
+        players = [RandomAgent(name=f"Player {i}", chips=100) for i in range(2)]
+        HoldemEngine(table=Table(players=players)).run()
+    finally:
+        logger.enable("holdem")
+        logger.remove(sink)
+    assert messages == []
+
+
+def test_spawned_workers_attach_the_tables(tmp_path, monkeypatch):
+    # A worker that built its own tables would write them to this cache
+    monkeypatch.setenv(lookup.CACHE_DIR_VARIABLE, str(tmp_path))
+    spawn = multiprocessing.get_context("spawn")
+    monkeypatch.setattr(multiprocessing, "get_context", lambda method=None: spawn)
+    local = simulate([RANDOM], 1500, num_players=2, seed=4, num_workers=0)
+    pooled = simulate([RANDOM], 1500, num_players=2, seed=4, num_workers=2)
+    assert pooled.agents == local.agents
+    assert list(tmp_path.iterdir()) == []
+    # Published tables are cleaned up
+    assert lookup.SHARED_TABLES_VARIABLE not in os.environ
+
+
+def test_cli():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(holdem.__file__)))
+    output = subprocess.run(
+        [sys.executable, "main.py", "--hands", "50", "--workers", "0"]
+        + ["--format", "json", "--seed", "3"],
+        cwd=root,
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    report = json.loads(output)
+    assert report["hands"] == 50
+    assert report["agents"][0]["hands"] == 100
+    assert report["hands_per_second"] > 0
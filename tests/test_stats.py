@@ -0,0 +1,86 @@
+import pickle
+
+import pytest
+
+from holdem.agents import RandomAgent
+from holdem.engine import HoldemEngine
+from holdem.models import Deck, Table
+from holdem.replay import HandRecord
+from holdem.rng import HandStream
+from holdem.stats import StatsAggregator
+
+
+def test_add_hand():
+    stats = StatsAggregator()
+    # Seat 0 raises, seat 1 calls, seat 2 folds; seat 0 bets the flop and
+    # seat 1 calls down to a showdown that seat 0 wins
+    stats.add_hand(
+        ["A", "B", "C"],
+        [True, True, True],
+        [
+            (0, "preflop", "raise"),
+            (1, "preflop", "call"),
+            (2, "preflop", "fold"),
+            (0, "flop", "bet"),
+            (1, "flop", "call"),
+            (0, "turn", "check"),
+            (1, "turn", "check"),
+            (0, "river", "bet"),
+            (1, "river", "call"),
+        ],
+        5,
+        [20, -18, -2],
+        2,
+    )
+    a, b, c = (stats.stats()[name] for name in "ABC")
+    assert (a.hands, a.vpip, a.pfr, a.aggression, a.wtsd) == (1, 1, 1, float("inf"), 1)
+    assert (b.vpip, b.pfr, b.aggression, b.wtsd) == (1, 0, 0, 1)
+    assert (c.vpip, c.pfr, c.wtsd) == (0, 0, 0)
+    assert a.bb_per_100 == 1000
+    assert c.bb_per_100 == -100
+
+
+@pytest.fixture(scope="module")
+def hands():
+    players = [RandomAgent(name=f"Player {i}", chips=100) for i in range(3)]
+    stream = HandStream(5, 0)
+    table = Table(players=players, deck=Deck(rng=stream), rng=stream.rng)
+    engine = HoldemEngine(table=table)
+    table.reset()
+    aggregator = StatsAggregator()
+    records = []
+    for _ in range(300):
+        for player in players:
+            if player.chips <= 0:
+                player.chips = 100
+        stacks = [player.chips for player in players]
+        table.next_hand()
+        engine.run_hand()
+        aggregator.add_table(table, stacks)
+        records.append(HandRecord.from_table(table, stacks))
+    return [player.name for player in players], records, aggregator
+
+
+def test_records_match_table(hands):
+    names, records, from_table = hands
+    from_records = StatsAggregator()
+    for record in records:
+        from_records.add_record(record, names)
+    assert from_records.stats() == from_table.stats()
+
+    stats = from_table.stats()["Player 0"]
+    assert stats.hands == 300
+    assert 0 < stats.pfr < stats.vpip < 1
+    assert 0 < stats.wtsd < 1
+    assert sum(s.bb_per_100 for s in from_table.stats().values()) == pytest.approx(0)
+
+
+def test_merge(hands):
+    names, records, whole = hands
+    parts = [StatsAggregator(), StatsAggregator()]
+    for index, record in enumerate(records):
+        parts[index % 2].add_record(record, names)
+    # Partial aggregates travel between processes by pickling
+    merged = pickle.loads(pickle.dumps(parts[0])).merge(parts[1])
+    for name, stats in whole.stats().items():
+        assert merged.stats()[name] == pytest.approx(stats)
@@ -0,0 +1,54 @@
+import pytest
+
+from holdem.lookup import evaluate, parse_cards
+from holdem.strength import BoardIndex, _cached_index, board_index, hand_percentile
+
+
+def _brute_force(hole_cards, board):
+    score = evaluate(hole_cards + board)
+    dead = set(hole_cards) | set(board)
+    deck = [card for card in range(52) if card not in dead]
+    beaten = tied = total = 0
+    for i, first in enumerate(deck):
+        for second in deck[i + 1 :]:
+            other = evaluate([first, second] + board)
+            beaten += other < score
+            tied += other == score
+            total += 1
+    return beaten, tied, total
+
+
+@pytest.mark.parametrize(
+    "hole, board",
+    [
+        ("AsKs", "QsJsTs2d3c"),
+        ("7h2c", "AdKdQc9s8s"),
+        ("9c9d", "9h5c5d2s2h"),
+        ("AhQh", "KhJh4h4c4d"),
+    ],
+)
+def test_count_matches_brute_force(hole, board):
+    hole_cards = parse_cards(hole)
+    board_cards = parse_cards(board)
+    index = BoardIndex(board_cards)
+    assert index.num_holdings == 1081
+    assert index.count(hole_cards) == _brute_force(hole_cards, board_cards)
+
+
+def test_percentile_bounds():
+    board = parse_cards("QsJsTs2d3c")
+    assert hand_percentile(parse_cards("AsKs"), board) == 1.0
+    assert 0 <= hand_percentile(parse_cards("4h5h"), board) < 0.5
+
+
+def test_board_index_is_cached_per_board():
+    _cached_index.cache_clear()
+    first = board_index(parse_cards("2c3d4h5s7c"))
+    second = board_index(parse_cards("7c5s4h3d2c"))
+    assert first is second
+    assert _cached_index.cache_info().hits == 1
+
+
+def test_board_index_needs_full_board():
+    with pytest.raises(ValueError):
+        BoardIndex(parse_cards("2c3d4h"))
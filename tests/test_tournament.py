@@ -0,0 +1,144 @@
+import multiprocessing
+
+import pytest
+
+from holdem import lookup
+from holdem.agents import RandomAgent
+from holdem.models import Action, ActionType, Player
+from holdem.tournament import (
+    BlindLevel,
+    Tournament,
+    WorkerError,
+    _LocalWorker,
+    _ProcessWorker,
+)
+
+LEVELS = [
+    BlindLevel(small_blind=5, big_blind=10, hands=20),
+    BlindLevel(small_blind=25, big_blind=50, hands=20),
+    BlindLevel(small_blind=100, big_blind=200, hands=20),
+]
+
+
+def _tournament(num_players, **kwargs):
+    players = [RandomAgent(name=f"Player {i}", chips=500) for i in range(num_players)]
+    return Tournament(players=players, levels=LEVELS, **kwargs)
+
+
+def test_tournament_in_process():
+    tournament = _tournament(20, table_size=6, num_workers=0)
+    places = tournament.run()
+    assert sorted(places) == sorted(player.name for player in tournament.players)
+
+
+def test_tournament_with_workers():
+    tournament = _tournament(30, table_size=9, num_workers=2)
+    places = tournament.run()
+    assert sorted(places) == sorted(player.name for player in tournament.players)
+
+
+def test_blind_levels():
+    tournament = _tournament(2)
+    assert tournament._level(0).big_blind == 10
+    assert tournament._level(20).big_blind == 50
+    assert tournament._level(1000).big_blind == 200
+
+
+def test_balance_breaks_and_moves_only_needed_players():
+    tournament = _tournament(0, table_size=4)
+    worker = _LocalWorker()
+    tables = {0: ["a", "b", "c", "d"], 1: ["e"], 2: ["f", "g", "h", "i"]}
+    owner = {table_id: worker for table_id in tables}
+    for table_id, names in tables.items():
+        players = [Player(name=name, chips=100) for name in names]
+        tournament._call(worker, "seat", table_id, players)
+
+    tournament._balance(tables, owner)
+
+    # Nine players need three tables of four, so nobody is broken, but the
+    # short table is filled from the full ones
+    assert sorted(len(names) for names in tables.values()) == [3, 3, 3]
+    assert set(tables[0]) < {"a", "b", "c", "d"}
+    seated = worker._worker.engines
+    assert {
+        table_id: [player.name for player in engine.table.players]
+        for table_id, engine in seated.items()
+    } == tables
+
+    # Dropping to four players breaks down to one table
+    tables = {0: ["a"], 1: ["e", "d"], 2: ["f"]}
+    for table_id, engine in seated.items():
+        engine.table.players = [
+            player for player in engine.table.players if player.name in tables[table_id]
+        ]
+    tournament._balance(tables, owner)
+    assert len(tables) == 1
+    assert sorted(next(iter(tables.values()))) == ["a", "d", "e", "f"]
+    assert len(seated) == 1
+
+
+def test_seeded_tournament_is_reproducible():
+    in_process = _tournament(20, table_size=6, num_workers=0, seed=5).run()
+    assert _tournament(20, table_size=6, num_workers=0, seed=5).run() == in_process
+    assert _tournament(20, table_size=6, num_workers=2, seed=5).run() == in_process
+    assert _tournament(20, table_size=6, num_workers=3, seed=5).run() == in_process
+
+
+def test_busts_in_one_hand_are_ordered_without_the_workers():
+    worker = _LocalWorker()
+    for table_id in (1, 0):
+        players = [Player(name=f"{table_id}-{seat}", chips=0) for seat in range(2)]
+        players.append(Player(name=f"{table_id}-winner", chips=100))
+        worker.send("seat", table_id, players, 1)
+        worker.receive()
+    worker.send("play", 1, 1, 2)
+    _, busts = worker.receive()
+    assert sorted(bust[:4] for bust in busts) == [
+        (0, 0, 0, 0),
+        (0, 0, 0, 1),
+        (0, 0, 1, 0),
+        (0, 0, 1, 1),
+    ]
+
+
+class IllegalAgent(Player):
+    def make_decision(self, table):
+        return Action(
+            type=ActionType.BET, amount=1, street=table.current_street, player=self
+        )
+
+
+def test_worker_errors_reach_the_parent():
+    players = [IllegalAgent(name=f"Player {i}", chips=500) for i in range(4)]
+    tournament = Tournament(players=players, levels=LEVELS, table_size=2)
+    tournament.num_workers = 2
+    with pytest.raises(ValueError, match="Invalid action") as raised:
+        tournament.run()
+    # The worker's traceback comes along
+    assert isinstance(raised.value.__cause__, WorkerError)
+    assert "apply_action" in str(raised.value.__cause__)
+
+
+def test_dead_worker_is_reported_and_stopped():
+    with lookup.published_tables() as tables:
+        worker = _ProcessWorker(multiprocessing.get_context(), tables.path)
+        worker._process.kill()
+        worker._process.join()
+        with pytest.raises(WorkerError, match="exited"):
+            worker.send("close", 0)
+            worker.receive()
+        worker.stop()
+    assert not worker._process.is_alive()
+
+
+def test_spawned_workers_attach_the_tables(tmp_path, monkeypatch):
+    # A worker that built its own tables would write them to this cache
+    monkeypatch.setenv(lookup.CACHE_DIR_VARIABLE, str(tmp_path))
+    spawn = multiprocessing.get_context("spawn")
+    monkeypatch.setattr(multiprocessing, "get_context", lambda method=None: spawn)
+    players = [RandomAgent(name=f"Player {i}", chips=500) for i in range(4)]
+    tournament = Tournament(
+        players=players, levels=LEVELS, table_size=2, num_workers=2, seed=1
+    )
+    assert len(tournament.run()) == 4
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,91 @@
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from holdem import lookup, variants
+from holdem.lookup import parse_cards
+
+
+def _brute_omaha(hole, board):
+    return max(
+        lookup.evaluate(list(pair) + list(triple))
+        for pair in itertools.combinations(hole, 2)
+        for triple in itertools.combinations(board, 3)
+    )
+
+
+@pytest.mark.parametrize("num_hole,num_board", [(4, 3), (4, 5), (5, 4), (5, 5)])
+def test_omaha_matches_brute_force(num_hole, num_board):
+    rng = random.Random(num_hole * 10 + num_board)
+    hands = np.array([rng.sample(range(52), num_hole + num_board) for _ in range(300)])
+    scores = variants.evaluate_omaha_batch(hands[:, :num_hole], hands[:, num_hole:])
+    for cards, score in zip(hands.tolist(), scores.tolist()):
+        hole, board = cards[:num_hole], cards[num_hole:]
+        assert variants.evaluate_omaha(hole, board) == _brute_omaha(hole, board)
+        assert score == _brute_omaha(hole, board)
+
+
+def test_omaha_uses_exactly_two_hole_cards():
+    # Four spades on the board and one in hand is no flush in Omaha
+    score = variants.evaluate_omaha(
+        parse_cards("As Kd 7c 2h"), parse_cards("Qs Js Ts 3s 8d")
+    )
+    assert lookup.hand_type(score) == lookup.STRAIGHT
+    # Nor does a board straight count without two hole cards in it
+    score = variants.evaluate_omaha(
+        parse_cards("2c 2d 3h 3s"), parse_cards("9s Ts Jd Qc Kh")
+    )
+    assert lookup.hand_type(score) == lookup.PAIR
+
+    with pytest.raises(ValueError):
+        variants.evaluate_omaha(parse_cards("As Kd"), parse_cards("Qs Js Ts"))
+    with pytest.raises(ValueError):
+        variants.evaluate_omaha(parse_cards("As Kd 7c 2h"), parse_cards("Qs Js"))
+
+
+def _short_deck_type(text):
+    return variants.short_deck_hand_type(
+        variants.evaluate_short_deck(parse_cards(text))
+    )
+
+
+def test_short_deck_rankings():
+    assert _short_deck_type("As 6d 7c 8h 9s") == lookup.STRAIGHT
+    assert _short_deck_type("As 6s 7s 8s 9s") == lookup.STRAIGHT_FLUSH
+    assert _short_deck_type("As Ks Qs Js Ts") == lookup.ROYAL_FLUSH
+    # With both on offer, a flush beats a full house and trips beat a straight
+    assert _short_deck_type("Ks Kd Kc 9s 9d 6s Qs") == lookup.FULL_HOUSE
+    assert _short_deck_type("Ks Kd Kc 9s 7s 6s Qs") == lookup.FLUSH
+    assert _short_deck_type("Ts Td Tc 9s 8d 7c 6h") == lookup.THREE_OF_A_KIND
+
+    def score(text):
+        return variants.evaluate_short_deck(parse_cards(text))
+
+    flush = score("As Js 9s 7s 6s")
+    full_house = score("Ks Kd Kc Qs Qd")
+    trips = score("6s 6d 6c 7s 9d")
+    straight = score("Ts Jd Qc Ks Ah")
+    wheel = score("As 6d 7c 8h 9s")
+    assert flush > full_house > trips > straight > wheel
+    assert score("7s 8d 9c Th Js") > wheel
+
+    with pytest.raises(ValueError):
+        variants.evaluate_short_deck(parse_cards("2s 6d 7c 8h 9s"))
+    with pytest.raises(ValueError):
+        variants.evaluate_short_deck(parse_cards("As 6d 7c 8h"))
+    with pytest.raises(ValueError):
+        variants.evaluate_short_deck(parse_cards("As Ks Qs Js Ts 9s 8s 7s"))
+
+
+def test_short_deck_batch():
+    rng = random.Random(3)
+    hands = np.array([rng.sample(range(16, 52), 7) for _ in range(500)])
+    expected = [variants.evaluate_short_deck(cards) for cards in hands.tolist()]
+    assert variants.evaluate_short_deck_batch(hands).tolist() == expected
+
+    with pytest.raises(ValueError):
+        variants.evaluate_short_deck_batch(np.array([parse_cards("2s 6d 7c 8h 9s")]))
+    with pytest.raises(ValueError):
+        variants.evaluate_short_deck_batch(hands[:, :4])